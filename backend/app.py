@@ -3,13 +3,22 @@
 from flask import Flask
 from flask_cors import CORS
 
+import database
+import mailer
+import metrics
+import passwords
+
 from routes.auth_routes import auth_bp
 from routes.fridge_routes import fridge_bp
 from routes.user_settings import user_settings_bp
 from routes.recipe_routes import recipe_bp  
 
 app = Flask(__name__)
-CORS(app)
+CORS(app, expose_headers=["ETag"])   # 앱에서 ETag 헤더를 읽어 If-None-Match 로 다시 보냄
+metrics.init_app(app)         # 라우트별 응답 시간 기록 + /metrics
+database.init_app(app)        # 요청 종료 시 DB 연결을 풀에 반납
+passwords.init_app(app)       # 비밀번호 해시 대기열 초과 시 503
+mailer.init_app(app)          # 메일 outbox 준비 + 백그라운드 발송 스레드 시작
 
 app.register_blueprint(auth_bp)
 app.register_blueprint(fridge_bp)
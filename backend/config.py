@@ -5,3 +5,61 @@ EMAIL_ADDRESS = "dnpftlzhrl@dankook.ac.kr"
 EMAIL_PASSWORD = "uhgn klhe jklx jbca"
 SMTP_SERVER = "smtp.gmail.com"
 SMTP_PORT = 587
+
+# 🗄️ SQLite DB 설정
+import os
+
+# DB 파일 경로 (기본값: backend/db/fridge.db, 환경변수 FRIDGE_DB_PATH 로 변경 가능)
+DB_PATH = os.environ.get(
+    "FRIDGE_DB_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "db", "fridge.db")
+)
+DB_POOL_SIZE = 8                        # 재사용할 유휴 연결 최대 개수
+DB_BUSY_TIMEOUT = 5.0                   # 쓰기 잠금 대기 시간 (초)
+DB_CACHED_STATEMENTS = 256              # 연결별 prepared statement 캐시 크기
+DB_CACHE_SIZE_KB = 64 * 1024            # 연결별 페이지 캐시 크기 (KiB)
+DB_MMAP_SIZE = 256 * 1024 * 1024        # 메모리 맵 I/O 크기 (bytes)
+
+# 🔐 비밀번호 해시 설정
+# Werkzeug 해시 방식 문자열 (예: "scrypt:32768:8:1", "pbkdf2:sha256:600000")
+# 값을 바꾸면 기존 사용자는 다음 로그인 때 새 방식으로 다시 해시됨
+PASSWORD_HASH_METHOD = os.environ.get("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+PASSWORD_HASH_EXECUTOR = os.environ.get("PASSWORD_HASH_EXECUTOR", "thread")    # "thread" 또는 "process"
+# 해시 작업자 수 (기본값: 코어 하나는 일반 요청 처리용으로 남김)
+PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", max(1, (os.cpu_count() or 2) - 1)))
+PASSWORD_HASH_MAX_PENDING = 64          # 대기 + 실행 중 해시 작업 최대 개수 (초과 시 503)
+PASSWORD_HASH_TIMEOUT = 10.0            # 해시 작업 결과 대기 시간 (초)
+
+# 📨 메일 발송 설정 (email_outbox 테이블 → 백그라운드 발송 스레드)
+# 로컬 테스트 시 예: SMTP_SERVER=localhost SMTP_PORT=8025 SMTP_STARTTLS=0 SMTP_LOGIN=0 (aiosmtpd)
+SMTP_SERVER = os.environ.get("SMTP_SERVER", SMTP_SERVER)
+SMTP_PORT = int(os.environ.get("SMTP_PORT", SMTP_PORT))
+SMTP_STARTTLS = os.environ.get("SMTP_STARTTLS", "1") == "1"
+SMTP_LOGIN = os.environ.get("SMTP_LOGIN", "1") == "1"
+SMTP_TIMEOUT = 10.0                     # SMTP 연결/응답 대기 시간 (초)
+MAIL_SENDER_ENABLED = os.environ.get("MAIL_SENDER_ENABLED", "1") == "1"    # 0 이면 발송 스레드를 띄우지 않음
+MAIL_BATCH_SIZE = 20                    # 한 번에 꺼내서 보내는 메일 수
+MAIL_POLL_INTERVAL = 5.0                # 새 메일 알림이 없을 때 outbox 확인 주기 (초)
+MAIL_IDLE_TIMEOUT = 60.0                # 보낼 메일이 없을 때 SMTP 연결을 유지하는 시간 (초)
+MAIL_MAX_ATTEMPTS = 5                   # 재시도 포함 최대 발송 시도 횟수
+MAIL_RETRY_BASE = 5.0                   # 재시도 대기 시간 (초, 시도마다 2배)
+MAIL_RETRY_MAX = 600.0                  # 재시도 대기 시간 상한 (초)
+MAIL_LEASE = 120.0                      # 발송 중인 메일을 다른 발송기가 다시 가져가기까지의 시간 (초)
+
+# 🗃️ 레시피 조회 응답 캐시 (직렬화된 JSON 바이트를 메모리에 보관, recipes_dataset 재적재 시 비움)
+RESPONSE_CACHE_MAX_BYTES = 32 * 1024 * 1024     # 캐시에 보관할 응답 본문 총 크기 상한 (bytes)
+RESPONSE_CACHE_MAX_ENTRY_BYTES = 1024 * 1024    # 이보다 큰 응답은 캐시하지 않음 (bytes)
+DATASET_VERSION_CHECK_INTERVAL = 1.0            # 데이터셋 버전(dataset_meta) 확인 주기 (초)
+
+# 📦 스트리밍 응답 설정 (?stream=ndjson | json)
+STREAM_PAGE_SIZE = 10000                # 스트리밍 모드의 기본/최대 limit
+STREAM_CHUNK_BYTES = 16 * 1024          # 이 크기만큼 모아서 전송 (너무 작은 조각으로 나가지 않게)
+STREAM_GZIP_LEVEL = 6                   # gzip 압축 수준 (1~9)
+STREAM_BROTLI_QUALITY = 4               # brotli 압축 수준 (0~11, brotli 패키지가 있을 때만 사용)
+
+# 📈 운영 지표 (/metrics, Prometheus 텍스트 형식)
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "1") == "1"            # 0 이면 계측과 /metrics 를 모두 끔
+DB_SLOW_QUERY_MS = float(os.environ.get("DB_SLOW_QUERY_MS", "100"))         # 이보다 오래 걸린 쿼리는 경고 로그 (ms)
+DB_PROGRESS_STEPS = int(os.environ.get("DB_PROGRESS_STEPS", "1000"))        # SQLite VM 명령 N개마다 진행 콜백 (0 이면 끔)
+HTTP_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)    # 초
+DB_QUERY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)    # 초
@@ -0,0 +1,357 @@
+# backend/database.py : 공용 SQLite 연결 관리 (연결 풀 + WAL + PRAGMA 튜닝)
+
+# 모든 블루프린트가 같은 DB 파일(config.DB_PATH)을 같은 설정으로 사용하도록 연결을 한 곳에서 관리한다.
+# - 요청마다 sqlite3.connect() 하지 않고, 풀에서 연결을 빌려 쓰고 요청이 끝나면 반납
+# - 한 요청 안에서는 get_db_connection() 을 여러 번 호출해도 같은 연결을 돌려줌
+# - WAL 모드라서 냉장고 재료 쓰기가 레시피 조회(읽기)를 막지 않음
+# - METRICS_ENABLED 이면 쿼리별 실행 시간/횟수를 metrics 에 기록하고 느린 쿼리는 경고 로그를 남김
+
+import logging
+import queue
+import re
+import secrets
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+
+from flask import g, has_app_context, has_request_context, request
+
+import metrics
+from config import (
+    DB_PATH, DB_POOL_SIZE, DB_BUSY_TIMEOUT, DB_CACHED_STATEMENTS,
+    DB_CACHE_SIZE_KB, DB_MMAP_SIZE,
+    METRICS_ENABLED, DB_SLOW_QUERY_MS, DB_PROGRESS_STEPS, DB_QUERY_BUCKETS
+)
+
+logger = logging.getLogger(__name__)
+
+# 유휴 연결 보관소 (가장 최근에 반납된 연결부터 재사용 → 캐시가 따뜻한 연결 우선)
+_pool = queue.LifoQueue(maxsize=DB_POOL_SIZE)
+
+# 연결 수 집계 (생성 - 종료 = 현재 열린 연결)
+_conn_stats = {"created": 0, "closed": 0}
+_conn_stats_lock = threading.Lock()
+
+query_duration = metrics.histogram(
+    "sqlite_query_duration_seconds", "쿼리별 execute() 소요 시간 (SELECT 는 첫 행까지)",
+    ("statement",), DB_QUERY_BUCKETS,
+)
+vm_steps = metrics.counter(
+    "sqlite_vm_steps_total", f"쿼리별 SQLite VM 명령 수 (진행 콜백 {DB_PROGRESS_STEPS}개 단위, 결과 읽기 포함)",
+    ("statement",),
+)
+statements = metrics.counter("sqlite_statements_total", "실행된 SQL 문 수 (암묵적 BEGIN/COMMIT 포함, FTS5 내부 문 제외)", ("kind",))
+slow_queries = metrics.counter("sqlite_slow_queries_total", f"{DB_SLOW_QUERY_MS:g}ms 이상 걸린 쿼리 수", ("statement",))
+connections_open = metrics.gauge("sqlite_connections_open", "현재 열려 있는 DB 연결 수",
+                                 lambda: _conn_stats["created"] - _conn_stats["closed"])
+connections_idle = metrics.gauge("sqlite_pool_idle", "풀에서 대기 중인 연결 수", lambda: _pool.qsize())
+pool_acquires = metrics.counter("sqlite_pool_acquire_total", "풀에서 연결을 꺼낸 횟수 (hit: 재사용, miss: 새로 생성)",
+                                ("result",))
+
+# IN (?, ?, ?) 처럼 개수가 바뀌는 자리표시자 목록은 하나로 묶어서 레이블 종류가 늘어나지 않게 함
+PLACEHOLDER_LIST_RE = re.compile(r'\?(?:\s*,\s*\?)+')
+WHITESPACE_RE = re.compile(r'\s+')
+
+
+# 🔧 SQL 원문 → 지표 레이블 (공백 정리, 자리표시자 목록 축약, 최대 160자)
+@lru_cache(maxsize=512)
+def statement_label(sql):
+    label = WHITESPACE_RE.sub(' ', sql).strip()
+    label = PLACEHOLDER_LIST_RE.sub('?, …', label)
+    return label if len(label) <= 160 else label[:157] + '...'
+
+
+class TracedCursor(sqlite3.Cursor):
+    """execute/executemany 소요 시간을 쿼리별로 기록하는 커서"""
+
+    def execute(self, sql, parameters=()):
+        return self._timed(super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self._timed(super().executemany, sql, seq_of_parameters, many=True)
+
+    def _timed(self, run, sql, parameters, many=False):
+        label = statement_label(sql)
+        self.connection.current_statement = label       # 진행 콜백이 이 쿼리에 VM 명령 수를 더함
+        started = time.perf_counter()
+        try:
+            return run(sql, parameters)
+        finally:
+            elapsed = time.perf_counter() - started
+            query_duration.observe(elapsed, label)
+            if elapsed * 1000 >= DB_SLOW_QUERY_MS:
+                _log_slow_query(label, None if many else len(parameters), elapsed)
+
+
+class TracedConnection(sqlite3.Connection):
+    """cursor() / execute() 가 TracedCursor 를 쓰도록 하는 연결"""
+
+    current_statement = "<none>"
+
+    def cursor(self, factory=TracedCursor):
+        return super().cursor(factory)
+
+    # Connection.execute 는 내부에서 기본 커서를 만들기 때문에 직접 TracedCursor 로 실행
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+# 🔧 느린 쿼리 경고 (파라미터 값에는 이메일/비밀번호 해시 등이 있을 수 있으므로 개수만 남김)
+# (param_count 가 None 이면 executemany — 파라미터가 iterator 일 수 있어서 세지 않음)
+def _log_slow_query(label, param_count, elapsed):
+    slow_queries.inc(label)
+    path = request.path if has_request_context() else "-"
+    params = "executemany" if param_count is None else f"{param_count}개"
+    logger.warning("느린 쿼리 %.1fms [%s] %s params=%s", elapsed * 1000, path, label, params)
+
+
+# 🔧 trace 콜백: 실행되는 SQL 문의 종류(첫 단어)별 개수
+# (FTS5 같은 가상 테이블이 내부에서 실행하는 문은 "-- " 로 시작하고 검색 한 번에 수백 개라 세지 않음)
+def _trace_statement(sql):
+    if sql.startswith("--"):
+        return
+    statements.inc(sql.lstrip()[:8].split(None, 1)[0].upper() if sql.strip() else "?")
+
+
+# 🔧 진행 콜백: VM 명령 DB_PROGRESS_STEPS 개마다 호출 (0 을 반환해야 쿼리가 계속 실행됨)
+def _progress_handler(conn):
+    def on_progress():
+        vm_steps.inc(conn.current_statement, amount=DB_PROGRESS_STEPS)
+        return 0
+    return on_progress
+
+
+def _close(conn):
+    conn.close()
+    with _conn_stats_lock:
+        _conn_stats["closed"] += 1
+
+
+# 🔧 새 연결 생성 + PRAGMA 설정
+def _connect():
+    conn = sqlite3.connect(
+        DB_PATH,
+        timeout=DB_BUSY_TIMEOUT,
+        cached_statements=DB_CACHED_STATEMENTS,
+        check_same_thread=False,        # 풀에 반납된 연결은 다른 요청 스레드에서 재사용됨
+        factory=TracedConnection if METRICS_ENABLED else sqlite3.Connection
+    )
+    with _conn_stats_lock:
+        _conn_stats["created"] += 1
+    if METRICS_ENABLED:
+        conn.set_trace_callback(_trace_statement)
+        if DB_PROGRESS_STEPS > 0:
+            conn.set_progress_handler(_progress_handler(conn), DB_PROGRESS_STEPS)
+    conn.row_factory = sqlite3.Row      # 결과를 딕셔너리처럼 반환
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute(f"PRAGMA cache_size = -{DB_CACHE_SIZE_KB}")
+    conn.execute(f"PRAGMA mmap_size = {DB_MMAP_SIZE}")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    return conn
+
+
+# 🔧 풀에서 연결 하나 꺼내기 (없으면 새로 생성)
+def acquire_connection():
+    try:
+        conn = _pool.get_nowait()
+    except queue.Empty:
+        if METRICS_ENABLED:
+            pool_acquires.inc("miss")
+        return _connect()
+    if METRICS_ENABLED:
+        pool_acquires.inc("hit")
+    return conn
+
+
+# 🔧 사용한 연결 반납 (끝나지 않은 트랜잭션은 롤백, 풀이 가득 차면 닫음)
+def release_connection(conn):
+    if conn.in_transaction:
+        conn.rollback()
+    try:
+        _pool.put_nowait(conn)
+    except queue.Full:
+        _close(conn)
+
+
+# ✅ 요청 단위 연결 조회 (같은 요청 안에서는 같은 연결을 재사용)
+def get_db_connection():
+    if not has_app_context():
+        raise RuntimeError("get_db_connection() 은 요청 처리 중에만 사용할 수 있습니다. 대신 connection() 을 사용하세요.")
+    if 'db' not in g:
+        g.db = acquire_connection()
+    return g.db
+
+
+# ✅ 요청 밖(스크립트, 백그라운드 작업)에서 쓰는 연결
+@contextmanager
+def connection():
+    conn = acquire_connection()
+    try:
+        yield conn
+    finally:
+        release_connection(conn)
+
+
+# 🔧 요청 종료 시 연결 반납 (app.teardown_appcontext 에 등록)
+def _teardown_db(exception=None):
+    conn = g.pop('db', None)
+    if conn is not None:
+        release_connection(conn)
+
+
+# 사용자별 데이터 버전 (schema.sql 의 user_versions 와 동일, ETag 생성용)
+USER_VERSIONS_SQL = """
+CREATE TABLE IF NOT EXISTS user_versions (
+    user_id INTEGER NOT NULL,
+    scope TEXT NOT NULL,
+    version INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, scope)
+)
+"""
+
+# 데이터셋/DB 메타 정보 (schema.sql 의 dataset_meta 와 동일)
+DATASET_META_SQL = """
+CREATE TABLE IF NOT EXISTS dataset_meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+)
+"""
+
+# DB 파일마다 한 번 정해지는 임의 값 (DB 를 새로 만들면 바뀌어서 이전 DB 기준 ETag 와 겹치지 않음)
+_db_epoch = None
+
+
+# 재료명 앞뒤에서 잘라 내는 공백 (API 의 normalize_item_name 과 마이그레이션의 TRIM 이 같은 기준을 씀)
+ITEM_NAME_WHITESPACE = " \t\r\n\u3000"
+
+
+# 🔧 재료명 정규화 (앞뒤 공백 제거, 문자열이 아니면 빈 문자열)
+def normalize_item_name(name):
+    return name.strip(ITEM_NAME_WHITESPACE) if isinstance(name, str) else ''
+
+
+# 🔧 기존 DB 에 필요한 변경 적용 (여러 번 실행해도 결과가 같음)
+def _migrate_fridge_items_unique(conn):
+    cursor = conn.cursor()
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_fridge_items_unique'")
+    if cursor.fetchone():
+        return
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'fridge_items'")
+    if not cursor.fetchone():
+        return
+    _dedupe_fridge_items(cursor, "유니크 인덱스 생성 전 정리")
+    cursor.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_fridge_items_unique "
+        "ON fridge_items (user_id, item_name, is_seasoning)"
+    )
+
+
+# 🔧 같은 사용자/재료명(앞뒤 공백 무시)/조미료 여부로 중복 저장된 행은 가장 먼저 추가된 것만 남기고,
+# 남은 행의 재료명 앞뒤 공백을 제거 (" 양파" 와 "양파" 가 따로 남지 않도록)
+def _dedupe_fridge_items(cursor, reason):
+    cursor.execute(
+        "DELETE FROM fridge_items WHERE fridge_id NOT IN ("
+        " SELECT MIN(fridge_id) FROM fridge_items GROUP BY user_id, TRIM(item_name, ?), is_seasoning"
+        ")",
+        (ITEM_NAME_WHITESPACE,)
+    )
+    if cursor.rowcount > 0:
+        logger.warning("fridge_items 중복 행 %d개 삭제 (%s)", cursor.rowcount, reason)
+    cursor.execute(
+        "UPDATE fridge_items SET item_name = TRIM(item_name, ?1) WHERE item_name <> TRIM(item_name, ?1)",
+        (ITEM_NAME_WHITESPACE,)
+    )
+
+
+# 🔧 유니크 인덱스가 이미 있는 DB 에서도 앞뒤 공백만 다른 재료명 정리 (해당 행이 있을 때만)
+def _migrate_fridge_items_trim(conn):
+    cursor = conn.cursor()
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'fridge_items'")
+    if not cursor.fetchone():
+        return
+    cursor.execute(
+        "SELECT 1 FROM fridge_items WHERE item_name <> TRIM(item_name, ?) LIMIT 1",
+        (ITEM_NAME_WHITESPACE,)
+    )
+    if cursor.fetchone():
+        _dedupe_fridge_items(cursor, "재료명 앞뒤 공백 정리")
+
+
+def _migrate_user_versions(conn):
+    conn.execute(USER_VERSIONS_SQL)
+
+
+def _migrate_db_epoch(conn):
+    conn.execute(DATASET_META_SQL)
+    conn.execute(
+        "INSERT OR IGNORE INTO dataset_meta (key, value) VALUES ('db_epoch', ?)",
+        (secrets.randbits(48),)
+    )
+
+
+MIGRATIONS = [
+    _migrate_fridge_items_unique,
+    _migrate_fridge_items_trim,
+    _migrate_user_versions,
+    _migrate_db_epoch,
+]
+
+
+def apply_migrations():
+    global _db_epoch
+    with connection() as conn:
+        for migrate in MIGRATIONS:
+            migrate(conn)
+        conn.commit()
+        _db_epoch = conn.execute("SELECT value FROM dataset_meta WHERE key = 'db_epoch'").fetchone()["value"]
+
+
+# 🔧 DB epoch (ETag 에 포함, 마이그레이션 때 읽어 둔 값)
+def get_db_epoch():
+    if _db_epoch is None:
+        apply_migrations()
+    return _db_epoch
+
+
+def init_app(app):
+    apply_migrations()
+    app.teardown_appcontext(_teardown_db)
+
+
+# 🔧 외부 user_id (문자열 ID) → 내부 users.id (정수형 PK)로 변환 (요청의 연결을 그대로 사용)
+def get_user_numeric_id(user_id):
+    cursor = get_db_connection().cursor()
+
+    # users 테이블에서 user_id에 해당하는 고유 id 조회
+    cursor.execute("SELECT id FROM users WHERE user_id = ?", (user_id,))
+    row = cursor.fetchone()
+
+    return row["id"] if row else None       # 조회 성공 시 id 반환, 실패 시 None
+
+
+# 🔧 사용자 데이터(scope: 'fridge', 'saved')가 바뀌었을 때 버전 증가 (변경과 같은 트랜잭션에서 호출)
+def bump_user_version(conn, user_numeric_id, scope):
+    conn.execute(
+        "INSERT INTO user_versions (user_id, scope, version) VALUES (?, ?, 1) "
+        "ON CONFLICT (user_id, scope) DO UPDATE SET version = version + 1",
+        (user_numeric_id, scope)
+    )
+
+
+# 🔧 외부 user_id → (내부 id, scope 버전) 한 번에 조회 (사용자가 없으면 (None, None))
+def get_user_version(user_id, scope):
+    cursor = get_db_connection().cursor()
+    cursor.execute(
+        "SELECT u.id, COALESCE(v.version, 0) AS version FROM users u "
+        "LEFT JOIN user_versions v ON v.user_id = u.id AND v.scope = ? "
+        "WHERE u.user_id = ?",
+        (scope, user_id)
+    )
+    row = cursor.fetchone()
+    return (row["id"], row["version"]) if row else (None, None)
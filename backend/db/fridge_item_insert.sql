@@ -1,4 +1,4 @@
-INSERT INTO fridge_items (user_id, item_name, is_seasoning)
+INSERT OR IGNORE INTO fridge_items (user_id, item_name, is_seasoning)
 VALUES
 ('1', '양파', 0),
 ('1', '고구마', 0),
@@ -1,30 +1,292 @@
 # backend/db/import_recipes.py
 
-# TB_RECIPE_SEARCH_241226.csv의 내용을 recipes_dataset에 삽입하는 코드드
+# TB_RECIPE_SEARCH_241226.csv의 내용을 recipes_dataset에 삽입하는 코드
+#
+# - CSV 를 한 번에 메모리에 올리지 않고 한 줄씩 읽어서 BATCH_SIZE 개씩 executemany 로 삽입
+# - 전체 적재는 트랜잭션 하나로 처리 (WAL 모드라서 적재 중에도 기존 데이터 조회 가능, 커밋 시점에 교체)
+# - 테이블은 schema.sql 의 recipes_dataset 정의(RCP_SNO INTEGER PRIMARY KEY 포함)로 생성
+# - CKG_MTRL_CN 을 재료 단위로 파싱해서 recipe_ingredients 테이블도 함께 채움
+# - 인덱스/FTS 색인은 데이터 적재가 끝난 뒤 생성
+# - CSV 안에 RCP_SNO 가 중복된 행은 전체 적재에서는 처음 행만 넣고 건너뛴 개수를 출력 (증분 적재는 뒤의 행으로 갱신)
+# - dataset_meta 의 recipes_version 을 올려서 실행 중인 서버가 조회 캐시/역색인을 다시 만들게 함
+#
+# 사용법:
+#   python import_recipes.py                                 # 전체 재적재
+#   python import_recipes.py --incremental                   # RCP_SNO 기준 upsert (월간 갱신)
+#   python import_recipes.py --incremental --since 20241101  # FIRST_REG_DT 가 이후인 행만 upsert
 
-import pandas as pd
-import sqlite3
+import argparse
+import csv
+import json
 import os
+import re
+import sqlite3
+import time
 
 # 1. DB 및 CSV 경로 설정
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-DB_PATH = os.path.join(BASE_DIR, "fridge.db")
+DB_PATH = os.environ.get("FRIDGE_DB_PATH", os.path.join(BASE_DIR, "fridge.db"))
 CSV_FILE = os.path.join(BASE_DIR, "TB_RECIPE_SEARCH_241226.csv")
+SCHEMA_FILE = os.path.join(BASE_DIR, "schema.sql")
+BATCH_SIZE = 5000
+
+# recipes_dataset 칼럼 (schema.sql 순서)
+COLUMNS = [
+    "RCP_SNO", "RCP_TTL", "CKG_NM", "RGTR_ID", "RGTR_NM", "INQ_CNT", "RCMM_CNT", "SRAP_CNT",
+    "CKG_MTH_ACTO_NM", "CKG_STA_ACTO_NM", "CKG_MTRL_ACTO_NM", "CKG_KND_ACTO_NM", "CKG_IPDC",
+    "CKG_MTRL_CN", "CKG_INBUN_NM", "CKG_DODF_NM", "CKG_TIME_NM", "FIRST_REG_DT"
+]
+INTEGER_COLUMNS = {"RCP_SNO", "INQ_CNT", "RCMM_CNT", "SRAP_CNT"}
+FTS_COLUMNS = ["RCP_TTL", "CKG_NM", "CKG_IPDC", "CKG_MTRL_CN"]
+
+# 적재 후 생성할 인덱스
+INDEX_SQL = [
+    # 카테고리 조회 페이지네이션용 인덱스 (CKG_STA_ACTO_NM = ? AND RCP_SNO > ? ORDER BY RCP_SNO)
+    "CREATE INDEX IF NOT EXISTS idx_recipes_category ON recipes_dataset (CKG_STA_ACTO_NM, RCP_SNO)",
+    # 재료명 → 레시피 조회용 인덱스
+    "CREATE INDEX IF NOT EXISTS idx_recipe_ingredients_name ON recipe_ingredients (name, RCP_SNO)",
+]
+
+# [재료], [양념] 같은 구역 표기
+SECTION_RE = re.compile(r'\[([^\]]*)\]')
+
+# 전문 검색(FTS5) 색인 테이블
+# - rowid 를 RCP_SNO 로 맞춰서 검색 결과를 recipes_dataset 과 바로 연결할 수 있게 함
+# - trigram 토크나이저: 띄어쓰기 없는 복합어 안의 부분 문자열도 일치 ("돼지김치" → "돼지김치찌개")
+#   (3글자 미만 검색어는 trigram 색인을 쓸 수 없어서 /recipes/text-search 가 색인 없이 LIKE 로 처리)
+FTS_SQL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS recipes_fts USING fts5(
+    RCP_TTL, CKG_NM, CKG_IPDC, CKG_MTRL_CN,
+    tokenize = 'trigram'
+)
+"""
+
+
+# 🔧 schema.sql 에서 특정 테이블 정의만 꺼내기
+def load_table_sql(table):
+    with open(SCHEMA_FILE, encoding="utf-8") as f:
+        schema = f.read()
+    match = re.search(rf"CREATE TABLE {table}\s*\(.*?\n\);", schema, re.S)
+    if not match:
+        raise RuntimeError(f"schema.sql 에서 {table} 정의를 찾을 수 없습니다.")
+    return match.group(0).replace("CREATE TABLE", "CREATE TABLE IF NOT EXISTS", 1)
+
+
+# 🔧 CKG_MTRL_CN → [(순서, 구역, 재료명, 수량, 단위)]
+# 형식: "[재료] 이름\a수량\a단위| 이름\a수량\a단위| [양념] 이름\a수량\a단위"
+def parse_ingredient_items(raw_str):
+    items = []
+    section = None
+    for itm in (raw_str or "").split("|"):
+        found = SECTION_RE.findall(itm)
+        if found:
+            section = found[-1].strip() or None
+            itm = SECTION_RE.sub("", itm)
+        seg = itm.split("\a")
+        name = seg[0].strip()
+        if not name:
+            continue
+        qty = seg[1].strip() if len(seg) > 1 else ""
+        unit = seg[2].strip() if len(seg) > 2 else ""
+        items.append((len(items), section, name, qty or None, unit or None))
+    return items
+
+
+# 🔧 CSV 인코딩 판별 (UTF-8 이 아니면 CP949)
+def detect_encoding(path):
+    with open(path, "rb") as f:
+        head = f.read(1 << 16)
+    try:
+        head.decode("utf-8")
+        return "utf-8-sig"
+    except UnicodeDecodeError as e:
+        # 읽은 구간 끝에서 멀티바이트 문자가 잘린 경우는 UTF-8 로 판단
+        if e.start >= len(head) - 3:
+            return "utf-8-sig"
+        return "cp949"
+
+
+# 🔧 CSV 한 행 → INSERT 파라미터 (빈 값은 NULL, 정수 칼럼은 int 변환)
+def to_row(record):
+    row = []
+    for col in COLUMNS:
+        value = (record.get(col) or "").strip()
+        if not value:
+            row.append(None)
+        elif col in INTEGER_COLUMNS:
+            try:
+                row.append(int(float(value)))
+            except ValueError:
+                row.append(None)
+        else:
+            row.append(value)
+    return row
+
+
+# 🔧 CSV 를 BATCH_SIZE 행씩 나눠서 반환 (since 가 있으면 FIRST_REG_DT 가 그 이후인 행만)
+def read_batches(csv_path, batch_size, since=None):
+    with open(csv_path, newline="", encoding=detect_encoding(csv_path)) as f:
+        batch = []
+        for record in csv.DictReader(f):
+            row = to_row(record)
+            if row[0] is None:
+                continue
+            if since and (row[-1] or "") <= since:
+                continue
+            batch.append(row)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+# 🔧 배치 안의 중복 RCP_SNO 정리 (keep_last 이면 뒤의 행, 아니면 앞의 행 유지)
+def dedupe_batch(batch, keep_last=False):
+    rows = {}
+    for row in batch:
+        if keep_last or row[0] not in rows:
+            rows[row[0]] = row
+    return list(rows.values())
+
+
+# 🔧 이미 적재된 RCP_SNO 조회 (json_each 로 넘겨서 배치 크기가 바인딩 변수 개수 제한에 걸리지 않게 함)
+def existing_codes(cursor, codes):
+    cursor.execute(
+        "SELECT RCP_SNO FROM recipes_dataset WHERE RCP_SNO IN (SELECT value FROM json_each(?))",
+        (json.dumps(codes),)
+    )
+    return {row[0] for row in cursor.fetchall()}
+
+
+# 🔧 기존 FTS 색인이 trigram 토크나이저인지 확인 (예전 unicode61 색인이면 증분 적재 때 다시 만듦)
+def fts_is_trigram(cursor):
+    cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'recipes_fts'")
+    row = cursor.fetchone()
+    return bool(row) and "trigram" in row[0]
+
+
+def has_primary_key(cursor):
+    cursor.execute("PRAGMA table_info(recipes_dataset)")
+    return any(col[1] == "RCP_SNO" and col[5] for col in cursor.fetchall())
+
+
+def import_recipes(csv_path=CSV_FILE, db_path=DB_PATH, incremental=False, since=None, batch_size=BATCH_SIZE):
+    started = time.time()
+    conn = sqlite3.connect(db_path, isolation_level=None)      # 트랜잭션을 직접 BEGIN/COMMIT
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    cursor = conn.cursor()
+
+    placeholders = ",".join("?" * len(COLUMNS))
+    if incremental:
+        # RCP_SNO 가 같으면 나머지 칼럼 갱신
+        updates = ", ".join(f"{col} = excluded.{col}" for col in COLUMNS[1:])
+        insert_sql = (
+            f"INSERT INTO recipes_dataset ({', '.join(COLUMNS)}) VALUES ({placeholders}) "
+            f"ON CONFLICT(RCP_SNO) DO UPDATE SET {updates}"
+        )
+    else:
+        insert_sql = f"INSERT INTO recipes_dataset ({', '.join(COLUMNS)}) VALUES ({placeholders})"
+    fts_insert_sql = (
+        f"INSERT INTO recipes_fts (rowid, {', '.join(FTS_COLUMNS)}) "
+        f"VALUES (?, {', '.join('?' * len(FTS_COLUMNS))})"
+    )
+    fts_index = [COLUMNS.index(col) for col in FTS_COLUMNS]
+    mtrl_index = COLUMNS.index("CKG_MTRL_CN")
+    ingredient_insert_sql = (
+        "INSERT INTO recipe_ingredients (RCP_SNO, seq, section, name, qty, unit) VALUES (?, ?, ?, ?, ?, ?)"
+    )
+
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        # 2. 테이블 준비
+        if incremental:
+            cursor.execute(load_table_sql("recipes_dataset"))
+            cursor.execute(load_table_sql("recipe_ingredients"))
+            if not has_primary_key(cursor):
+                raise RuntimeError("기존 recipes_dataset 에 RCP_SNO 기본 키가 없습니다. 먼저 전체 적재를 실행해주세요.")
+            rebuild_fts = not fts_is_trigram(cursor)
+            if rebuild_fts:
+                cursor.execute("DROP TABLE IF EXISTS recipes_fts")
+            else:
+                cursor.execute(FTS_SQL)
+        else:
+            rebuild_fts = True
+            cursor.execute("DROP TABLE IF EXISTS recipes_fts")
+            cursor.execute("DROP TABLE IF EXISTS recipe_ingredients")
+            cursor.execute("DROP TABLE IF EXISTS recipes_dataset")
+            cursor.execute(load_table_sql("recipes_dataset"))
+            cursor.execute(load_table_sql("recipe_ingredients"))
+
+        # 3. 배치 단위 적재
+        total = skipped = 0
+        for batch in read_batches(csv_path, batch_size, since):
+            unique = dedupe_batch(batch, keep_last=incremental)
+            if not incremental:
+                # 앞선 배치에 이미 들어간 RCP_SNO 는 건너뜀 (INSERT 가 실패하면 트랜잭션 전체가 취소되므로)
+                seen = existing_codes(cursor, [row[0] for row in unique])
+                if seen:
+                    unique = [row for row in unique if row[0] not in seen]
+                skipped += len(batch) - len(unique)
+            batch = unique
+            cursor.executemany(insert_sql, batch)
+            if incremental:
+                cursor.executemany("DELETE FROM recipe_ingredients WHERE RCP_SNO = ?", [(row[0],) for row in batch])
+            cursor.executemany(ingredient_insert_sql, [
+                (row[0],) + item for row in batch for item in parse_ingredient_items(row[mtrl_index])
+            ])
+            if not rebuild_fts:
+                # 갱신된 레시피의 FTS 색인만 교체
+                cursor.executemany("DELETE FROM recipes_fts WHERE rowid = ?", [(row[0],) for row in batch])
+                cursor.executemany(fts_insert_sql, [[row[0]] + [row[i] for i in fts_index] for row in batch])
+            total += len(batch)
+            print(f"  … {total} 행 처리")
+
+        # 4. 인덱스 / FTS 색인 (전체 적재 또는 색인 교체 시 데이터를 다 넣은 뒤 한 번에 생성)
+        for sql in INDEX_SQL:
+            cursor.execute(sql)
+        if rebuild_fts:
+            cursor.execute(FTS_SQL)
+            cursor.execute(
+                f"INSERT INTO recipes_fts (rowid, {', '.join(FTS_COLUMNS)}) "
+                f"SELECT RCP_SNO, {', '.join(FTS_COLUMNS)} FROM recipes_dataset"
+            )
+        cursor.execute("INSERT INTO recipes_fts (recipes_fts) VALUES ('optimize')")
+
+        # 5. 데이터셋 버전 증가 (같은 트랜잭션 → 커밋되는 순간 서버에서 새 버전이 보임)
+        cursor.execute(load_table_sql("dataset_meta"))
+        cursor.execute(
+            "INSERT INTO dataset_meta (key, value) VALUES ('recipes_version', 1) "
+            "ON CONFLICT (key) DO UPDATE SET value = value + 1"
+        )
+        cursor.execute("COMMIT")
+    except BaseException:
+        cursor.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
+    mode = "증분(upsert)" if incremental else "전체"
+    print(f"✅ {mode} 적재 완료: {total} 행, {time.time() - started:.1f}초")
+    if skipped:
+        print(f"⚠️ 중복 RCP_SNO {skipped} 행은 처음 나온 행만 적재하고 건너뛰었습니다.")
+    return total
 
-# 2. CSV 불러오기 (인코딩 설정 → CP949 또는 EUC-KR)
-# 인코딩: 한글 안 깨지고 잘 열리면 utf-8 또는 utf-8-sig
-try:
-    df = pd.read_csv(CSV_FILE, encoding='utf-8-sig')
-except UnicodeDecodeError:
-    df = pd.read_csv(CSV_FILE, encoding='utf-8')
 
-print(f"✅ 데이터 불러오기 완료: {len(df)} 행")
+def main():
+    parser = argparse.ArgumentParser(description="만개의 레시피 CSV → recipes_dataset 적재")
+    parser.add_argument("--csv", default=CSV_FILE, help="CSV 파일 경로")
+    parser.add_argument("--db", default=DB_PATH, help="SQLite DB 경로")
+    parser.add_argument("--incremental", action="store_true", help="기존 데이터를 유지하고 RCP_SNO 기준으로 upsert")
+    parser.add_argument("--since", help="FIRST_REG_DT 가 이 값보다 큰 행만 처리 (--incremental 과 함께 사용)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="executemany 한 번에 넣을 행 수")
+    args = parser.parse_args()
 
-# 3. DB 연결
-conn = sqlite3.connect(DB_PATH)
+    if args.since and not args.incremental:
+        parser.error("--since 는 --incremental 과 함께 사용해야 합니다.")
+    import_recipes(args.csv, args.db, args.incremental, args.since, args.batch_size)
 
-# 4. recipes_dataset 테이블에 저장
-df.to_sql("recipes_dataset", conn, if_exists="replace", index=False)
-print("✅ DB 삽입 완료: recipes_dataset 테이블에 저장됨")
 
-conn.close()
+if __name__ == "__main__":
+    main()
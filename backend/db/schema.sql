@@ -19,6 +19,9 @@ CREATE TABLE fridge_items (
     FOREIGN KEY (user_id) REFERENCES users(id)         -- users 테이블의 id와 외래키 연결
 );
 
+-- 사용자별 재료 중복 방지 (INSERT OR IGNORE 로 일괄 추가)
+CREATE UNIQUE INDEX idx_fridge_items_unique ON fridge_items (user_id, item_name, is_seasoning);
+
 -- 3. 즐겨찾기 레시피 테이블
 CREATE TABLE saved_recipes (
     recipe_id INTEGER PRIMARY KEY AUTOINCREMENT,       -- 즐겨찾기 고유 번호 (PK)
@@ -63,3 +66,53 @@ CREATE TABLE recipes_dataset (
     CKG_TIME_NM TEXT,                    -- 요리 시간 (예: 10분, 30분 이상)
     FIRST_REG_DT TEXT                    -- 최초 등록 일시
 );
+
+-- 레시피 카테고리 조회용 인덱스 (카테고리별 RCP_SNO 순 페이지네이션)
+CREATE INDEX idx_recipes_category ON recipes_dataset (CKG_STA_ACTO_NM, RCP_SNO);
+
+-- 6. 레시피 재료 테이블 (recipes_dataset.CKG_MTRL_CN 을 재료 단위로 파싱한 결과, import_recipes.py 가 생성)
+CREATE TABLE recipe_ingredients (
+    RCP_SNO INTEGER NOT NULL,            -- 레시피 일련번호 (recipes_dataset.RCP_SNO 참조)
+    seq INTEGER NOT NULL,                -- 레시피 안에서의 재료 순서
+    section TEXT,                        -- 재료 구역 (예: 재료, 양념)
+    name TEXT NOT NULL,                  -- 재료명 (예: 양파)
+    qty TEXT,                            -- 수량 (예: 1, 1/2)
+    unit TEXT,                           -- 단위 (예: 개, 큰술)
+    PRIMARY KEY (RCP_SNO, seq),          -- RCP_SNO 로 레시피별 재료 조회
+    FOREIGN KEY (RCP_SNO) REFERENCES recipes_dataset(RCP_SNO)
+);
+
+-- 재료명 → 레시피 조회용 인덱스 (RCP_SNO 까지 포함해서 테이블을 읽지 않고 처리)
+CREATE INDEX idx_recipe_ingredients_name ON recipe_ingredients (name, RCP_SNO);
+
+-- 7. 메일 발송 대기열 (요청은 여기에 넣기만 하고 mailer.py 의 백그라운드 스레드가 발송)
+CREATE TABLE email_outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,              -- 메일 고유 번호 (PK)
+    recipient TEXT NOT NULL,                           -- 받는 사람 이메일
+    subject TEXT NOT NULL,                             -- 제목
+    body TEXT,                                         -- 본문 (plain text, 임시 비밀번호가 남지 않도록 sent/failed 가 되면 NULL)
+    status TEXT NOT NULL DEFAULT 'pending',            -- pending / sending / sent / failed
+    attempts INTEGER NOT NULL DEFAULT 0,               -- 발송 시도 횟수
+    next_attempt_at REAL NOT NULL DEFAULT 0,           -- 다음 발송 시도 시각 (epoch 초)
+    last_error TEXT,                                   -- 마지막 실패 사유
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,     -- 등록 일시
+    sent_at DATETIME                                   -- 발송 완료 일시
+);
+
+-- 발송할 메일 조회용 인덱스
+CREATE INDEX idx_email_outbox_due ON email_outbox (status, next_attempt_at);
+
+-- 8. 사용자별 데이터 버전 (냉장고/저장 레시피가 바뀔 때마다 증가, 목록 조회 ETag 로 사용)
+CREATE TABLE user_versions (
+    user_id INTEGER NOT NULL,                          -- 사용자 ID (users.id 참조)
+    scope TEXT NOT NULL,                               -- 데이터 종류 ('fridge', 'saved')
+    version INTEGER NOT NULL DEFAULT 0,                -- 변경될 때마다 1씩 증가
+    PRIMARY KEY (user_id, scope),
+    FOREIGN KEY (user_id) REFERENCES users(id)
+);
+
+-- 9. 데이터셋 메타 정보 (import_recipes.py 가 적재할 때마다 recipes_version 증가 → 서버 조회 캐시 무효화)
+CREATE TABLE dataset_meta (
+    key TEXT PRIMARY KEY,                              -- 항목 이름 (예: recipes_version, db_epoch)
+    value INTEGER NOT NULL                             -- 값
+);
@@ -0,0 +1,33 @@
+# backend/etag.py : 사용자별 목록 응답의 ETag / 조건부 조회 (If-None-Match → 304)
+
+# 냉장고 목록, 저장 레시피 목록은 화면에 들어올 때마다 다시 요청되지만 거의 바뀌지 않는다.
+# 변경 API 가 user_versions 의 버전을 올리고, 조회 API 는 버전으로 만든 ETag 가
+# 클라이언트가 보낸 If-None-Match 와 같으면 목록 테이블을 읽지 않고 바로 304 를 돌려준다.
+# 조건부 조회는 GET 에만 적용한다 (POST 로 목록을 받는 예전 호출은 매번 전체 목록).
+# DB 를 새로 만들면 사용자 id 와 버전이 처음부터 다시 시작되므로 DB epoch 를 ETag 에 함께 넣는다.
+
+from flask import Response, request
+
+from database import get_db_epoch
+
+
+# 🔧 scope / DB epoch / 사용자 / 버전으로 ETag 값 생성
+def user_etag(scope, user_numeric_id, version):
+    return f"{scope}-{get_db_epoch():x}-{user_numeric_id}-{version}"
+
+
+# 🔧 클라이언트가 가진 목록이 최신인지 확인
+def is_not_modified(tag):
+    return request.if_none_match.contains_weak(tag)
+
+
+# ✅ 응답에 ETag 헤더 추가 (매번 서버에 확인하도록 no-cache)
+def with_etag(response, tag):
+    response.set_etag(tag, weak=True)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
+# ✅ 본문 없는 304 응답
+def not_modified(tag):
+    return with_etag(Response(status=304), tag)
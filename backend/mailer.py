@@ -0,0 +1,243 @@
+# backend/mailer.py : outbox 기반 비동기 메일 발송
+
+# 요청 처리 중에는 email_outbox 테이블에 메일을 넣기만 하고 바로 응답한다.
+# 실제 발송은 백그라운드 스레드가 담당한다:
+# - SMTP 연결(STARTTLS + 로그인)을 한 번 맺고 MAIL_IDLE_TIMEOUT 동안 재사용
+# - 보낼 메일을 MAIL_BATCH_SIZE 개씩 꺼내 같은 연결로 연속 발송
+# - 실패한 메일은 MAIL_RETRY_BASE × 2^(시도 횟수) 뒤에 다시 시도, MAIL_MAX_ATTEMPTS 를 넘으면 failed
+# outbox 가 DB 에 있으므로 서버가 재시작되어도 보내지 못한 메일은 남아 있다.
+# 본문에는 임시 비밀번호가 들어가므로 sent / failed 로 끝난 메일은 body 를 NULL 로 비운다.
+
+import logging
+import smtplib
+import threading
+import time
+from email.message import EmailMessage
+
+from config import (
+    EMAIL_ADDRESS, EMAIL_PASSWORD, SMTP_SERVER, SMTP_PORT, SMTP_STARTTLS, SMTP_LOGIN, SMTP_TIMEOUT,
+    MAIL_SENDER_ENABLED, MAIL_BATCH_SIZE, MAIL_POLL_INTERVAL, MAIL_IDLE_TIMEOUT,
+    MAIL_MAX_ATTEMPTS, MAIL_RETRY_BASE, MAIL_RETRY_MAX, MAIL_LEASE
+)
+from database import connection
+
+logger = logging.getLogger(__name__)
+
+# schema.sql 의 email_outbox 정의와 동일 (기존 DB 에도 바로 쓸 수 있도록 시작 시 생성)
+OUTBOX_SQL = """
+CREATE TABLE IF NOT EXISTS email_outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    recipient TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    body TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    last_error TEXT,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    sent_at DATETIME
+)
+"""
+OUTBOX_INDEX_SQL = "CREATE INDEX IF NOT EXISTS idx_email_outbox_due ON email_outbox (status, next_attempt_at)"
+
+# 새 메일이 들어왔을 때 발송 스레드를 깨우는 신호
+_wakeup = threading.Event()
+_sender = None
+_sender_lock = threading.Lock()
+
+
+# ✅ 메일을 outbox 에 추가 (호출한 쪽의 트랜잭션에 포함되므로 commit 후 발송됨)
+def enqueue_email(conn, recipient, subject, body):
+    conn.execute(
+        "INSERT INTO email_outbox (recipient, subject, body, next_attempt_at) VALUES (?, ?, ?, ?)",
+        (recipient, subject, body, time.time())
+    )
+
+
+# ✅ 발송 스레드 깨우기 (commit 직후 호출)
+def notify():
+    _wakeup.set()
+
+
+def _build_message(row):
+    msg = EmailMessage()
+    msg["Subject"] = row["subject"]
+    msg["From"] = EMAIL_ADDRESS
+    msg["To"] = row["recipient"]
+    msg.set_content(row["body"])
+    return msg
+
+
+def _retry_delay(attempts):
+    return min(MAIL_RETRY_BASE * (2 ** (attempts - 1)), MAIL_RETRY_MAX)
+
+
+class OutboxSender(threading.Thread):
+    """email_outbox 를 비우는 백그라운드 발송 스레드 (SMTP 연결 유지)"""
+
+    def __init__(self):
+        super().__init__(name="mail-outbox", daemon=True)
+        self.smtp = None
+        self.last_used = 0.0
+        self.stopping = threading.Event()
+
+    # 🔧 SMTP 연결 (끊겼으면 다시 연결)
+    def _connection(self):
+        if self.smtp is not None:
+            try:
+                if self.smtp.noop()[0] == 250:
+                    return self.smtp
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._close()
+        smtp = smtplib.SMTP(SMTP_SERVER, SMTP_PORT, timeout=SMTP_TIMEOUT)
+        try:
+            if SMTP_STARTTLS:
+                smtp.starttls()
+            if SMTP_LOGIN:
+                smtp.login(EMAIL_ADDRESS, EMAIL_PASSWORD)
+        except BaseException:
+            smtp.close()
+            raise
+        self.smtp = smtp
+        return smtp
+
+    def _close(self):
+        if self.smtp is not None:
+            try:
+                self.smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                self.smtp.close()
+            self.smtp = None
+
+    # 🔧 보낼 차례가 된 메일을 꺼내서 발송 중(sending)으로 표시
+    # (발송기가 도중에 죽으면 MAIL_LEASE 뒤에 다시 가져감)
+    def _claim(self, conn):
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute(
+                "SELECT id, recipient, subject, body, attempts FROM email_outbox "
+                "WHERE status IN ('pending', 'sending') AND next_attempt_at <= ? "
+                "ORDER BY next_attempt_at LIMIT ?",
+                (now, MAIL_BATCH_SIZE)
+            ).fetchall()
+            conn.executemany(
+                "UPDATE email_outbox SET status = 'sending', next_attempt_at = ? WHERE id = ?",
+                [(now + MAIL_LEASE, row["id"]) for row in rows]
+            )
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        return rows
+
+    def _send_batch(self, conn, rows):
+        sent, failed = [], []
+        for row in rows:
+            try:
+                self._connection().send_message(_build_message(row))
+                sent.append(row)
+            except (smtplib.SMTPException, OSError) as e:
+                logger.warning(f"메일 발송 실패 (id={row['id']}, 시도 {row['attempts'] + 1}회): {e}")
+                failed.append((row, str(e)))
+                # 연결 문제일 수 있으므로 다음 메일은 새 연결로 시도
+                self._close()
+        self.last_used = time.time()
+
+        conn.executemany(
+            "UPDATE email_outbox SET status = 'sent', attempts = attempts + 1, body = NULL, "
+            "sent_at = CURRENT_TIMESTAMP, last_error = NULL WHERE id = ?",
+            [(row["id"],) for row in sent]
+        )
+        now = time.time()
+        conn.executemany(
+            "UPDATE email_outbox SET status = ?1, attempts = ?2, next_attempt_at = ?3, last_error = ?4, "
+            "body = CASE WHEN ?1 = 'failed' THEN NULL ELSE body END WHERE id = ?5",
+            [
+                (
+                    "failed" if row["attempts"] + 1 >= MAIL_MAX_ATTEMPTS else "pending",
+                    row["attempts"] + 1,
+                    now + _retry_delay(row["attempts"] + 1),
+                    error,
+                    row["id"],
+                )
+                for row, error in failed
+            ]
+        )
+        conn.commit()
+        return len(sent)
+
+    # ✅ 보낼 메일이 남아 있는 동안 배치 단위로 발송 (보낸 개수 반환)
+    def drain(self):
+        total = 0
+        with connection() as conn:
+            while True:
+                rows = self._claim(conn)
+                if not rows:
+                    break
+                total += self._send_batch(conn, rows)
+        return total
+
+    def run(self):
+        while not self.stopping.is_set():
+            # drain 도중에 들어온 알림은 남겨두어야 하므로 먼저 초기화
+            _wakeup.clear()
+            try:
+                self.drain()
+            except Exception:
+                logger.exception("메일 outbox 처리 중 오류")
+            if self.smtp is not None and time.time() - self.last_used > MAIL_IDLE_TIMEOUT:
+                self._close()
+            _wakeup.wait(MAIL_POLL_INTERVAL)
+        self._close()
+
+    def stop(self):
+        self.stopping.set()
+        _wakeup.set()
+
+
+# 🔧 body 가 NOT NULL 인 예전 outbox 테이블이면 새 정의로 다시 만듦 (데이터는 그대로 옮김)
+def _migrate_outbox_body(conn):
+    columns = conn.execute("PRAGMA table_info(email_outbox)").fetchall()
+    if not any(col["name"] == "body" and col["notnull"] for col in columns):
+        return
+    conn.execute("ALTER TABLE email_outbox RENAME TO email_outbox_old")
+    conn.execute(OUTBOX_SQL)
+    conn.execute("INSERT INTO email_outbox SELECT * FROM email_outbox_old")
+    conn.execute("DROP TABLE email_outbox_old")
+
+
+# 🔧 outbox 테이블 준비 + 이미 끝난 메일의 본문 비우기
+def ensure_outbox():
+    with connection() as conn:
+        conn.execute(OUTBOX_SQL)
+        _migrate_outbox_body(conn)
+        conn.execute(OUTBOX_INDEX_SQL)
+        conn.execute("UPDATE email_outbox SET body = NULL WHERE status IN ('sent', 'failed') AND body IS NOT NULL")
+        conn.commit()
+
+
+# ✅ 발송 스레드 시작 (app 생성 시 한 번)
+def start_sender():
+    global _sender
+    with _sender_lock:
+        if _sender is None or not _sender.is_alive():
+            _sender = OutboxSender()
+            _sender.start()
+    return _sender
+
+
+def stop_sender(timeout=5.0):
+    global _sender
+    with _sender_lock:
+        if _sender is not None:
+            _sender.stop()
+            _sender.join(timeout)
+            _sender = None
+
+
+def init_app(app):
+    ensure_outbox()
+    if MAIL_SENDER_ENABLED:
+        start_sender()
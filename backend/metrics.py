@@ -0,0 +1,170 @@
+# backend/metrics.py : 요청/쿼리 지표 수집 + Prometheus 형식 /metrics 엔드포인트
+
+# 운영 중에 어느 라우트, 어느 쿼리가 느린지 보기 위한 최소한의 계측.
+# - 라우트별 응답 시간 히스토그램 + 상태 코드별 요청 수 (before_request / after_request)
+# - 쿼리별 실행 시간 · 횟수 · SQLite VM 명령 수 (database.py 의 TracedConnection 이 기록)
+# - 값은 메모리에만 두고 /metrics 를 긁어갈 때 텍스트로 만든다.
+# 기록 한 번은 dict 조회 + bisect + 짧은 lock 뿐이라 부하 중에도 켜 둘 수 있다.
+
+import threading
+import time
+from bisect import bisect_left
+
+from flask import Response, g, request
+
+from config import METRICS_ENABLED, HTTP_LATENCY_BUCKETS
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values, extra=None):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """레이블 조합별 누적 카운터"""
+
+    kind = "counter"
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self.lock:
+            self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def samples(self):
+        with self.lock:
+            items = list(self.values.items())
+        for label_values, value in items:
+            yield self.name, _format_labels(self.labels, label_values), value
+
+
+class Gauge:
+    """현재 값 (수집 시점에 함수를 호출해서 읽음)"""
+
+    kind = "gauge"
+
+    def __init__(self, name, help_text, func):
+        self.name = name
+        self.help = help_text
+        self.func = func
+
+    def samples(self):
+        yield self.name, "", self.func()
+
+
+class Histogram:
+    """레이블 조합별 버킷 카운트 + 합계 (버킷은 기록할 때 누적하지 않고 출력할 때 누적)"""
+
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels=(), buckets=HTTP_LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self.values = {}                # {레이블 값: [버킷별 개수..., +Inf 개수, 합계]}
+        self.lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        index = bisect_left(self.buckets, value)
+        with self.lock:
+            row = self.values.get(label_values)
+            if row is None:
+                row = self.values[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            row[index] += 1
+            row[-1] += value
+
+    def samples(self):
+        with self.lock:
+            items = [(k, list(v)) for k, v in self.values.items()]
+        for label_values, row in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, row):
+                cumulative += count
+                yield f"{self.name}_bucket", _format_labels(self.labels, label_values, f'le="{bound}"'), cumulative
+            cumulative += row[len(self.buckets)]
+            yield f"{self.name}_bucket", _format_labels(self.labels, label_values, 'le="+Inf"'), cumulative
+            yield f"{self.name}_sum", _format_labels(self.labels, label_values), row[-1]
+            yield f"{self.name}_count", _format_labels(self.labels, label_values), cumulative
+
+
+# ✅ 프로세스 단위 지표 목록 (등록 순서대로 출력)
+_registry = []
+
+
+def register(metric):
+    _registry.append(metric)
+    return metric
+
+
+def counter(name, help_text, labels=()):
+    return register(Counter(name, help_text, labels))
+
+
+def gauge(name, help_text, func):
+    return register(Gauge(name, help_text, func))
+
+
+def histogram(name, help_text, labels=(), buckets=HTTP_LATENCY_BUCKETS):
+    return register(Histogram(name, help_text, labels, buckets))
+
+
+# 🔧 Prometheus 텍스트 형식 (version 0.0.4)
+def render():
+    lines = []
+    for metric in _registry:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for name, labels, value in metric.samples():
+            lines.append(f"{name}{labels} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+http_request_duration = histogram(
+    "http_request_duration_seconds", "라우트별 요청 처리 시간 (스트리밍 응답은 본문 전송 전까지)",
+    ("method", "route"),
+)
+http_requests = counter("http_requests_total", "라우트/상태 코드별 요청 수", ("method", "route", "status"))
+
+
+# 🔧 요청 시작 시각 기록
+def _start_timer():
+    g._metrics_started = time.perf_counter()
+
+
+# 🔧 응답 직전에 소요 시간 기록 (라우트 레이블은 URL 규칙이라 /fridge/list/<user_id> 처럼 사용자별로 갈라지지 않음)
+def _record_request(response):
+    started = g.pop('_metrics_started', None)
+    if started is not None:
+        rule = request.url_rule
+        route = rule.rule if rule is not None else "<unmatched>"
+        http_request_duration.observe(time.perf_counter() - started, request.method, route)
+        http_requests.inc(request.method, route, str(response.status_code))
+    return response
+
+
+def metrics_view():
+    return Response(render(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+def init_app(app):
+    if not METRICS_ENABLED:
+        return
+    app.before_request(_start_timer)
+    app.after_request(_record_request)
+    app.add_url_rule("/metrics", "metrics", metrics_view, methods=["GET"])
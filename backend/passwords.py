@@ -0,0 +1,110 @@
+# backend/passwords.py : 비밀번호 해시/검증의 동시 실행 수 제한 + 초과분 거절
+
+# scrypt / pbkdf2 는 일부러 느리게 만든 함수라서 로그인이 몰리면 CPU 를 다 써서
+# 레시피 조회 같은 다른 요청까지 밀린다. 해시 작업은 크기가 정해진 풀에서만 돌려서 동시 실행 수를 묶고,
+# 대기 중인 작업이 너무 많거나 PASSWORD_HASH_TIMEOUT 안에 끝나지 않으면 거절(PasswordHashBusy → 503)한다.
+# 요청 스레드는 결과가 나올 때까지 기다리므로 해시를 요청 스레드에서 떼어 내는 것은 아니고,
+# 한꺼번에 몰린 해시 요청이 CPU 와 요청 스레드를 끝없이 붙잡지 않게 하는 용도이다.
+# - thread: hashlib 의 scrypt/pbkdf2 는 계산 중 GIL 을 놓기 때문에 스레드로도 코어 수만큼 병렬 처리됨
+# - process: 별도 프로세스에서 실행 (GIL 을 놓지 않는 해시 방식을 쓸 때)
+
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from flask import jsonify
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from config import (
+    PASSWORD_HASH_METHOD, PASSWORD_HASH_EXECUTOR, PASSWORD_HASH_WORKERS,
+    PASSWORD_HASH_MAX_PENDING, PASSWORD_HASH_TIMEOUT
+)
+
+
+class PasswordHashBusy(Exception):
+    """해시 작업 대기열이 가득 찼거나 PASSWORD_HASH_TIMEOUT 안에 끝나지 않은 경우 (503 으로 응답)"""
+
+
+_executor = None
+_executor_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(PASSWORD_HASH_MAX_PENDING)
+
+
+# 🔧 작업자 풀 (최초 사용 시 생성)
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                if PASSWORD_HASH_EXECUTOR == "process":
+                    _executor = ProcessPoolExecutor(max_workers=PASSWORD_HASH_WORKERS)
+                else:
+                    _executor = ThreadPoolExecutor(
+                        max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+                    )
+    return _executor
+
+
+# 🔧 풀에서 함수 실행 후 결과 대기 (호출한 요청 스레드는 기다림, 자리가 없거나 시간 안에 끝나지 않으면 PasswordHashBusy)
+def _run(fn, *args):
+    if not _slots.acquire(blocking=False):
+        raise PasswordHashBusy()
+    try:
+        future = _get_executor().submit(fn, *args)
+    except BaseException:
+        _slots.release()
+        raise
+    future.add_done_callback(lambda _: _slots.release())
+    try:
+        return future.result(timeout=PASSWORD_HASH_TIMEOUT)
+    except FutureTimeoutError:
+        future.cancel()             # 아직 시작하지 않은 작업이면 취소해서 자리를 바로 반납
+        raise PasswordHashBusy()
+
+
+# ✅ 현재 설정(PASSWORD_HASH_METHOD)으로 비밀번호 해시 생성
+def hash_password(password):
+    return _run(generate_password_hash, password, PASSWORD_HASH_METHOD)
+
+
+# ✅ 저장된 해시와 입력 비밀번호 비교
+def check_password(pwhash, password):
+    return _run(check_password_hash, pwhash, password)
+
+
+# 🔧 설정값을 Werkzeug 가 실제로 저장하는 형태로 변환 ("scrypt" → "scrypt:32768:8:1")
+# (해시를 한 번 만들어 봐야 알 수 있으므로 요청 중이 아니라 init_app 에서 미리 계산)
+_method_prefix = None
+
+
+def _compute_method_prefix():
+    global _method_prefix
+    _method_prefix = generate_password_hash("", PASSWORD_HASH_METHOD).split("$", 1)[0]
+    return _method_prefix
+
+
+def _current_method():
+    return _method_prefix if _method_prefix is not None else _compute_method_prefix()
+
+
+# ✅ 저장된 해시가 현재 설정과 다른 방식/비용으로 만들어졌는지 확인
+def needs_rehash(pwhash):
+    # Werkzeug 해시 형식: "방식:파라미터$salt$hash"
+    return pwhash.split("$", 1)[0] != _current_method()
+
+
+# 🔧 대기열 초과 시 503 응답 (app 에 등록)
+def _busy(error):
+    return jsonify({"error": "요청이 많아 잠시 후 다시 시도해주세요."}), 503
+
+
+def init_app(app):
+    _compute_method_prefix()
+    app.register_error_handler(PasswordHashBusy, _busy)
+
+
+def shutdown():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+            _executor = None
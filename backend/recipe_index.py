@@ -0,0 +1,147 @@
+# backend/recipe_index.py : 재료명 → RCP_SNO 역색인 (inverted index)
+
+# CKG_MTRL_CN 문자열을 한 번만 파싱해서 "재료명 → 정렬된 RCP_SNO 목록(posting list)"을 만들어 두고,
+# /recipes/search 요청은 LIKE '%재료%' 전체 스캔 대신 posting list 교집합/합집합으로 처리한다.
+
+import re
+import threading
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from functools import lru_cache
+
+# [재료], [양념] 같은 구역(section) 표기 제거용 정규식
+SECTION_RE = re.compile(r'\[[^\]]*\]')
+
+
+# 🔧 CKG_MTRL_CN 원문에서 재료명만 추출 ("이름\a수량\a단위|이름\a수량\a단위" 형식)
+def parse_ingredient_names(raw_str):
+    if not raw_str:
+        return []
+    cleaned = SECTION_RE.sub('', raw_str)
+    names = []
+    for itm in cleaned.split('|'):
+        name = itm.split('\a')[0].strip()
+        if name:
+            names.append(name)
+    return names
+
+
+# 🔧 정렬된 두 posting list 교집합 (작은 쪽을 기준으로 bisect 탐색)
+def intersect_sorted(small, large):
+    result = []
+    lo = 0
+    n = len(large)
+    for value in small:
+        lo = bisect_left(large, value, lo)
+        if lo == n:
+            break
+        if large[lo] == value:
+            result.append(value)
+    return result
+
+
+class IngredientIndex:
+    """재료명 → 정렬된 RCP_SNO 배열(posting list)을 보관하는 역색인"""
+
+    def __init__(self, postings):
+        self.postings = postings                # {재료명: array('l', 정렬된 RCP_SNO)}
+        self.vocabulary = list(postings)        # 부분 일치 검색용 재료명 목록
+        # 같은 검색어가 반복되는 경우가 많으므로 검색어별 posting list 를 캐시
+        self.lookup = lru_cache(maxsize=1024)(self._lookup)
+
+    @classmethod
+    def build(cls, conn):
+        """recipe_ingredients 테이블(import_recipes.py 가 생성)에서 색인 생성, 없으면 원문 파싱"""
+        cursor = conn.cursor()
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'recipe_ingredients'")
+        if cursor.fetchone():
+            return cls.build_from_table(conn)
+        return cls.build_from_text(conn)
+
+    @classmethod
+    def build_from_table(cls, conn):
+        """idx_recipe_ingredients_name (name, RCP_SNO) 순서 그대로 읽으면 posting list 가 이미 정렬되어 있음"""
+        postings = {}
+        current, bucket = None, None
+        cursor = conn.cursor()
+        cursor.execute("SELECT DISTINCT name, RCP_SNO FROM recipe_ingredients ORDER BY name, RCP_SNO")
+        for name, rcp_sno in cursor:
+            if name != current:
+                current, bucket = name, array('l')
+                postings[name] = bucket
+            bucket.append(rcp_sno)
+        return cls(postings)
+
+    @classmethod
+    def build_from_text(cls, conn):
+        """recipes_dataset 전체를 RCP_SNO 순으로 한 번 읽어서 CKG_MTRL_CN 을 직접 파싱"""
+        buckets = defaultdict(lambda: array('l'))
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT RCP_SNO, CKG_MTRL_CN FROM recipes_dataset "
+            "WHERE CKG_MTRL_CN IS NOT NULL ORDER BY RCP_SNO"
+        )
+        for rcp_sno, raw in cursor:
+            for name in set(parse_ingredient_names(raw)):
+                bucket = buckets[name]
+                # RCP_SNO 오름차순으로 읽으므로 append 만으로 정렬 상태가 유지됨
+                if not bucket or bucket[-1] != rcp_sno:
+                    bucket.append(rcp_sno)
+        return cls(dict(buckets))
+
+    def _lookup(self, term):
+        """검색어를 포함하는 모든 재료명의 posting list 합집합 (기존 LIKE '%재료%' 의미 유지)"""
+        term = term.strip()
+        if not term:
+            return ()
+        matched = [self.postings[name] for name in self.vocabulary if term in name]
+        if not matched:
+            return ()
+        if len(matched) == 1:
+            return tuple(matched[0])
+        merged = set()
+        for plist in matched:
+            merged.update(plist)
+        return tuple(sorted(merged))
+
+    def search_all(self, terms):
+        """모든 재료를 포함하는 RCP_SNO 목록 (오름차순)"""
+        plists = sorted((self.lookup(t) for t in terms), key=len)
+        if not plists or not plists[0]:
+            return []
+        result = list(plists[0])
+        for plist in plists[1:]:
+            result = intersect_sorted(result, plist)
+            if not result:
+                break
+        return result
+
+    def search_any(self, terms):
+        """하나 이상의 재료를 포함하는 (RCP_SNO, 일치 재료 수) 목록 - 일치 수 내림차순, RCP_SNO 오름차순"""
+        counts = defaultdict(int)
+        for term in set(terms):
+            for rcp_sno in self.lookup(term):
+                counts[rcp_sno] += 1
+        return sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))
+
+
+# ✅ 프로세스 단위 싱글턴 (최초 검색 시 한 번만 생성)
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_ingredient_index(conn):
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = IngredientIndex.build(conn)
+    return _index
+
+
+def reset_ingredient_index():
+    """recipes_dataset 을 다시 적재한 뒤 색인을 새로 만들도록 초기화"""
+    global _index
+    with _index_lock:
+        _index = None
@@ -0,0 +1,119 @@
+# backend/response_cache.py : 레시피 조회 응답 LRU 캐시 + 데이터셋 버전 확인
+
+# recipes_dataset 은 import_recipes.py 로 적재할 때만 바뀌므로 /recipes/search, /recipes/category 같은
+# 조회 결과는 같은 파라미터면 항상 같다. 정규화한 파라미터를 키로 직렬화된 JSON 바이트를 보관하고,
+# 본문 크기 합이 RESPONSE_CACHE_MAX_BYTES 를 넘으면 가장 오래 쓰이지 않은 응답부터 버린다.
+# import_recipes.py 가 dataset_meta 의 recipes_version 을 올리면 캐시와 재료 역색인을 함께 비운다.
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app
+
+from config import RESPONSE_CACHE_MAX_BYTES, RESPONSE_CACHE_MAX_ENTRY_BYTES, DATASET_VERSION_CHECK_INTERVAL
+from recipe_index import reset_ingredient_index
+
+
+class ResponseCache:
+    """(키 → (상태 코드, JSON 바이트)) LRU 캐시, 본문 크기 기준으로 제거"""
+
+    def __init__(self, max_bytes=RESPONSE_CACHE_MAX_BYTES, max_entry_bytes=RESPONSE_CACHE_MAX_ENTRY_BYTES):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, status, body):
+        if len(body) > self.max_entry_bytes:
+            return
+        with self.lock:
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old[1])
+            self.entries[key] = (status, body)
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                _, (_, evicted) = self.entries.popitem(last=False)
+                self.size -= len(evicted)
+                self.evictions += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    def stats(self):
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self.entries),
+                "bytes": self.size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+# ✅ 프로세스 단위 캐시
+recipe_cache = ResponseCache()
+
+# 데이터셋 버전 (import_recipes.py 가 적재할 때마다 증가)
+_dataset_version = None
+_checked_at = 0.0
+_version_lock = threading.Lock()
+
+
+def _read_dataset_version(conn):
+    try:
+        row = conn.execute("SELECT value FROM dataset_meta WHERE key = 'recipes_version'").fetchone()
+    except sqlite3.OperationalError:
+        return 0                # 예전 DB (dataset_meta 없음)
+    return int(row[0]) if row else 0
+
+
+# ✅ 현재 데이터셋 버전 (DATASET_VERSION_CHECK_INTERVAL 마다 DB 확인, 바뀌었으면 캐시/역색인 초기화)
+def get_dataset_version(conn):
+    global _dataset_version, _checked_at
+    now = time.monotonic()
+    if _dataset_version is not None and now - _checked_at < DATASET_VERSION_CHECK_INTERVAL:
+        return _dataset_version
+    with _version_lock:
+        if _dataset_version is None or now - _checked_at >= DATASET_VERSION_CHECK_INTERVAL:
+            version = _read_dataset_version(conn)
+            if _dataset_version is not None and version != _dataset_version:
+                recipe_cache.clear()
+                reset_ingredient_index()
+            _dataset_version = version
+            _checked_at = now
+    return _dataset_version
+
+
+# 🔧 캐시된 (상태 코드, 바이트) → 응답 객체
+def cached_response(entry):
+    status, body = entry
+    return current_app.response_class(body, status=status, mimetype="application/json")
+
+
+# 🔧 응답 데이터를 jsonify 와 같은 형식으로 직렬화해서 캐시에 넣고 응답 반환
+def cache_json(key, payload, status=200):
+    body = f"{current_app.json.dumps(payload)}\n".encode("utf-8")
+    recipe_cache.put(key, status, body)
+    return cached_response((status, body))
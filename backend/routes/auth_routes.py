@@ -1,29 +1,19 @@
-# 📤 SMTP 메일 전송을 위한 표준 파이썬 모듈
-import smtplib
 # 🔐 임시 비밀번호 생성 시 사용할 랜덤 문자 및 숫자 도구
 import random
 import string
-# 📨 메일 본문 작성 및 포맷 설정을 위한 모듈 (plain text, subject 등 포함 가능)
-from email.message import EmailMessage
 # 🔧 Flask 기본 구성 요소: 라우팅 블루프린트, 요청 처리, JSON 응답 등
 from flask import Blueprint, request, jsonify
-# 🔐 비밀번호 해싱 및 검증을 위한 Werkzeug 유틸리티
-from werkzeug.security import check_password_hash, generate_password_hash
-# 📁 메일 발송을 위한 설정 값 (이메일 주소, 비밀번호, 서버, 포트) 가져오기
-from config import EMAIL_ADDRESS, EMAIL_PASSWORD, SMTP_SERVER, SMTP_PORT
-# 🗄️ SQLite 데이터베이스 연동을 위한 모듈
-import sqlite3
+# 🗄️ 공용 SQLite 연결 (요청 단위 연결 풀)
+from database import get_db_connection
+# 🔐 비밀번호 해싱 및 검증 (요청 스레드 밖의 작업자 풀에서 실행)
+from passwords import check_password, hash_password, needs_rehash
+# 📨 메일 발송 대기열 (백그라운드 스레드가 SMTP 로 발송)
+from mailer import enqueue_email, notify
 
 
 # 🔧 Blueprint 정의
 auth_bp = Blueprint('auth', __name__)
 
-# 📦 DB 연결 함수
-def get_db_connection():
-    conn = sqlite3.connect('db/fridge.db')
-    conn.row_factory = sqlite3.Row
-    return conn
-
 # ✅ 회원가입 API
 @auth_bp.route('/signup', methods=['POST'])
 def signup():
@@ -48,17 +38,15 @@ def signup():
     # 🔁 아이디 중복 검사
     cursor.execute("SELECT 1 FROM users WHERE user_id = ?", (user_id,))
     if cursor.fetchone():
-        conn.close()
         return jsonify({"error": "이미 사용 중인 아이디입니다."}), 409
 
     # 🔁 이메일 중복 검사
     cursor.execute("SELECT 1 FROM users WHERE email = ?", (email,))
     if cursor.fetchone():
-        conn.close()
         return jsonify({"error": "이미 가입된 이메일입니다."}), 409
 
     # 🔐 비밀번호 해시 처리 (보안 강화)
-    hashed_pw = generate_password_hash(password)
+    hashed_pw = hash_password(password)
 
     # 💾 회원정보 DB에 저장
     cursor.execute(
@@ -66,7 +54,6 @@ def signup():
         (user_id, username, email, hashed_pw)
     )
     conn.commit()   # ✅ 변경사항 커밋
-    conn.close()    # 🔚 DB 연결 종료
 
     return jsonify({"message": "회원가입이 완료되었습니다."}), 201  # 🎉 가입 완료 응답
 
@@ -92,7 +79,6 @@ def update_username():
         (new_name, user_id)
     )
     conn.commit()   # ✅ 변경사항 저장
-    conn.close()    # 🔚 DB 연결 종료
 
     return jsonify({"message": "사용자 이름이 성공적으로 업데이트되었습니다."}), 200
 
@@ -108,9 +94,7 @@ def check_id(user_id):
     cursor.execute("SELECT 1 FROM users WHERE user_id = ?", (user_id,))
     # 📛 이미 존재하는 경우
     if cursor.fetchone():
-        conn.close()
         return jsonify({"error": "이미 사용 중인 아이디입니다."}), 409
-    conn.close()
     return jsonify({"message": "✅ 사용 가능한 아이디입니다."}), 200    # ✅ 사용 가능
 
 # ✅ 이메일 중복 확인 API
@@ -125,9 +109,7 @@ def check_email(email):
     cursor.execute("SELECT 1 FROM users WHERE email = ?", (email,))
 
     if cursor.fetchone():
-        conn.close()
         return jsonify({"error": "이미 가입된 이메일입니다."}), 409     # 📛 중복
-    conn.close()
     return jsonify({"message": "✅ 사용 가능한 이메일입니다."}), 200    # ✅ 사용 가능
 
 # ✅ 로그인 API
@@ -149,15 +131,22 @@ def login():
     # DB에서 사용자 정보 조회
     cursor.execute("SELECT * FROM users WHERE user_id = ?", (user_id,))
     user = cursor.fetchone()
-    conn.close()
 
     # 📛 존재하지 않는 ID
     if not user:
         return jsonify({"error": "존재하지 않는 아이디입니다."}), 404
     # ❌ 비밀번호 불일치
-    if not check_password_hash(user['password'], password):
+    if not check_password(user['password'], password):
         return jsonify({"error": "비밀번호가 일치하지 않습니다."}), 401
 
+    # 🔄 예전 방식/비용으로 저장된 해시는 로그인 성공 시 현재 설정으로 다시 저장
+    if needs_rehash(user['password']):
+        cursor.execute(
+            "UPDATE users SET password = ? WHERE id = ? AND password = ?",
+            (hash_password(password), user['id'], user['password'])
+        )
+        conn.commit()
+
     # ✅ 로그인 성공 시 사용자 정보 반환
     return jsonify({
         "message": "로그인 성공",
@@ -177,7 +166,6 @@ def find_id(email):
     # DB에서 ID 검색
     cursor.execute("SELECT user_id FROM users WHERE email = ?", (email,))
     row = cursor.fetchone()
-    conn.close()
 
     # ✅ ID 반환
     if row:
@@ -215,20 +203,11 @@ def reset_password():
 
     # 🔐 임시 비밀번호 생성 (영문 + 숫자 8자리)
     temp_password = ''.join(random.choices(string.ascii_letters + string.digits, k=8))
-    hashed_pw = generate_password_hash(temp_password)
+    hashed_pw = hash_password(temp_password)
 
-    # ✅ DB에 임시 비밀번호 저장
+    # ✅ DB에 임시 비밀번호 저장 + 안내 메일을 발송 대기열에 추가 (같은 트랜잭션)
     cursor.execute("UPDATE users SET password = ? WHERE email = ?", (hashed_pw, email))
-    conn.commit()
-    conn.close()
-
-    try:
-        # 📧 이메일 전송 구성
-        msg = EmailMessage()
-        msg["Subject"] = "ByteBite 비밀번호 재설정 안내"
-        msg["From"] = EMAIL_ADDRESS
-        msg["To"] = email
-        msg.set_content(f"""
+    enqueue_email(conn, email, "ByteBite 비밀번호 재설정 안내", f"""
         안녕하세요, ByteBite 사용자님.
 
         요청하신 임시 비밀번호는 아래와 같습니다:
@@ -237,15 +216,8 @@ def reset_password():
 
         로그인 후 반드시 비밀번호를 변경해 주세요.
         """)
+    conn.commit()
 
-        # 📤 SMTP 서버를 통해 이메일 전송
-        server = smtplib.SMTP(SMTP_SERVER, SMTP_PORT)
-        server.starttls()
-        server.login(EMAIL_ADDRESS, EMAIL_PASSWORD)
-        server.send_message(msg)
-        server.quit()
-
-        return jsonify({"message": "비밀번호 재설정 이메일이 발송되었습니다."}), 200    # ✅ 전송 성공
-
-    except Exception as e:
-        return jsonify({"error": "메일 전송 실패", "details": str(e)}), 500            # ❌ 전송 실패
\ No newline at end of file
+    # 📤 실제 발송은 백그라운드 스레드가 처리하므로 바로 응답
+    notify()
+    return jsonify({"message": "비밀번호 재설정 이메일 발송이 요청되었습니다. 잠시 후 메일함을 확인해주세요."}), 200
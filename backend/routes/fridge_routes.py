@@ -2,36 +2,50 @@
 
 # ✅ Flask 기본 기능 import: 라우팅, 요청 처리, 응답 생성
 from flask import Blueprint, request, jsonify
-# ✅ SQLite DB 연동
-import sqlite3
+# ✅ 공용 SQLite 연결 (요청 단위 연결 풀)
+from database import (
+    get_db_connection, get_user_numeric_id, get_user_version, bump_user_version, normalize_item_name
+)
+# ✅ 목록 조회 ETag (변경이 없으면 304)
+from etag import user_etag, is_not_modified, not_modified, with_etag
 
 # ✅ 냉장고 관련 API들을 모은 Blueprint 생성
 fridge_bp = Blueprint('fridge', __name__)
 
-# ✅ DB 연결 함수 정의
-def get_db_connection():
-    conn = sqlite3.connect('db/fridge.db')
-    conn.row_factory = sqlite3.Row
-    return conn
-
-# 🔧 외부 user_id (문자열 ID) → 내부 users.id (정수형 PK)로 변환
-def get_user_numeric_id(user_id):
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    # users 테이블에서 user_id에 해당하는 고유 id 조회
-    cursor.execute("SELECT id FROM users WHERE user_id = ?", (user_id,))
-    row = cursor.fetchone()
-    conn.close()
-
-    return row["id"] if row else None                   # 조회 성공 시 id 반환, 실패 시 None
+MAX_SYNC_ITEMS = 500        # /fridge/sync 한 번에 처리할 수 있는 최대 항목 수 (add + remove)
+
+
+# 🔧 sync 요청 항목 → (재료명, 조미료 여부) 목록 ("양파" 또는 {"item_name": "양파", "is_seasoning": 0})
+def parse_sync_items(items):
+    if items is None:
+        return []
+    if not isinstance(items, list):
+        raise ValueError("add / remove 는 목록이어야 합니다.")
+    parsed = []
+    for item in items:
+        if isinstance(item, str):
+            name, is_seasoning = item, 0
+        elif isinstance(item, dict):
+            name, is_seasoning = item.get('item_name'), item.get('is_seasoning', 0)
+        else:
+            raise ValueError("잘못된 재료 항목입니다.")
+        name = normalize_item_name(name)
+        if not name:
+            raise ValueError("재료명이 비어 있습니다.")
+        # /fridge/add 와 같은 규칙 (int 변환, "0" → 0)
+        try:
+            is_seasoning = int(is_seasoning)
+        except (TypeError, ValueError):
+            raise ValueError("is_seasoning 은 0 또는 1 이어야 합니다.")
+        parsed.append((name, is_seasoning))
+    return parsed
 
 # ✅ 재료 추가 API
 @fridge_bp.route('/fridge/add', methods=['POST'])
 def add_ingredient():
     data = request.get_json()                           # 클라이언트에서 보낸 JSON 데이터 파싱
     user_id = data.get('user_id')                       # 사용자 ID
-    item_name = data.get('item_name')                   # 재료명
+    item_name = normalize_item_name(data.get('item_name'))     # 재료명 (sync 와 같이 앞뒤 공백 제거)
     is_seasoning = int(data.get('is_seasoning', 0))     # 조미료 여부 (0 또는 1)
 
     # ❌ 필수 항목 누락 시 에러 반환
@@ -46,22 +60,15 @@ def add_ingredient():
     conn = get_db_connection()
     cursor = conn.cursor()
 
-    # 🔍 이미 같은 이름/종류의 재료가 존재하는지 확인
+    # ✅ 재료 추가 (user_id, item_name, is_seasoning 유니크 인덱스로 중복이면 무시됨)
     cursor.execute(
-        "SELECT 1 FROM fridge_items WHERE user_id = ? AND item_name = ? AND is_seasoning = ?",
+        "INSERT OR IGNORE INTO fridge_items (user_id, item_name, is_seasoning) VALUES (?, ?, ?)",
         (user_numeric_id, item_name, is_seasoning)
     )
-    if cursor.fetchone():
-        conn.close()
+    if cursor.rowcount == 0:
         return jsonify({"error": "이미 등록된 재료입니다."}), 409       # 중복 에러 반환
-
-    # ✅ 중복이 아니면 재료 추가
-    cursor.execute(
-        "INSERT INTO fridge_items (user_id, item_name, is_seasoning) VALUES (?, ?, ?)",
-        (user_numeric_id, item_name, is_seasoning)
-    )
+    bump_user_version(conn, user_numeric_id, 'fridge')                  # 목록 ETag 갱신
     conn.commit()
-    conn.close()
 
     return jsonify({"message": "재료가 추가되었습니다."}), 201          # 🎉 추가 성공 응답
 
@@ -70,7 +77,7 @@ def add_ingredient():
 def delete_fridge_item():
     data = request.get_json()
     user_id = data.get('user_id')                                       # 사용자 ID
-    item_name = data.get('item_name')                                   # 삭제할 재료명
+    item_name = normalize_item_name(data.get('item_name'))              # 삭제할 재료명 (앞뒤 공백 제거)
     is_seasoning = int(data.get('is_seasoning', 0))                     # 조미료 여부
 
     # ❌ 필수 정보 누락 시 에러
@@ -90,8 +97,9 @@ def delete_fridge_item():
         "DELETE FROM fridge_items WHERE user_id = ? AND item_name = ? AND is_seasoning = ?",
         (user_numeric_id, item_name, is_seasoning)
     )
+    if cursor.rowcount:
+        bump_user_version(conn, user_numeric_id, 'fridge')              # 목록 ETag 갱신
     conn.commit()
-    conn.close()
 
     return jsonify({"message": "재료가 삭제되었습니다."}), 200           # ✅ 삭제 완료 응답
 
@@ -99,18 +107,76 @@ def delete_fridge_item():
 # ✅ 사용자의 모든 재료 조회 API
 @fridge_bp.route('/fridge/list/<user_id>', methods=['GET'])
 def get_fridge_items(user_id):
-    user_numeric_id = get_user_numeric_id(user_id)                      # 문자열 ID → 내부 정수 ID 변환
+    # 문자열 ID → 내부 정수 ID 변환 + 냉장고 목록 버전 조회
+    user_numeric_id, version = get_user_version(user_id, 'fridge')
     if not user_numeric_id:
         return jsonify({"error": "사용자를 찾을 수 없습니다."}), 404
 
+    # ✅ 클라이언트 목록이 최신이면 재료 테이블을 읽지 않고 304
+    tag = user_etag('fridge', user_numeric_id, version)
+    if is_not_modified(tag):
+        return not_modified(tag)
+
     conn = get_db_connection()
     cursor = conn.cursor()
 
     # 해당 사용자에 등록된 재료 전체 조회
     cursor.execute("SELECT item_name, is_seasoning FROM fridge_items WHERE user_id = ?", (user_numeric_id,))
     items = cursor.fetchall()
-    conn.close()
 
     # JSON 형식으로 응답 구성
     result = [{"item_name": row["item_name"], "is_seasoning": row["is_seasoning"]} for row in items]
-    return jsonify({"items": result}), 200                                # ✅ 전체 목록 반환
+    return with_etag(jsonify({"items": result}), tag), 200                # ✅ 전체 목록 반환
+
+
+# ✅ 재료 일괄 반영 API (추가/삭제 목록을 한 트랜잭션으로 처리)
+# 요청 예: {"user_id": "abc", "add": ["양파", {"item_name": "소금", "is_seasoning": 1}], "remove": ["대파"]}
+@fridge_bp.route('/fridge/sync', methods=['POST'])
+def sync_fridge_items():
+    data = request.get_json(silent=True) or {}
+    user_id = data.get('user_id')
+
+    if not user_id:
+        return jsonify({"error": "필수 정보가 누락되었습니다."}), 400
+    try:
+        to_add = parse_sync_items(data.get('add'))
+        to_remove = parse_sync_items(data.get('remove'))
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+    if len(to_add) + len(to_remove) > MAX_SYNC_ITEMS:
+        return jsonify({"error": f"한 번에 최대 {MAX_SYNC_ITEMS}개까지 처리할 수 있습니다."}), 400
+
+    user_numeric_id = get_user_numeric_id(user_id)
+    if not user_numeric_id:
+        return jsonify({"error": "사용자 정보를 찾을 수 없습니다."}), 404
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    # 🔄 삭제 먼저 처리한 뒤 추가 (같은 재료가 양쪽에 있으면 결과적으로 남음)
+    try:
+        removed = added = 0
+        for name, is_seasoning in to_remove:
+            cursor.execute(
+                "DELETE FROM fridge_items WHERE user_id = ? AND item_name = ? AND is_seasoning = ?",
+                (user_numeric_id, name, is_seasoning)
+            )
+            removed += cursor.rowcount
+        for name, is_seasoning in to_add:
+            cursor.execute(
+                "INSERT OR IGNORE INTO fridge_items (user_id, item_name, is_seasoning) VALUES (?, ?, ?)",
+                (user_numeric_id, name, is_seasoning)
+            )
+            added += cursor.rowcount
+        if added or removed:
+            bump_user_version(conn, user_numeric_id, 'fridge')          # 목록 ETag 갱신
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    return jsonify({
+        "message": "냉장고 재료가 반영되었습니다.",
+        "added": added,                 # 새로 추가된 재료 수 (이미 있던 재료 제외)
+        "removed": removed              # 실제로 삭제된 재료 수
+    }), 200
@@ -2,136 +2,358 @@
 
 from flask import Blueprint, request, jsonify
 import sqlite3
-import os
+from bisect import bisect_right
 from datetime import datetime
 
+from database import get_db_connection, get_user_numeric_id, get_user_version, bump_user_version
+from etag import user_etag, is_not_modified, not_modified, with_etag
+from recipe_index import get_ingredient_index
+from response_cache import recipe_cache, get_dataset_version, cached_response, cache_json
+from streaming import stream_format, stream_response
+from config import STREAM_PAGE_SIZE
 
-recipe_bp = Blueprint('recipe', __name__)
-
-# ✅ DB 연결 함수 정의
-def get_db_connection():
-    # 현재 파일 기준 상위 폴더(backend) 하위에 있는 db/fridge.db 경로 설정
-    db_path = os.path.join(os.path.dirname(__file__), '..', 'db', 'fridge.db')
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row  # 결과를 딕셔너리처럼 반환
-    return conn
-
-# 🔧 외부 user_id (문자열 ID) → 내부 users.id (정수형 PK)로 변환
-def get_user_numeric_id(user_id):
-    conn = get_db_connection()
-    cursor = conn.cursor()
 
-    # users 테이블에서 user_id에 해당하는 고유 id 조회
-    cursor.execute("SELECT id FROM users WHERE user_id = ?", (user_id,))
-    row = cursor.fetchone()
-    conn.close()
+recipe_bp = Blueprint('recipe', __name__)
 
-    return row["id"] if row else None  # 조회 성공 시 id 반환, 실패 시 None
+# 🔧 RCP_SNO 목록 순서대로 레시피 행 조회 (SQLite 변수 개수 제한 때문에 나눠서 IN 조회)
+# chunk_size 개씩 읽어서 바로 내보내므로 목록이 길어도 메모리 사용량이 일정함
+def iter_recipes_by_ids(cursor, ids, chunk_size=500):
+    for start in range(0, len(ids), chunk_size):
+        chunk = ids[start:start + chunk_size]
+        placeholders = ",".join("?" * len(chunk))
+        cursor.execute(
+            f"SELECT RCP_SNO, RCP_TTL, CKG_MTRL_CN, CKG_STA_ACTO_NM FROM recipes_dataset "
+            f"WHERE RCP_SNO IN ({placeholders})",
+            chunk
+        )
+        rows_by_id = {row["RCP_SNO"]: row for row in cursor.fetchall()}
+        for i in chunk:
+            if i in rows_by_id:
+                yield rows_by_id[i]
+
+
+def fetch_recipes_by_ids(cursor, ids, chunk_size=500):
+    return list(iter_recipes_by_ids(cursor, ids, chunk_size))
+
+
+# ✅ 페이지 크기 설정 (limit 파라미터가 커도 MAX_PAGE_SIZE 까지만 반환)
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# 🔧 limit 파라미터 파싱 (1 ~ MAX_PAGE_SIZE 범위로 제한, 스트리밍 모드는 STREAM_PAGE_SIZE 까지)
+def parse_limit(name='limit', streaming=False):
+    default, maximum = (STREAM_PAGE_SIZE, STREAM_PAGE_SIZE) if streaming else (DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE)
+    return min(max(int(request.args.get(name, default)), 1), maximum)
+
+# 🔧 레시피 행 → 응답용 dict
+def recipe_summary(row):
+    return {
+        "RCP_SNO":         row["RCP_SNO"],
+        "RCP_TTL":         row["RCP_TTL"],
+        "CKG_MTRL_CN":     row["CKG_MTRL_CN"] or "",
+        "CKG_STA_ACTO_NM": row["CKG_STA_ACTO_NM"] or ""
+    }
 
 
 # ✅ [1] 재료 기반 레시피 검색
 @recipe_bp.route('/recipes/search', methods=['GET'])
 def search_recipes():
     """
-    GET /recipes/search?ingredients=감자&ingredients=양파&…
+    GET /recipes/search?ingredients=감자&ingredients=양파&mode=all|any&limit=20&cursor=…
     1) request.args.getlist('ingredients') 로 재료 목록(리스트) 얻기
-    2) SQL: WHERE CKG_MTRL_CN LIKE '%재료1%' AND LIKE '%재료2%' … 형태로 조회
-    3) 매칭된 레시피 없으면 404 + { "error": … }, 있으면 JSON 배열 리턴
+    2) 재료명 역색인(recipe_index)에서 재료별 RCP_SNO posting list 조회
+       - mode=all (기본값): 모든 재료를 포함하는 레시피 (RCP_SNO 오름차순)
+       - mode=any: 하나 이상 포함하는 레시피를 포함 재료 수(match_count) 내림차순으로 정렬
+    3) cursor 이후의 limit 개만 조회해서 { "recipes": […], "next_cursor": … } 반환
+       - cursor 는 이전 응답의 next_cursor 값 (all: "RCP_SNO", any: "match_count:RCP_SNO")
+       - 마지막 페이지면 next_cursor 는 null
+    4) 첫 페이지에 매칭된 레시피가 없으면 404 + { "error": … }
+    5) stream=ndjson|json 이면 행을 읽는 대로 스트리밍 (limit 기본값/최대값 STREAM_PAGE_SIZE)
     """
-    ingredients = request.args.getlist('ingredients')
+    ingredients = [ing.strip() for ing in request.args.getlist('ingredients') if ing.strip()]
     if not ingredients:
         # ❌ 재료가 1개도 없을 경우 오류 반환
         return jsonify({"error": "검색할 재료를 최소 1개 이상 지정해주세요."}), 400
 
+    mode = request.args.get('mode', 'all')
+    if mode not in ('all', 'any'):
+        return jsonify({"error": "mode 는 'all' 또는 'any' 만 사용할 수 있습니다."}), 400
+
+    fmt = stream_format()
+    cursor_arg = request.args.get('cursor')
+    try:
+        limit = parse_limit(streaming=fmt is not None)
+        if mode == 'all':
+            after = int(cursor_arg) if cursor_arg else None
+        else:
+            after = tuple(int(v) for v in cursor_arg.split(':', 1)) if cursor_arg else None
+            if after is not None and len(after) != 2:
+                raise ValueError(cursor_arg)
+    except ValueError:
+        return jsonify({"error": "limit 또는 cursor 값이 올바르지 않습니다."}), 400
+
     conn = get_db_connection()
     cursor = conn.cursor()
 
-    # ✅ SQL 기본 조건 (WHERE 1=1은 뒤에 조건을 추가하기 쉽게 함)
-    sql = "SELECT RCP_SNO, RCP_TTL, CKG_MTRL_CN, CKG_STA_ACTO_NM FROM recipes_dataset WHERE 1=1"
-    params = []
-
-    # ✅ 각각의 재료에 대해 LIKE 조건 추가
-    for ing in ingredients:
-        sql += " AND CKG_MTRL_CN LIKE ?"
-        params.append(f"%{ing}%")
-
-    cursor.execute(sql, params)         # ✅ SQL 실행
-    rows = cursor.fetchall()
-    conn.close()
-
-    if not rows:
+    # ✅ 같은 조건(재료 순서/중복 무시)의 응답이 캐시에 있으면 그대로 반환 (스트리밍 요청은 캐시하지 않음)
+    key = (get_dataset_version(conn), 'search', mode, tuple(sorted(set(ingredients))), limit, cursor_arg or '')
+    cached = recipe_cache.get(key) if fmt is None else None
+    if cached:
+        return cached_response(cached)
+
+    # ✅ 역색인 조회 (최초 호출 시 한 번만 생성) 후 cursor 다음 위치부터 limit 개만 잘라냄
+    index = get_ingredient_index(conn)
+    if mode == 'all':
+        ids = index.search_all(ingredients)
+        start = bisect_right(ids, after) if after is not None else 0
+        page_ids = ids[start:start + limit]
+        match_counts = None
+        has_more = start + limit < len(ids)
+        next_cursor = str(page_ids[-1]) if has_more else None
+    else:
+        ranked = index.search_any(ingredients)
+        start = 0
+        if after is not None:
+            count, rcp_sno = after
+            start = bisect_right(ranked, (-count, rcp_sno), key=lambda kv: (-kv[1], kv[0]))
+        page = ranked[start:start + limit]
+        page_ids = [rcp_sno for rcp_sno, _ in page]
+        match_counts = dict(page)
+        has_more = start + limit < len(ranked)
+        next_cursor = f"{page[-1][1]}:{page[-1][0]}" if has_more else None
+
+    if fmt is not None:
+        if not page_ids and not cursor_arg:
+            return jsonify({"error": "조건에 맞는 레시피가 없습니다."}), 404
+
+        def items():
+            for row in iter_recipes_by_ids(cursor, page_ids):
+                item = recipe_summary(row)
+                if match_counts is not None:
+                    item["match_count"] = match_counts[row["RCP_SNO"]]
+                yield item
+
+        return stream_response(fmt, items(), lambda: {"next_cursor": next_cursor})
+
+    rows = fetch_recipes_by_ids(cursor, page_ids)
+
+    if not rows and not cursor_arg:
         # ❌ 조건에 맞는 레시피 없음
-        return jsonify({"error": "조건에 맞는 레시피가 없습니다."}), 404
+        return cache_json(key, {"error": "조건에 맞는 레시피가 없습니다."}, 404)
 
     # ✅ 결과 리스트로 가공
     result = []
     for row in rows:
-        result.append({
-            "RCP_SNO":         row["RCP_SNO"],
-            "RCP_TTL":         row["RCP_TTL"],
-            "CKG_MTRL_CN":     row["CKG_MTRL_CN"] or "",
-            "CKG_STA_ACTO_NM": row["CKG_STA_ACTO_NM"] or ""
-        })
+        item = recipe_summary(row)
+        if match_counts is not None:
+            item["match_count"] = match_counts[row["RCP_SNO"]]
+        result.append(item)
 
-    return jsonify(result), 200         # ✅ 결과 반환
+    return cache_json(key, {"recipes": result, "next_cursor": next_cursor})    # ✅ 결과 반환 (캐시에 저장)
 
 # ✅ [2] 카테고리 기반 레시피 검색
 @recipe_bp.route('/recipes/category', methods=['GET'])
 def get_recipes_by_category():
     """
-    GET /recipes/category?category=아침식사
+    GET /recipes/category?category=아침식사&limit=20&cursor=…
     1) request.args.get('category') 로 카테고리 문자열 얻기
-    2) SQL: WHERE CKG_STA_ACTO_NM = ?
-    3) 매칭된 레시피 없으면 404 + { "error": … }, 있으면 JSON 배열 리턴
+    2) SQL: WHERE CKG_STA_ACTO_NM = ? AND RCP_SNO > cursor ORDER BY RCP_SNO LIMIT limit
+       (idx_recipes_category 인덱스로 필요한 행만 읽음)
+    3) { "recipes": […], "next_cursor": … } 반환, 마지막 페이지면 next_cursor 는 null
+    4) 첫 페이지에 레시피가 없으면 404 + { "error": … }
+    5) stream=ndjson|json 이면 행을 읽는 대로 스트리밍 (limit 기본값/최대값 STREAM_PAGE_SIZE)
     """
     category = request.args.get('category')     # ✅ 카테고리 값 받기
     if not category:
         # ❌ 파라미터 없음
         return jsonify({"error": "카테고리 이름을 지정해주세요."}), 400
 
+    fmt = stream_format()
+    cursor_arg = request.args.get('cursor')
+    try:
+        limit = parse_limit(streaming=fmt is not None)
+        after = int(cursor_arg) if cursor_arg else None
+    except ValueError:
+        return jsonify({"error": "limit 또는 cursor 값이 올바르지 않습니다."}), 400
+
     conn = get_db_connection()
     cursor = conn.cursor()
 
-    # ✅ 해당 카테고리의 레시피만 선택
+    # ✅ 아침식사처럼 자주 찾는 카테고리는 캐시된 응답으로 처리
+    key = (get_dataset_version(conn), 'category', category, limit, cursor_arg or '')
+    cached = recipe_cache.get(key) if fmt is None else None
+    if cached:
+        return cached_response(cached)
+
+    # ✅ 해당 카테고리의 레시피를 RCP_SNO 기준으로 한 페이지만 선택 (다음 페이지 확인용 +1)
     sql = """
       SELECT RCP_SNO, RCP_TTL, CKG_MTRL_CN, CKG_STA_ACTO_NM
       FROM recipes_dataset
-      WHERE CKG_STA_ACTO_NM = ?
+      WHERE CKG_STA_ACTO_NM = ? AND RCP_SNO > ?
+      ORDER BY RCP_SNO
+      LIMIT ?
     """
-    cursor.execute(sql, (category,))
+    cursor.execute(sql, (category, after if after is not None else -1, limit + 1))
+
+    if fmt is not None:
+        first = cursor.fetchone()
+        if first is None and not cursor_arg:
+            return jsonify({"error": f"'{category}' 카테고리의 레시피가 없습니다."}), 404
+
+        # 커서에서 한 행씩 읽어서 전송, limit + 1 번째 행이 있으면 다음 페이지 있음
+        page = {"last": None, "has_more": False}
+
+        def items():
+            row = first
+            sent = 0
+            while row is not None:
+                if sent == limit:
+                    page["has_more"] = True
+                    break
+                page["last"] = row["RCP_SNO"]
+                sent += 1
+                yield recipe_summary(row)
+                row = cursor.fetchone()
+
+        return stream_response(
+            fmt, items(),
+            lambda: {"next_cursor": str(page["last"]) if page["has_more"] else None}
+        )
+
     rows = cursor.fetchall()
-    conn.close()
 
-    if not rows:
+    if not rows and not cursor_arg:
         # ❌ 해당 카테고리에 레시피 없음
-        return jsonify({"error": f"'{category}' 카테고리의 레시피가 없습니다."}), 404
+        return cache_json(key, {"error": f"'{category}' 카테고리의 레시피가 없습니다."}, 404)
 
-    result = []
-    for row in rows:
-        result.append({
-            "RCP_SNO":         row["RCP_SNO"],
-            "RCP_TTL":         row["RCP_TTL"],
-            "CKG_MTRL_CN":     row["CKG_MTRL_CN"] or "",
-            "CKG_STA_ACTO_NM": row["CKG_STA_ACTO_NM"] or ""
-        })
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    result = [recipe_summary(row) for row in rows]
+    next_cursor = str(rows[-1]["RCP_SNO"]) if has_more else None
+
+    return cache_json(key, {"recipes": result, "next_cursor": next_cursor})
+
+FTS_COLUMNS = ("RCP_TTL", "CKG_NM", "CKG_IPDC", "CKG_MTRL_CN")
+TRIGRAM_MIN_LENGTH = 3      # trigram 색인은 3글자 이상 검색어만 MATCH 로 찾을 수 있음
 
-    return jsonify(result), 200
+
+# 🔧 사용자 입력을 FTS5 MATCH 구문으로 변환 (단어별 부분 문자열 검색, 모든 단어 AND)
+def build_fts_query(terms):
+    return " ".join('"' + t.replace('"', '""') + '"' for t in terms)
+
+
+# 🔧 3글자 미만 검색어용 LIKE 조건 (FTS 테이블의 네 칼럼 중 하나라도 포함하면 일치)
+def build_like_clause(term):
+    pattern = "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+    clause = " OR ".join(f"recipes_fts.{col} LIKE ? ESCAPE '\\'" for col in FTS_COLUMNS)
+    return f"({clause})", [pattern] * len(FTS_COLUMNS)
+
+# ✅ [2-1] 제목/요리명/소개/재료 전문 검색 (FTS5 + bm25 순위)
+@recipe_bp.route('/recipes/text-search', methods=['GET'])
+def text_search_recipes():
+    """
+    GET /recipes/text-search?q=김치찌개&page=1&size=20
+    1) request.args.get('q') 로 검색어 얻기
+    2) recipes_fts(trigram) 에서 MATCH 후 bm25 점수 순으로 정렬 (제목/요리명 가중치를 높게)
+       3글자 미만 단어는 색인을 쓸 수 없으므로 LIKE 로 거름
+    3) page/size 로 페이지 단위 반환, 다음 페이지 존재 여부는 has_more 로 표시
+       ranked_by 는 정렬 기준: "relevance" (score = bm25 관련도) / "views" (score = null)
+    ⚠️ 모든 단어가 3글자 미만이면 ("김치", "두부 국") 색인을 쓰지 못하고 레시피 전체를 LIKE 로
+       훑으므로 느림. 이때는 관련도 점수가 없어서 조회수 순으로 정렬하고 score 는 null.
+    """
+    q = (request.args.get('q') or '').strip()
+    if not q:
+        return jsonify({"error": "검색어를 입력해주세요."}), 400
+
+    try:
+        page = max(int(request.args.get('page', 1)), 1)
+        size = parse_limit('size')
+    except ValueError:
+        return jsonify({"error": "page 와 size 는 숫자여야 합니다."}), 400
+
+    conn = get_db_connection()
+    cursor = conn.cursor()
+
+    terms = q.split()
+    long_terms = [t for t in terms if len(t) >= TRIGRAM_MIN_LENGTH]
+    conditions, params = [], []
+    if long_terms:
+        conditions.append("recipes_fts MATCH ?")
+        params.append(build_fts_query(long_terms))
+    for term in terms:
+        if len(term) < TRIGRAM_MIN_LENGTH:
+            clause, clause_params = build_like_clause(term)
+            conditions.append(clause)
+            params.extend(clause_params)
+    # bm25 는 MATCH 가 있을 때만 쓸 수 있음 (짧은 단어뿐이면 관련도 대신 조회수 순)
+    if long_terms:
+        score, order = "bm25(recipes_fts, 10.0, 8.0, 1.0, 2.0)", "score"
+    else:
+        score, order = "NULL", "r.INQ_CNT DESC"
+
+    # ✅ 다음 페이지 존재 여부 확인을 위해 size + 1 개 조회
+    sql = f"""
+      SELECT r.RCP_SNO, r.RCP_TTL, r.CKG_NM, r.CKG_STA_ACTO_NM,
+             {score} AS score
+      FROM recipes_fts
+      JOIN recipes_dataset r ON r.RCP_SNO = recipes_fts.rowid
+      WHERE {' AND '.join(conditions)}
+      ORDER BY {order}, r.RCP_SNO
+      LIMIT ? OFFSET ?
+    """
+    try:
+        cursor.execute(sql, params + [size + 1, (page - 1) * size])
+        rows = cursor.fetchall()
+    except sqlite3.OperationalError as e:
+        # ❌ FTS 색인이 아직 없는 경우 (import_recipes.py 미실행)
+        if "no such table" in str(e):
+            return jsonify({"error": "검색 색인이 준비되지 않았습니다."}), 503
+        return jsonify({"error": "검색어를 처리할 수 없습니다.", "details": str(e)}), 400
+
+    result = [{
+        "RCP_SNO":         row["RCP_SNO"],
+        "RCP_TTL":         row["RCP_TTL"],
+        "CKG_NM":          row["CKG_NM"] or "",
+        "CKG_STA_ACTO_NM": row["CKG_STA_ACTO_NM"] or "",
+        # bm25 는 낮을수록 관련도가 높으므로 부호 반전 (LIKE 만 쓴 경우 관련도 점수 없음)
+        "score":           -row["score"] if long_terms else None
+    } for row in rows[:size]]
+
+    return jsonify({
+        "recipes": result,
+        "ranked_by": "relevance" if long_terms else "views",
+        "page": page,
+        "size": size,
+        "has_more": len(rows) > size
+    }), 200
 
 # ✅ [3] 저장된 레시피 목록 조회
-@recipe_bp.route('/recipes/saved', methods=['POST', 'OPTIONS'])
+# GET /recipes/saved?user_id=... 도 지원 (GET 만 ETag 를 붙이고, If-None-Match 를 보내면 변경이 없을 때 304)
+# 앱(src/screens/SavedRecipesScreen.js)은 아직 POST 로 호출하므로 304 효과를 보려면 GET 으로 바꿔야 함
+@recipe_bp.route('/recipes/saved', methods=['GET', 'POST', 'OPTIONS'])
 def get_saved_recipes():
     if request.method == 'OPTIONS':
         return '', 200
 
-    data = request.get_json()
-    user_id = data.get('user_id')
+    if request.method == 'GET':
+        user_id = request.args.get('user_id')
+    else:
+        user_id = (request.get_json(silent=True) or {}).get('user_id')
     if not user_id:
         return jsonify({'error': 'user_id가 전달되지 않았습니다.'}), 400
 
-    user_numeric_id = get_user_numeric_id(user_id)
+    user_numeric_id, version = get_user_version(user_id, 'saved')
     if not user_numeric_id:
         return jsonify({'error': '사용자를 찾을 수 없습니다.'}), 404
 
+    # GET 이고 클라이언트 목록이 최신이면 저장 레시피 테이블을 읽지 않고 304
+    # (레시피 정보도 함께 내려주므로 데이터셋 버전까지 포함, POST 는 조건부 조회 대상이 아님)
+    tag = None
+    if request.method == 'GET':
+        tag = user_etag('saved', user_numeric_id, f"{version}.{get_dataset_version(get_db_connection())}")
+        if is_not_modified(tag):
+            return not_modified(tag)
+
     conn = get_db_connection()
     cursor = conn.cursor()
     cursor.execute('''
@@ -149,18 +371,25 @@ def get_saved_recipes():
         ORDER BY sr.saved_at DESC
     ''', (user_numeric_id,))
 
-    recipes = [{
-        'recipe_id': row['recipe_id'],
-        'title': row['recipe_name'],
-        'url': row['recipe_url'],
-        'ingredients': row['CKG_MTRL_CN'],
-        'category': row['CKG_KND_ACTO_NM'],
-        'time': row['CKG_TIME_NM'],
-        'level': row['CKG_DODF_NM']
-    } for row in cursor.fetchall()]
-
-    conn.close()
-    return jsonify({'recipes': recipes}), 200
+    def saved_item(row):
+        return {
+            'recipe_id': row['recipe_id'],
+            'title': row['recipe_name'],
+            'url': row['recipe_url'],
+            'ingredients': row['CKG_MTRL_CN'],
+            'category': row['CKG_KND_ACTO_NM'],
+            'time': row['CKG_TIME_NM'],
+            'level': row['CKG_DODF_NM']
+        }
+
+    # 스트리밍 요청이면 커서에서 읽는 대로 전송
+    fmt = stream_format()
+    if fmt is not None:
+        response = stream_response(fmt, (saved_item(row) for row in cursor))
+    else:
+        response = jsonify({'recipes': [saved_item(row) for row in cursor.fetchall()]})
+
+    return (with_etag(response, tag) if tag else response), 200
 
 # ✅ [4] 레시피 저장
 @recipe_bp.route('/recipes/save', methods=['POST', 'OPTIONS'])
@@ -189,7 +418,6 @@ def save_recipe():
         (user_numeric_id, rcp_sno)
     )
     if cursor.fetchone():
-        conn.close()
         return jsonify({'error': '이미 저장된 레시피입니다.'}), 409
 
     saved_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")  # ✅ 현재 시간 저장
@@ -198,8 +426,8 @@ def save_recipe():
         "INSERT INTO saved_recipes (user_id, RCP_SNO, recipe_url, saved_at) VALUES (?, ?, ?, ?)",
         (user_numeric_id, rcp_sno, recipe_url, saved_at)
     )
+    bump_user_version(conn, user_numeric_id, 'saved')     # 목록 ETag 갱신
     conn.commit()
-    conn.close()
 
     return jsonify({'message': '레시피가 저장되었습니다.'}), 201
 
@@ -227,7 +455,15 @@ def delete_recipe():
         "DELETE FROM saved_recipes WHERE user_id = ? AND recipe_id = ?",
         (user_numeric_id, recipe_id)
     )
+    if cursor.rowcount:
+        bump_user_version(conn, user_numeric_id, 'saved')  # 목록 ETag 갱신
     conn.commit()
-    conn.close()
 
-    return jsonify({'message': '레시피가 삭제되었습니다.'}), 200
\ No newline at end of file
+    return jsonify({'message': '레시피가 삭제되었습니다.'}), 200
+
+# ✅ [6] 조회 응답 캐시 상태 (적중/미적중 수, 사용 중인 메모리)
+@recipe_bp.route('/recipes/cache-stats', methods=['GET'])
+def recipe_cache_stats():
+    stats = recipe_cache.stats()
+    stats["dataset_version"] = get_dataset_version(get_db_connection())
+    return jsonify(stats), 200
@@ -1,20 +1,14 @@
 # user_settings.py: 사용자 정보 조회, 수정 등
 # 🔧 Flask의 Blueprint(라우트 그룹), request(요청 데이터), jsonify(JSON 응답) 기능 불러오기
 from flask import Blueprint, request, jsonify
-# 🔐 비밀번호 해시 생성 및 검증을 위한 보안 유틸리티
-from werkzeug.security import check_password_hash, generate_password_hash
-# 🗄️ SQLite 데이터베이스 연동을 위한 모듈
-import sqlite3
+# 🗄️ 공용 SQLite 연결 (요청 단위 연결 풀)
+from database import get_db_connection
+# 🔐 비밀번호 해시 생성 및 검증 (요청 스레드 밖의 작업자 풀에서 실행)
+from passwords import check_password, hash_password
 
 # 🔧 Blueprint 정의
 user_settings_bp = Blueprint('user_settings', __name__)
 
-# 📦 DB 연결 함수
-def get_db_connection():
-    conn = sqlite3.connect('db/fridge.db')
-    conn.row_factory = sqlite3.Row
-    return conn
-
 # ✅ 닉네임 변경 API
 @user_settings_bp.route('/update-username', methods=['POST'])
 def update_username():
@@ -35,7 +29,6 @@ def update_username():
         (new_name, user_id)
     )
     conn.commit()                               # ✅ 변경사항 저장
-    conn.close()                                # 🔚 DB 연결 종료
 
     return jsonify({"message": "사용자 이름이 성공적으로 업데이트되었습니다."}), 200    # 🎉 성공 메시지 반환
 
@@ -57,12 +50,11 @@ def verify_password():
     # 🔍 사용자 정보 조회
     cursor.execute("SELECT password FROM users WHERE user_id = ?", (user_id,))
     user = cursor.fetchone()
-    conn.close()
 
     if not user:                                                # ❌ 사용자가 존재하지 않는 경우
         return jsonify({"error": "사용자 없음"}), 404
 
-    if not check_password_hash(user["password"], password):     # ❌ 해시된 비밀번호와 비교
+    if not check_password(user["password"], password):          # ❌ 해시된 비밀번호와 비교
         return jsonify({"error": "비밀번호 불일치"}), 401
 
     return jsonify({"message": "비밀번호 확인 성공"}), 200       # ✅ 일치 시 성공 메시지
@@ -78,7 +70,7 @@ def update_password():
         return jsonify({"error": "입력 정보 부족"}), 400
 
     # 🔐 새 비밀번호 해싱
-    hashed_pw = generate_password_hash(new_password)
+    hashed_pw = hash_password(new_password)
 
     # 📡 DB 연결
     conn = get_db_connection()
@@ -87,6 +79,5 @@ def update_password():
     # 🔄 비밀번호 변경 쿼리 실행
     cursor.execute("UPDATE users SET password = ? WHERE user_id = ?", (hashed_pw, user_id))
     conn.commit()       # ✅ DB에 변경 내용 저장
-    conn.close()        # 🔚 연결 종료
 
     return jsonify({"message": "비밀번호가 성공적으로 변경되었습니다."}), 200   # 🎉 성공 메시지 반환
\ No newline at end of file
@@ -0,0 +1,118 @@
+# backend/streaming.py : 큰 목록 응답을 행 단위로 흘려보내는 스트리밍 응답 (NDJSON / JSON 배열)
+
+# 기본 응답은 모든 행을 dict 목록으로 만든 뒤 jsonify 하므로 결과가 클수록 메모리를 많이 쓴다.
+# ?stream=ndjson 또는 ?stream=json (또는 Accept: application/x-ndjson) 로 요청하면
+# 커서에서 읽는 대로 직렬화해서 STREAM_CHUNK_BYTES 단위로 전송한다.
+# - ndjson: 레시피 한 줄에 하나, 마지막 줄은 페이지 정보 (예: {"next_cursor": "123"})
+# - json:   일반 응답과 같은 모양({"recipes": [...], "next_cursor": ...})을 나눠서 전송
+# orjson 이 설치되어 있으면 직렬화에 사용하고, Accept-Encoding 에 따라 brotli / gzip 으로 압축한다.
+
+import json
+import zlib
+
+from flask import Response, request, stream_with_context
+
+from config import STREAM_CHUNK_BYTES, STREAM_GZIP_LEVEL, STREAM_BROTLI_QUALITY
+
+try:
+    import orjson
+except ImportError:         # orjson 미설치 시 표준 json 사용
+    orjson = None
+
+try:
+    import brotli
+except ImportError:         # brotli 미설치 시 gzip 만 사용
+    brotli = None
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+
+def dumps(obj):
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+# ✅ 스트리밍 요청인지 확인 ('ndjson' / 'json' / None)
+def stream_format():
+    fmt = request.args.get("stream")
+    if fmt in ("ndjson", "json"):
+        return fmt
+    if request.accept_mimetypes.best == NDJSON_MIMETYPE:
+        return "ndjson"
+    return None
+
+
+# 🔧 항목 → 직렬화된 조각 (trailer 는 항목을 다 보낸 뒤 호출해서 페이지 정보를 받음)
+def _serialize(fmt, items, trailer):
+    if fmt == "ndjson":
+        for item in items:
+            yield dumps(item) + b"\n"
+        extra = trailer() if trailer else None
+        if extra:
+            yield dumps(extra) + b"\n"
+        return
+
+    yield b'{"recipes":['
+    first = True
+    for item in items:
+        yield dumps(item) if first else b"," + dumps(item)
+        first = False
+    yield b"]"
+    for key, value in (trailer() if trailer else {}).items():
+        yield b"," + dumps(key) + b":" + dumps(value)
+    yield b"}"
+
+
+# 🔧 작은 조각을 STREAM_CHUNK_BYTES 까지 모아서 전송
+def _buffered(parts):
+    buf = bytearray()
+    for part in parts:
+        buf += part
+        if len(buf) >= STREAM_CHUNK_BYTES:
+            yield bytes(buf)
+            buf.clear()
+    if buf:
+        yield bytes(buf)
+
+
+# 🔧 Accept-Encoding 협상 (brotli > gzip > 압축 없음)
+def _negotiate_encoding():
+    offered = ["br", "gzip"] if brotli is not None else ["gzip"]
+    return request.accept_encodings.best_match(offered)
+
+
+def _gzip(chunks):
+    compressor = zlib.compressobj(STREAM_GZIP_LEVEL, zlib.DEFLATED, 31)     # wbits 31 = gzip 헤더
+    for chunk in chunks:
+        # 조각마다 flush 해서 받은 만큼 바로 풀 수 있게 함
+        yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+
+def _brotli(chunks):
+    compressor = brotli.Compressor(quality=STREAM_BROTLI_QUALITY)
+    for chunk in chunks:
+        yield compressor.process(chunk) + compressor.flush()
+    yield compressor.finish()
+
+
+# ✅ 스트리밍 응답 생성 (items 는 커서에서 읽는 제너레이터, 요청 컨텍스트/DB 연결은 전송이 끝날 때까지 유지)
+def stream_response(fmt, items, trailer=None, status=200):
+    chunks = _buffered(_serialize(fmt, items, trailer))
+    encoding = _negotiate_encoding()
+    if encoding == "br":
+        chunks = _brotli(chunks)
+    elif encoding == "gzip":
+        chunks = _gzip(chunks)
+
+    response = Response(
+        stream_with_context(chunks),
+        status=status,
+        mimetype=NDJSON_MIMETYPE if fmt == "ndjson" else "application/json"
+    )
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    response.headers["Vary"] = "Accept-Encoding"
+    response.headers["X-Accel-Buffering"] = "no"        # 프록시(nginx)가 모아두지 않고 바로 전달
+    return response
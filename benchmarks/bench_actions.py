@@ -0,0 +1,80 @@
+# Rasa 액션 벤치마크 (가짜 Tracker + CollectingDispatcher, crawl_recipe 는 고정 응답으로 대체)
+#
+#   python -m benchmarks.bench_actions --data benchmarks/.data/10k --iterations 200
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+
+from .synth import ROOT
+from .timing import measure
+
+
+def _fake_crawl(recipe_code):
+    return "재료를 손질합니다. 팬에 볶습니다. 접시에 담아 완성합니다.", f"https://www.10000recipe.com/recipe/{recipe_code}"
+
+
+def run(data_dir, iterations, only=None, seed=1):
+    os.environ["FRIDGE_DB_PATH"] = os.path.abspath(os.path.join(data_dir, "fridge.db"))
+    os.environ["RECIPE_SNAPSHOT_DIR"] = os.path.abspath(os.path.join(data_dir, "recipe_snapshot"))
+    os.environ["RECIPE_CRAWL_CACHE_PATH"] = os.path.abspath(os.path.join(data_dir, "crawl_cache.db"))
+    os.environ.setdefault("ACTION_METRICS_PORT", "0")         # 지표 HTTP 엔드포인트는 띄우지 않음
+    sys.path.insert(0, os.path.join(ROOT, "chatbot_rasa"))
+
+    from rasa_sdk import Tracker
+    from rasa_sdk.executor import CollectingDispatcher
+    from actions import actions
+
+    actions.crawl_recipe = _fake_crawl          # 네트워크 제외, 액션 자체 비용만 측정
+
+    conn = sqlite3.connect(os.environ["FRIDGE_DB_PATH"])
+    users = [r[0] for r in conn.execute("SELECT user_id FROM users WHERE user_id LIKE 'bench%'")]
+    conn.close()
+    rng = random.Random(seed)
+    ingredients = ["양파", "감자", "돼지고기", "계란", "두부", "김치", "대파", "당근"]
+    messages = ["양파랑 감자로 뭐 만들지", "돼지고기 김치 있어", "계란하고 대파로 요리 추천해줘", "두부 애호박 된장"]
+
+    def tracker(slots, text="", sender="bench0"):
+        return Tracker(sender, slots, {"text": text}, [], False, None, {}, "")
+
+    def call(action, slots, text=""):
+        dispatcher = CollectingDispatcher()
+        action.run(dispatcher, tracker(slots, text), {})
+        # 레시피 카드가 하나도 없으면 (조건 불일치 안내 등) 실패로 집계
+        return any(m.get("custom") for m in dispatcher.messages)
+
+    menu = actions.ActionRecommendMenu()
+    fridge = actions.ActionRecommendFromFridge()
+    cases = {
+        "ActionRecommendMenu (ingredient)": lambda i: call(menu, {"ingredient": rng.choice(ingredients)}),
+        "ActionRecommendMenu (category)": lambda i: call(menu, {"category": rng.choice(["일상", "초스피드", "다이어트"])}),
+        "ActionRecommendMenu (difficulty+time)": lambda i: call(menu, {"difficulty": "초보", "time": "30분"}),
+        "ActionRecommendMenu (free text)": lambda i: call(menu, {}, rng.choice(messages)),
+        "ActionRecommendFromFridge": lambda i: call(fridge, {"user_id": rng.choice(users)}),
+        "ActionRecommendFromFridge (category)": lambda i: call(fridge, {"user_id": rng.choice(users), "category": "일상"}),
+    }
+
+    results = {}
+    for name, fn in cases.items():
+        if only and only not in name:
+            continue
+        results[name] = measure(fn, iterations)
+        print(f"  {name:<40} p50 {results[name]['p50_ms']:>9.3f} ms   p95 {results[name]['p95_ms']:>9.3f} ms",
+              file=sys.stderr)
+    actions.recommendation_log.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rasa 액션 벤치마크")
+    parser.add_argument("--data", required=True, help="합성 데이터 디렉터리 (benchmarks/.data/<scale>)")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--only", help="이름에 이 문자열이 들어간 항목만 실행")
+    args = parser.parse_args()
+    print(json.dumps(run(args.data, args.iterations, args.only), ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+# Flask 라우트 벤치마크 (test client 로 각 엔드포인트 호출 시간 측정)
+#
+# 설정(config.py)은 import 시점에 환경변수를 읽으므로 run.py 가 별도 프로세스로 실행한다:
+#   python -m benchmarks.bench_routes --db benchmarks/.data/10k/fridge.db --iterations 200
+import argparse
+import json
+import os
+import random
+import sqlite3
+import sys
+
+from .synth import BACKEND_DIR, BENCH_PASSWORD
+from .timing import measure
+
+
+def build_cases(client, db_path, rng):
+    conn = sqlite3.connect(db_path)
+    users = [r[0] for r in conn.execute("SELECT user_id FROM users WHERE user_id LIKE 'bench%'")]
+    categories = [r[0] for r in conn.execute(
+        "SELECT CKG_STA_ACTO_NM FROM recipes_dataset GROUP BY 1 ORDER BY COUNT(*) DESC LIMIT 5"
+    )]
+    names = [r[0] for r in conn.execute(
+        "SELECT name FROM recipe_ingredients GROUP BY name ORDER BY COUNT(*) DESC LIMIT 40"
+    )]
+    recipes = [r[0] for r in conn.execute("SELECT RCP_SNO FROM recipes_dataset ORDER BY RANDOM() LIMIT 500")]
+    dishes = [r[0] for r in conn.execute("SELECT DISTINCT CKG_NM FROM recipes_dataset LIMIT 20")]
+    conn.close()
+
+    def ok(response, *codes):
+        return response.status_code in (codes or (200,))
+
+    def search_all(i):
+        return ok(client.get("/recipes/search", query_string={"ingredients": rng.sample(names, 2)}), 200, 404)
+
+    def search_any(i):
+        return ok(client.get("/recipes/search", query_string={"ingredients": rng.sample(names, 3), "mode": "any"}), 200, 404)
+
+    def search_hot(i):
+        # 같은 조건 반복 (응답 캐시 적중)
+        return ok(client.get("/recipes/search", query_string={"ingredients": names[:2]}), 200, 404)
+
+    def category(i):
+        return ok(client.get("/recipes/category", query_string={"category": rng.choice(categories)}))
+
+    def category_stream(i):
+        response = client.get("/recipes/category", query_string={"category": categories[0], "stream": "ndjson", "limit": 1000})
+        body = response.get_data()      # 스트림을 끝까지 소비
+        return ok(response) and bool(body)
+
+    def text_search(i):
+        return ok(client.get("/recipes/text-search", query_string={"q": rng.choice(dishes)}), 200, 503)
+
+    def saved(i):
+        return ok(client.post("/recipes/saved", json={"user_id": rng.choice(users)}))
+
+    etags = {}
+
+    def saved_304(i):
+        user = users[i % len(users)]
+        headers = {"If-None-Match": etags[user]} if user in etags else {}
+        response = client.get("/recipes/saved", query_string={"user_id": user}, headers=headers)
+        etags[user] = response.headers.get("ETag", "")
+        return ok(response, 200, 304)
+
+    def fridge_list(i):
+        return ok(client.get(f"/fridge/list/{rng.choice(users)}"))
+
+    def fridge_add_delete(i):
+        user, item = rng.choice(users), f"벤치재료{i}"
+        added = client.post("/fridge/add", json={"user_id": user, "item_name": item})
+        deleted = client.post("/fridge/delete", json={"user_id": user, "item_name": item})
+        return ok(added, 201) and ok(deleted)
+
+    def fridge_sync(i):
+        user = rng.choice(users)
+        items = [f"장보기{i}-{k}" for k in range(20)]
+        added = client.post("/fridge/sync", json={"user_id": user, "add": items})
+        removed = client.post("/fridge/sync", json={"user_id": user, "remove": items})
+        return ok(added) and ok(removed)
+
+    def save_delete_recipe(i):
+        user = rng.choice(users)
+        code = recipes[i % len(recipes)]
+        client.post("/recipes/save", json={
+            "userId": user, "recipe_title": "벤치", "recipe_url": f"https://www.10000recipe.com/recipe/{code}", "rcp_sno": code
+        })
+        listing = client.post("/recipes/saved", json={"user_id": user}).get_json() or {}
+        for recipe in listing.get("recipes", [])[:1]:
+            client.post("/recipes/delete", json={"user_id": user, "recipe_id": recipe["recipe_id"]})
+        return True
+
+    def login(i):
+        return ok(client.post("/login", json={"user_id": rng.choice(users), "password": BENCH_PASSWORD}))
+
+    def check_id(i):
+        return ok(client.get(f"/check-id/nobody{i}"))
+
+    return {
+        "GET /recipes/search (all)": search_all,
+        "GET /recipes/search (any)": search_any,
+        "GET /recipes/search (cached)": search_hot,
+        "GET /recipes/category": category,
+        "GET /recipes/category (ndjson 1000)": category_stream,
+        "GET /recipes/text-search": text_search,
+        "POST /recipes/saved": saved,
+        "GET /recipes/saved (If-None-Match)": saved_304,
+        "GET /fridge/list": fridge_list,
+        "POST /fridge/add + delete": fridge_add_delete,
+        "POST /fridge/sync (20 items x2)": fridge_sync,
+        "POST /recipes/save + saved + delete": save_delete_recipe,
+        "POST /login": login,
+        "GET /check-id": check_id,
+    }
+
+
+def run(db_path, iterations, only=None, seed=1):
+    os.environ["FRIDGE_DB_PATH"] = os.path.abspath(db_path)
+    os.environ.setdefault("MAIL_SENDER_ENABLED", "0")
+    sys.path.insert(0, BACKEND_DIR)
+    from app import app
+
+    rng = random.Random(seed)
+    client = app.test_client()
+    results = {}
+    for name, fn in build_cases(client, db_path, rng).items():
+        if only and only not in name:
+            continue
+        # 로그인은 해시 비용 때문에 느리므로 반복 횟수를 줄임
+        n = max(10, iterations // 10) if "login" in name else iterations
+        results[name] = measure(fn, n)
+        print(f"  {name:<40} p50 {results[name]['p50_ms']:>9.3f} ms   p95 {results[name]['p95_ms']:>9.3f} ms",
+              file=sys.stderr)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Flask 라우트 벤치마크")
+    parser.add_argument("--db", required=True, help="합성 fridge.db 경로")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--only", help="이름에 이 문자열이 들어간 항목만 실행")
+    args = parser.parse_args()
+    print(json.dumps(run(args.db, args.iterations, args.only), ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,385 @@
+# 종단 간 부하 테스트: 가상 사용자 여러 명이 동시에 실제 HTTP 로 Flask 백엔드 + 액션 서버를 호출
+#
+# 가상 사용자 한 명은 세션을 반복한다:
+#   회원가입(또는 로그인) → 냉장고 재료 추가/조회/일괄 반영/삭제 → 재료·카테고리·텍스트 검색
+#   → 레시피 저장 + 저장 목록 → 챗봇 액션(냉장고 추천, 자유 입력 추천)을 액션 서버 웹훅으로 호출
+#
+#   # 이미 떠 있는 서버 대상
+#   python -m benchmarks.loadtest --api http://127.0.0.1:5000 --actions http://127.0.0.1:5055/webhook --users 20
+#
+#   # 합성 데이터 + 레시피 대역 서버 + 백엔드 + 액션 서버를 직접 띄워서 실행
+#   python -m benchmarks.loadtest --spawn --scale 10k --users 20 --duration 60 --site-latency-ms 150 --site-error-rate 0.05
+#   python -m benchmarks.loadtest --spawn --backend-cmd "gunicorn -w 4 -b 127.0.0.1:{port} app:app"
+#
+# 작업 종류별 처리량, 지연 백분위수, 오류율을 출력한다 (--json 으로 파일 저장).
+import argparse
+import json
+import os
+import random
+import shlex
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+from .recipe_site import RecipeSite
+from .synth import BACKEND_DIR, INGREDIENTS, ROOT, SCALES, STA, DISHES, prepare
+from .timing import summarize
+
+RASA_VERSION = "3.6.0"          # 웹훅 요청에 실어 보내는 Rasa 버전 (액션 서버의 호환성 경고용)
+FREE_TEXT = ["{a}랑 {b}로 뭐 만들지", "{a} {b} 있어", "{a}하고 {b}로 요리 추천해줘", "냉장고에 {a}, {b} 남았어"]
+DOMAIN = {"slots": {}, "intents": [], "entities": [], "responses": {}, "actions": [], "forms": {}}
+
+
+class Recorder:
+    """작업별 지연 시간(ms)과 오류 수 집계 (가상 사용자 스레드들이 함께 사용)"""
+
+    def __init__(self):
+        self.samples = {}
+        self.errors = {}
+        self.error_examples = {}
+        self.lock = threading.Lock()
+
+    def add(self, op, elapsed_ms, error=None):
+        with self.lock:
+            self.samples.setdefault(op, []).append(elapsed_ms)
+            if error:
+                self.errors[op] = self.errors.get(op, 0) + 1
+                self.error_examples.setdefault(op, error)
+
+    def report(self, duration):
+        with self.lock:
+            ops = {op: list(values) for op, values in self.samples.items()}
+            errors = dict(self.errors)
+            examples = dict(self.error_examples)
+        result = {}
+        for op, values in sorted(ops.items()):
+            stats = summarize(values)
+            stats.pop("ops_per_s")                      # 단일 스레드 기준 값이라 부하 테스트에서는 의미 없음
+            stats["throughput_per_s"] = round(len(values) / duration, 2)
+            stats["errors"] = errors.get(op, 0)
+            stats["error_rate"] = round(stats["errors"] / len(values), 4)
+            if op in examples:
+                stats["error_example"] = examples[op]
+            result[op] = stats
+        total = sum(len(v) for v in ops.values())
+        total_errors = sum(errors.values())
+        result["TOTAL"] = {
+            "n": total,
+            "throughput_per_s": round(total / duration, 2),
+            "errors": total_errors,
+            "error_rate": round(total_errors / total, 4) if total else 0.0,
+        }
+        return result
+
+
+class VirtualUser(threading.Thread):
+    """세션을 반복하는 가상 사용자 (스레드 하나, keep-alive 세션 하나)"""
+
+    def __init__(self, index, args, recorder, stop_at, run_id):
+        super().__init__(name=f"vu-{index}", daemon=True)
+        self.index = index
+        self.args = args
+        self.recorder = recorder
+        self.stop_at = stop_at
+        self.run_id = run_id
+        self.rng = random.Random(args.seed * 1000 + index)
+        self.http = requests.Session()
+        self.accounts = []              # 이 가상 사용자가 만든 계정 (재로그인용)
+        self.etags = {}
+        self.sessions = 0
+
+    # 🔧 요청 하나 실행 + 기록 (expected 에 없는 상태 코드나 연결 오류는 오류로 집계)
+    def call(self, op, method, url, expected=(200,), **kwargs):
+        started = time.perf_counter()
+        error, response = None, None
+        try:
+            response = self.http.request(method, url, timeout=self.args.timeout, **kwargs)
+            if response.status_code not in expected:
+                error = f"HTTP {response.status_code}"
+        except requests.RequestException as e:
+            error = type(e).__name__
+        self.recorder.add(op, (time.perf_counter() - started) * 1000, error)
+        if self.args.think_ms:
+            time.sleep(self.rng.expovariate(1000 / self.args.think_ms))
+        return response if error is None else None
+
+    def api(self, path):
+        return self.args.api.rstrip("/") + path
+
+    def run(self):
+        while time.time() < self.stop_at:
+            self.session()
+            self.sessions += 1
+
+    def session(self):
+        user_id = self.sign_in()
+        if not user_id:
+            return
+        self.fridge(user_id)
+        rcp_sno = self.search()
+        if rcp_sno:
+            self.save(user_id, rcp_sno)
+        if self.args.actions:
+            self.chatbot(user_id)
+
+    def sign_in(self):
+        rng = self.rng
+        if self.accounts and rng.random() >= self.args.signup_ratio:
+            user_id = rng.choice(self.accounts)
+            ok = self.call("POST /login", "POST", self.api("/login"),
+                           json={"user_id": user_id, "password": self.args.password})
+            return user_id if ok is not None else None
+        user_id = f"lt{self.run_id}u{self.index}n{len(self.accounts)}"
+        ok = self.call("POST /signup", "POST", self.api("/signup"), expected=(201,), json={
+            "user_id": user_id, "username": f"부하{self.index}", "email": f"{user_id}@loadtest.invalid",
+            "password": self.args.password,
+        })
+        if ok is None:
+            return None
+        self.accounts.append(user_id)
+        ok = self.call("POST /login", "POST", self.api("/login"),
+                       json={"user_id": user_id, "password": self.args.password})
+        return user_id if ok is not None else None
+
+    def fridge(self, user_id):
+        rng = self.rng
+        for name in rng.sample(INGREDIENTS, 3):
+            self.call("POST /fridge/add", "POST", self.api("/fridge/add"), expected=(201, 409),
+                      json={"user_id": user_id, "item_name": name})
+        headers = {"If-None-Match": self.etags[user_id]} if user_id in self.etags else {}
+        response = self.call("GET /fridge/list", "GET", self.api(f"/fridge/list/{user_id}"), expected=(200, 304),
+                             headers=headers)
+        if response is not None and response.headers.get("ETag"):
+            self.etags[user_id] = response.headers["ETag"]
+        self.call("POST /fridge/sync", "POST", self.api("/fridge/sync"), json={
+            "user_id": user_id, "add": rng.sample(INGREDIENTS, 5), "remove": rng.sample(INGREDIENTS, 2),
+        })
+        self.call("POST /fridge/delete", "POST", self.api("/fridge/delete"),
+                  json={"user_id": user_id, "item_name": rng.choice(INGREDIENTS)})
+
+    # 검색 결과 중 저장할 레시피 하나 반환
+    def search(self):
+        rng = self.rng
+        found = []
+        response = self.call("GET /recipes/search", "GET", self.api("/recipes/search"), expected=(200, 404),
+                             params={"ingredients": rng.sample(INGREDIENTS[:30], 2)})
+        if response is not None and response.status_code == 200:
+            found = response.json().get("recipes", [])
+        self.call("GET /recipes/search (any)", "GET", self.api("/recipes/search"), expected=(200, 404),
+                  params={"ingredients": rng.sample(INGREDIENTS, 3), "mode": "any"})
+        self.call("GET /recipes/category", "GET", self.api("/recipes/category"), expected=(200, 404),
+                  params={"category": rng.choice(STA)})
+        self.call("GET /recipes/text-search", "GET", self.api("/recipes/text-search"), expected=(200, 404, 503),
+                  params={"q": rng.choice(DISHES)})
+        return rng.choice(found).get("RCP_SNO") if found else None
+
+    def save(self, user_id, rcp_sno):
+        self.call("POST /recipes/save", "POST", self.api("/recipes/save"), expected=(200, 201, 409), json={
+            "userId": user_id, "recipe_title": "부하 테스트",
+            "recipe_url": f"https://www.10000recipe.com/recipe/{rcp_sno}", "rcp_sno": rcp_sno,
+        })
+        self.call("POST /recipes/saved", "POST", self.api("/recipes/saved"), json={"user_id": user_id})
+
+    def chatbot(self, user_id):
+        a, b = self.rng.sample(INGREDIENTS[:30], 2)
+        self.webhook("action_recommend_from_fridge", user_id, {"user_id": user_id}, "냉장고 재료로 추천해줘")
+        self.webhook("action_recommend_menu", user_id, {}, self.rng.choice(FREE_TEXT).format(a=a, b=b))
+
+    def webhook(self, action, sender_id, slots, text):
+        response = self.call(f"webhook {action}", "POST", self.args.actions, json={
+            "next_action": action,
+            "sender_id": sender_id,
+            "version": RASA_VERSION,
+            "domain": DOMAIN,
+            "tracker": {
+                "sender_id": sender_id,
+                "slots": slots,
+                "latest_message": {"text": text, "intent": {}, "entities": []},
+                "events": [],
+                "paused": False,
+                "followup_action": None,
+                "active_loop": {},
+                "latest_action_name": None,
+            },
+        })
+        return response
+
+
+# 🔧 서버가 응답할 때까지 대기
+def wait_for(url, process, timeout=120):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"서버 프로세스가 종료되었습니다 (코드 {process.returncode}): {url}")
+        try:
+            requests.get(url, timeout=1)
+            return
+        except requests.RequestException:
+            time.sleep(0.25)
+    raise RuntimeError(f"서버 응답 대기 시간 초과: {url}")
+
+
+# 🔧 합성 DB 를 작업 디렉터리로 복사 (backup API 라서 WAL 에만 있는 내용까지 일관되게 복사됨)
+def copy_db(src, dst):
+    source = sqlite3.connect(src)
+    target = sqlite3.connect(dst)
+    try:
+        source.backup(target)
+    finally:
+        target.close()
+        source.close()
+    return dst
+
+
+# ✅ 합성 데이터 + 레시피 대역 서버 + 백엔드 + 액션 서버 실행 (종료 시 정리할 (site, processes) 반환)
+def spawn(args):
+    paths = prepare(args.scale)
+    site = RecipeSite(port=args.site_port, latency=args.site_latency_ms / 1000, jitter=args.site_jitter_ms / 1000,
+                      error_rate=args.site_error_rate, seed=args.seed).start()
+    work_dir = tempfile.mkdtemp(prefix="loadtest-")
+    crawl_cache = os.path.join(work_dir, "crawl_cache.db")         # 매번 빈 캐시로 시작
+    db_path = copy_db(paths["db"], os.path.join(work_dir, "fridge.db"))   # 가입/냉장고/저장 기록이 합성 DB 에 남지 않도록
+    env = dict(
+        os.environ,
+        FRIDGE_DB_PATH=db_path,
+        MAIL_SENDER_ENABLED="0",
+        RECIPE_SNAPSHOT_DIR=paths["snapshot"],
+        RECIPE_CRAWL_CACHE_PATH=crawl_cache,
+        RECIPE_CRAWL_BASE_URL=site.base_url,
+        ACTION_METRICS_PORT="0",
+    )
+    log = None if args.verbose else subprocess.DEVNULL
+    processes = []
+
+    backend_cmd = args.backend_cmd or (
+        f"{shlex.quote(sys.executable)} -c "
+        f"\"from app import app; app.run(host='127.0.0.1', port={{port}}, threaded=True)\""
+    )
+    backend = subprocess.Popen(shlex.split(backend_cmd.format(port=args.api_port)), cwd=BACKEND_DIR, env=env,
+                               stdout=log, stderr=log)
+    processes.append(backend)
+    args.api = f"http://127.0.0.1:{args.api_port}"
+
+    if not args.no_actions:
+        actions = subprocess.Popen(
+            [sys.executable, "-m", "rasa_sdk", "--actions", "actions", "--port", str(args.actions_port)],
+            cwd=os.path.join(ROOT, "chatbot_rasa"), env=env, stdout=log, stderr=log,
+        )
+        processes.append(actions)
+        args.actions = f"http://127.0.0.1:{args.actions_port}/webhook"
+
+    try:
+        wait_for(f"{args.api}/check-id/__loadtest__", backend)
+        if not args.no_actions:
+            wait_for(f"http://127.0.0.1:{args.actions_port}/health", processes[-1])
+    except Exception:
+        shutdown(site, processes)
+        raise
+    print(f"🧪 백엔드 {args.api} · 액션 서버 {args.actions or '-'} · 레시피 대역 서버 {site.base_url}", file=sys.stderr)
+    return site, processes
+
+
+def shutdown(site, processes):
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+    if site:
+        site.stop()
+
+
+def run(args):
+    recorder = Recorder()
+    run_id = f"{int(time.time()) % 100000}{random.Random().randint(0, 999)}"
+    started = time.time()
+    stop_at = started + args.duration
+    users = []
+    for i in range(args.users):
+        user = VirtualUser(i, args, recorder, stop_at, run_id)
+        users.append(user)
+        user.start()
+        if args.ramp_up:
+            time.sleep(args.ramp_up / args.users)
+    for user in users:
+        user.join()
+    duration = time.time() - started
+    return {
+        "users": args.users,
+        "duration_s": round(duration, 2),
+        "sessions": sum(u.sessions for u in users),
+        "api": args.api,
+        "actions": args.actions,
+        "operations": recorder.report(duration),
+    }
+
+
+def print_report(report, site_stats=None):
+    print(f"\n가상 사용자 {report['users']}명 · {report['duration_s']}초 · 세션 {report['sessions']}회")
+    print(f"{'작업':<40} {'요청':>7} {'req/s':>8} {'p50':>9} {'p95':>9} {'p99':>9} {'오류율':>8}")
+    for op, stats in report["operations"].items():
+        if op == "TOTAL":
+            continue
+        print(f"{op:<40} {stats['n']:>7} {stats['throughput_per_s']:>8.1f} {stats['p50_ms']:>7.1f}ms "
+              f"{stats['p95_ms']:>7.1f}ms {stats['p99_ms']:>7.1f}ms {stats['error_rate']:>8.2%}")
+    total = report["operations"]["TOTAL"]
+    print(f"{'TOTAL':<40} {total['n']:>7} {total['throughput_per_s']:>8.1f} {'':>29} {total['error_rate']:>8.2%}")
+    for op, stats in report["operations"].items():
+        if stats.get("error_example"):
+            print(f"  ⚠️ {op}: {stats['errors']}건 (예: {stats['error_example']})")
+    if site_stats:
+        print(f"레시피 대역 서버: 요청 {site_stats['requests']}건, 오류 주입 {site_stats['errors']}건")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ByteBite 종단 간 부하 테스트")
+    parser.add_argument("--api", default="http://127.0.0.1:5000", help="Flask 백엔드 주소")
+    parser.add_argument("--actions", default="http://127.0.0.1:5055/webhook", help="액션 서버 웹훅 주소")
+    parser.add_argument("--no-actions", action="store_true", help="챗봇 액션 호출 생략")
+    parser.add_argument("--users", type=int, default=10, help="동시 가상 사용자 수")
+    parser.add_argument("--duration", type=float, default=30.0, help="실행 시간 (초)")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="가상 사용자를 나눠서 시작하는 시간 (초)")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="요청 사이 평균 대기 시간 (ms, 지수 분포)")
+    parser.add_argument("--signup-ratio", type=float, default=0.2, help="세션을 새 계정 가입으로 시작하는 비율")
+    parser.add_argument("--password", default="loadtest-pass-1234")
+    parser.add_argument("--timeout", type=float, default=30.0, help="요청 타임아웃 (초)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="결과 JSON 저장 경로")
+
+    spawn_group = parser.add_argument_group("--spawn: 서버를 직접 띄워서 실행")
+    spawn_group.add_argument("--spawn", action="store_true", help="합성 데이터로 백엔드/액션 서버/레시피 대역 서버 실행")
+    spawn_group.add_argument("--scale", choices=SCALES, default="10k")
+    spawn_group.add_argument("--api-port", type=int, default=5100)
+    spawn_group.add_argument("--actions-port", type=int, default=5155)
+    spawn_group.add_argument("--backend-cmd", help="백엔드 실행 명령 ({port} 치환, backend/ 에서 실행)")
+    spawn_group.add_argument("--site-port", type=int, default=8099)
+    spawn_group.add_argument("--site-latency-ms", type=float, default=100.0)
+    spawn_group.add_argument("--site-jitter-ms", type=float, default=30.0)
+    spawn_group.add_argument("--site-error-rate", type=float, default=0.0)
+    spawn_group.add_argument("--verbose", action="store_true", help="서버 로그 출력")
+    args = parser.parse_args()
+    if args.no_actions:
+        args.actions = None
+
+    site, processes = spawn(args) if args.spawn else (None, [])
+    try:
+        report = run(args)
+    finally:
+        shutdown(site, processes)
+    if site:
+        report["recipe_site"] = dict(site.stats)
+    print_report(report, report.get("recipe_site"))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+# 부하 테스트용 10000recipe.com 대역 서버 (고정 레시피 페이지 + 지연/오류 주입)
+#
+#   python -m benchmarks.recipe_site --port 8099 --latency-ms 150 --jitter-ms 50 --error-rate 0.05
+#   RECIPE_CRAWL_BASE_URL=http://127.0.0.1:8099/recipe rasa run actions
+#
+# GET /recipe/<RCP_SNO> 에 crawler.py 가 읽는 span.view_step_text 구조의 페이지를 돌려준다.
+# 조리 단계는 RCP_SNO 로 정해지므로 같은 레시피는 항상 같은 내용이다.
+import argparse
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "recipe_page.html")
+STEP_TEMPLATES = [
+    "{a}는 깨끗이 씻어 먹기 좋은 크기로 썰어 주세요.",
+    "팬에 기름을 두르고 {a}를 중불에서 2분간 볶아 주세요.",
+    "{b}를 넣고 간장 1큰술, 설탕 1/2큰술로 간을 맞춰 주세요.",
+    "물 200ml 를 붓고 뚜껑을 덮어 5분간 끓여 주세요.",
+    "불을 끄고 참기름과 깨를 뿌려 마무리합니다.",
+    "그릇에 {a}와 {b}를 보기 좋게 담아 완성합니다.",
+]
+INGREDIENTS = ["양파", "감자", "당근", "대파", "두부", "애호박", "돼지고기", "계란", "김치", "버섯"]
+RECIPE_PATH_RE = re.compile(r"^/recipe/(\d+)/?$")
+
+
+def render_page(template, recipe_code):
+    rng = random.Random(recipe_code)
+    a, b = rng.sample(INGREDIENTS, 2)
+    steps = [t.format(a=a, b=b) for t in rng.sample(STEP_TEMPLATES, rng.randint(3, len(STEP_TEMPLATES)))]
+    step_html = "\n".join(
+        f'    <div class="view_step_cont media step{i}"><div class="media-body">'
+        f'<span class="view_step_text">{text}</span></div></div>'
+        for i, text in enumerate(steps, 1)
+    )
+    return template.format(title=f"{a} {b} 볶음 #{recipe_code}", steps=step_html)
+
+
+class RecipeSiteHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"       # keep-alive (crawler.py 의 requests.Session 이 연결을 재사용)
+
+    def do_GET(self):
+        site = self.server.site
+        site.count("requests")
+        if site.latency > 0 or site.jitter > 0:
+            time.sleep(max(0.0, site.rng_gauss(site.latency, site.jitter)))
+        match = RECIPE_PATH_RE.match(self.path.split("?", 1)[0])
+        if not match:
+            self._send(404, b"not found", "text/plain")
+            return
+        if site.rng_random() < site.error_rate:
+            site.count("errors")
+            self._send(503, b"service unavailable", "text/plain")
+            return
+        body = render_page(site.template, int(match.group(1))).encode("utf-8")
+        self._send(200, body, "text/html; charset=utf-8")
+
+    def _send(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class RecipeSite:
+    """지연(초)과 오류 비율을 설정할 수 있는 대역 서버 (별도 스레드에서 실행)"""
+
+    def __init__(self, host="127.0.0.1", port=8099, latency=0.0, jitter=0.0, error_rate=0.0, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        with open(FIXTURE_PATH, encoding="utf-8") as f:
+            self.template = f.read()
+        self.stats = {"requests": 0, "errors": 0}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), RecipeSiteHandler)
+        self.server.daemon_threads = True
+        self.server.site = self
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/recipe"
+
+    def count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def rng_random(self):
+        with self._lock:
+            return self._rng.random()
+
+    def rng_gauss(self, mu, sigma):
+        with self._lock:
+            return self._rng.gauss(mu, sigma) if sigma else mu
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name="recipe-site", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="10000recipe.com 대역 서버 (부하 테스트용)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency-ms", type=float, default=100.0, help="평균 응답 지연 (ms)")
+    parser.add_argument("--jitter-ms", type=float, default=30.0, help="응답 지연 표준편차 (ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="503 으로 응답할 비율 (0~1)")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+    site = RecipeSite(args.host, args.port, args.latency_ms / 1000, args.jitter_ms / 1000, args.error_rate, args.seed)
+    print(f"🍳 레시피 대역 서버: RECIPE_CRAWL_BASE_URL={site.base_url}")
+    try:
+        site.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"요청 {site.stats['requests']}건, 오류 주입 {site.stats['errors']}건")
+
+
+if __name__ == "__main__":
+    main()
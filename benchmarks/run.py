@@ -0,0 +1,104 @@
+# 벤치마크 실행기: 합성 데이터 준비 → 라우트/액션 벤치마크 → 커밋별 결과 저장 / 비교
+#
+#   python -m benchmarks.run --scale 10k                 # 실행 후 benchmarks/.data/results/10k/<커밋>.json 저장
+#   python -m benchmarks.run compare <기준.json> <대상.json>  # 10% 이상 달라진 항목 표시
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+from .synth import ROOT, SCALES, prepare
+
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", ".data", "results")     # 합성 데이터와 같이 .gitignore 대상
+REGRESSION_THRESHOLD = 0.10     # p50 기준 10% 이상 느려지면 회귀로 표시
+
+
+def _git(*args):
+    try:
+        return subprocess.check_output(["git", *args], cwd=ROOT, text=True, stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+# 🔧 각 벤치마크는 별도 프로세스에서 실행 (환경변수 기반 설정 · 모듈 싱글턴이 서로 섞이지 않도록)
+def _run_module(module, args):
+    output = subprocess.check_output([sys.executable, "-m", f"benchmarks.{module}", *args], cwd=ROOT, text=True)
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run_all(scale, iterations, only=None, force=False):
+    paths = prepare(scale, force=force)
+    extra = ["--only", only] if only else []
+    results = {}
+    print(f"🚀 Flask 라우트 ({scale})", file=sys.stderr)
+    results["routes"] = _run_module("bench_routes", ["--db", paths["db"], "--iterations", str(iterations), *extra])
+    print(f"🚀 Rasa 액션 ({scale})", file=sys.stderr)
+    results["actions"] = _run_module("bench_actions", ["--data", paths["dir"], "--iterations", str(iterations), *extra])
+    return {
+        "commit": _git("rev-parse", "--short", "HEAD") or "unknown",
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "scale": scale,
+        "iterations": iterations,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def save(report, out=None):
+    path = out or os.path.join(RESULTS_DIR, report["scale"], f"{report['commit']}.json")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return path
+
+
+# ✅ 두 결과 파일 비교 (p50 변화율, 임계값 이상이면 표시) → 회귀 건수 반환
+def compare(base_path, head_path, threshold=REGRESSION_THRESHOLD):
+    with open(base_path, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(head_path, encoding="utf-8") as f:
+        head = json.load(f)
+    print(f"{base['commit']} → {head['commit']} ({head['scale']})")
+    regressions = 0
+    for group, cases in head["results"].items():
+        for name, stats in cases.items():
+            before = base["results"].get(group, {}).get(name)
+            if not before or not before["p50_ms"]:
+                print(f"  {'new':>8}  {group}: {name}")
+                continue
+            change = (stats["p50_ms"] - before["p50_ms"]) / before["p50_ms"]
+            mark = ""
+            if change >= threshold:
+                mark, regressions = "  ⚠️ 느려짐", regressions + 1
+            elif change <= -threshold:
+                mark = "  ✅ 빨라짐"
+            print(f"  {change:>+8.1%}  {group}: {name}  ({before['p50_ms']:.3f} → {stats['p50_ms']:.3f} ms){mark}")
+    return regressions
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "compare":
+        parser = argparse.ArgumentParser(prog="benchmarks.run compare", description="두 벤치마크 결과 비교")
+        parser.add_argument("base")
+        parser.add_argument("head")
+        parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+        args = parser.parse_args(sys.argv[2:])
+        sys.exit(1 if compare(args.base, args.head, args.threshold) else 0)
+
+    parser = argparse.ArgumentParser(description="ByteBite 벤치마크 실행")
+    parser.add_argument("--scale", choices=SCALES, default="10k")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--only", help="이름에 이 문자열이 들어간 항목만 실행")
+    parser.add_argument("--force", action="store_true", help="합성 데이터를 다시 생성")
+    parser.add_argument("--out", help="결과 파일 경로 (기본값: benchmarks/.data/results/<scale>/<커밋>.json)")
+    args = parser.parse_args()
+    print(f"💾 {save(run_all(args.scale, args.iterations, args.only, args.force), args.out)}")
+
+
+if __name__ == "__main__":
+    main()
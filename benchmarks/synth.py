@@ -0,0 +1,188 @@
+# 벤치마크용 합성 데이터 생성
+# - 만개의 레시피 CSV 와 같은 칼럼/인코딩의 레시피 CSV (CKG_MTRL_CN 은 "[구역] 이름\a수량\a단위| …" 형식)
+# - 실제 적재 스크립트(backend/db/import_recipes.py)로 fridge.db 생성 + 사용자/냉장고/저장 레시피 추가
+# - 액션 서버용 레시피 스냅샷 (chatbot_rasa/actions/recipe_store.py)
+#
+# 사용법 (저장소 루트에서):
+#   python -m benchmarks.synth --scale 10k [--out benchmarks/.data/10k]
+import argparse
+import csv
+import importlib.util
+import os
+import random
+import sqlite3
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKEND_DIR = os.path.join(ROOT, "backend")
+DATA_DIR = os.path.join(ROOT, "benchmarks", ".data")
+
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+BENCH_PASSWORD = "bench-pass-1234"      # 합성 사용자 공통 비밀번호 (로그인 벤치마크용)
+
+# 재료명 (앞쪽일수록 자주 등장, 등장 빈도는 1/순위 에 비례)
+INGREDIENTS = [
+    "양파", "대파", "마늘", "다진 마늘", "간장", "소금", "설탕", "참기름", "후추", "고춧가루",
+    "계란", "물", "식용유", "진간장", "고추장", "된장", "감자", "당근", "돼지고기", "두부",
+    "애호박", "청양고추", "깨", "올리고당", "쪽파", "소고기", "닭가슴살", "버터", "우유", "밀가루",
+    "김치", "양배추", "오이", "버섯", "표고버섯", "팽이버섯", "새우", "오징어", "멸치", "다시마",
+    "맛술", "생강", "꿀", "식초", "레몬즙", "치즈", "베이컨", "햄", "스팸", "참치",
+    "고구마", "단호박", "브로콜리", "파프리카", "피망", "토마토", "방울토마토", "양상추", "시금치", "콩나물",
+    "숙주", "부추", "깻잎", "상추", "무", "배추", "적양파", "연근", "우엉", "가지",
+    "닭다리", "닭봉", "삼겹살", "목살", "차돌박이", "다짐육", "소불고기", "어묵", "떡", "당면",
+    "소면", "파스타면", "라면", "밥", "찹쌀가루", "부침가루", "튀김가루", "빵가루", "전분", "케첩",
+    "마요네즈", "굴소스", "액젓", "새우젓", "매실청", "물엿", "들기름", "후춧가루", "깨소금", "통깨",
+    "고추", "홍고추", "조개", "바지락", "홍합", "연어", "고등어", "갈치", "쌀", "파",
+]
+SECTIONS = ["재료", "양념", "소스", "고명"]
+QUANTITIES = ["1", "2", "3", "1/2", "1/3", "100", "200", "300", "약간", "적당량", "1.5", "4"]
+UNITS = ["개", "큰술", "작은술", "g", "ml", "컵", "줌", "T", "t", "쪽", "모", "장", ""]
+
+STA = ["일상", "초스피드", "손님접대", "술안주", "다이어트", "도시락", "영양식", "간식", "야식", "명절", "기타"]
+KND = ["밑반찬", "메인반찬", "국/탕", "찌개", "디저트", "면/만두", "밥/죽/떡", "퓨전", "김치/젓갈/장류",
+       "양념/소스/잼", "양식", "샐러드", "스프", "빵", "과자", "차/음료/술", "기타"]
+MTH = ["볶음", "끓이기", "부침", "조림", "무침", "비빔", "찜", "절임", "튀김", "삶기", "굽기", "데치기", "회", "기타"]
+MTRL = ["소고기", "돼지고기", "닭고기", "육류", "채소류", "해물류", "달걀/유제품", "가공식품류", "쌀", "밀가루",
+        "건어물류", "버섯류", "과일류", "콩/견과류", "곡류", "기타"]
+DODF = ["아무나", "초급", "중급", "고급", "신의경지"]
+TIMES = ["5분이내", "10분이내", "15분이내", "20분이내", "30분이내", "60분이내", "90분이내", "2시간이내", "2시간이상"]
+INBUN = ["1인분", "2인분", "3인분", "4인분", "5인분", "6인분이상"]
+DISHES = ["김치찌개", "된장찌개", "제육볶음", "계란말이", "잡채", "떡볶이", "카레", "볶음밥", "불고기", "미역국",
+          "감자조림", "닭갈비", "파스타", "샐러드", "순두부찌개", "오므라이스", "부대찌개", "김밥", "토스트", "주먹밥"]
+ADJECTIVES = ["초간단", "백종원", "자취생", "엄마표", "매콤한", "달달한", "건강한", "10분", "황금레시피", "밥도둑"]
+
+
+def _load_import_recipes():
+    """backend/db/import_recipes.py 를 모듈로 불러오기 (스크립트 디렉터리라 패키지가 아님)"""
+    spec = importlib.util.spec_from_file_location(
+        "import_recipes", os.path.join(BACKEND_DIR, "db", "import_recipes.py")
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _material_text(rng, weights):
+    names = list(dict.fromkeys(rng.choices(INGREDIENTS, weights=weights, k=rng.randint(3, 12))))
+    parts = []
+    for idx, name in enumerate(names):
+        item = f"{name}\a{rng.choice(QUANTITIES)}\a{rng.choice(UNITS)}"
+        # 앞부분은 [재료], 뒤쪽 일부는 [양념] 등 다른 구역으로
+        if idx == 0:
+            item = f"[{SECTIONS[0]}] {item}"
+        elif idx == len(names) - 2 and len(names) > 4:
+            item = f"[{rng.choice(SECTIONS[1:])}] {item}"
+        parts.append(item)
+    return "| ".join(parts)
+
+
+# ✅ 레시피 CSV 생성 (만개의 레시피 원본과 같은 칼럼 순서, UTF-8 BOM)
+def write_recipes_csv(path, n_rows, seed=42):
+    columns = _load_import_recipes().COLUMNS
+    rng = random.Random(seed)
+    weights = [1.0 / (rank + 1) for rank in range(len(INGREDIENTS))]
+    with open(path, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        for i in range(n_rows):
+            dish = rng.choice(DISHES)
+            inq = int(rng.lognormvariate(6, 1.6))
+            writer.writerow([
+                6_800_000 + i * 3,                                  # RCP_SNO
+                f"{rng.choice(ADJECTIVES)} {dish} 만들기",            # RCP_TTL
+                dish,                                               # CKG_NM
+                f"user{rng.randint(1, 50_000)}",                    # RGTR_ID
+                f"요리사{rng.randint(1, 50_000)}",                    # RGTR_NM
+                inq,                                                # INQ_CNT
+                int(inq * rng.random() * 0.02),                     # RCMM_CNT
+                int(inq * rng.random() * 0.05),                     # SRAP_CNT
+                rng.choice(MTH), rng.choice(STA), rng.choice(MTRL), rng.choice(KND),
+                f"{dish} 맛있게 만드는 법을 소개합니다. 누구나 쉽게 따라할 수 있어요.",   # CKG_IPDC
+                _material_text(rng, weights),                       # CKG_MTRL_CN
+                rng.choice(INBUN), rng.choice(DODF), rng.choice(TIMES),
+                f"2024{rng.randint(1, 12):02d}{rng.randint(1, 28):02d}{rng.randint(0, 235959):06d}",
+            ])
+    return path
+
+
+# ✅ 사용자 / 냉장고 / 저장 레시피 추가 (레시피 외 테이블은 schema.sql 정의로 생성)
+def populate_users(db_path, n_users, seed=7):
+    from werkzeug.security import generate_password_hash
+
+    rng = random.Random(seed)
+    importer = _load_import_recipes()
+    conn = sqlite3.connect(db_path)
+    for table in ("users", "fridge_items", "saved_recipes", "recipe_recommendations", "user_versions"):
+        conn.execute(importer.load_table_sql(table))
+    conn.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_fridge_items_unique ON fridge_items (user_id, item_name, is_seasoning)"
+    )
+
+    # 모든 사용자가 같은 해시를 쓰면 생성이 빠름 (검증 비용은 실제와 같음)
+    pw_hash = generate_password_hash(BENCH_PASSWORD)
+    conn.executemany(
+        "INSERT OR IGNORE INTO users (user_id, username, password, email) VALUES (?, ?, ?, ?)",
+        [(f"bench{i}", f"벤치{i}", pw_hash, f"bench{i}@example.com") for i in range(n_users)]
+    )
+    ids = [row[0] for row in conn.execute("SELECT id FROM users WHERE user_id LIKE 'bench%'")]
+    rcp = [row[0] for row in conn.execute("SELECT RCP_SNO FROM recipes_dataset ORDER BY RANDOM() LIMIT 5000")]
+    fridge, saved = [], []
+    for uid in ids:
+        for name in rng.sample(INGREDIENTS[:60], rng.randint(3, 15)):
+            fridge.append((uid, name, int(name in ("간장", "소금", "설탕", "참기름", "후추", "고춧가루"))))
+        for code in rng.sample(rcp, min(len(rcp), rng.randint(0, 20))):
+            saved.append((uid, code, f"https://www.10000recipe.com/recipe/{code}"))
+    conn.executemany("INSERT OR IGNORE INTO fridge_items (user_id, item_name, is_seasoning) VALUES (?, ?, ?)", fridge)
+    conn.executemany("INSERT INTO saved_recipes (user_id, RCP_SNO, recipe_url) VALUES (?, ?, ?)", saved)
+    conn.commit()
+    conn.close()
+
+
+# ✅ 규모별 데이터 디렉터리 준비 (이미 있으면 재사용)
+def prepare(scale, out_dir=None, force=False):
+    n_rows = SCALES[scale]
+    out_dir = out_dir or os.path.join(DATA_DIR, scale)
+    paths = {
+        "dir": out_dir,
+        "csv": os.path.join(out_dir, "recipes.csv"),
+        "db": os.path.join(out_dir, "fridge.db"),
+        "snapshot": os.path.join(out_dir, "recipe_snapshot"),
+        "crawl_cache": os.path.join(out_dir, "crawl_cache.db"),
+    }
+    if not force and all(os.path.exists(paths[k]) for k in ("csv", "db", "snapshot")):
+        return paths
+
+    os.makedirs(out_dir, exist_ok=True)
+    for key in ("db", "crawl_cache"):
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(paths[key] + suffix):
+                os.remove(paths[key] + suffix)
+
+    started = time.time()
+    print(f"📦 합성 레시피 {n_rows}건 CSV 생성 …")
+    write_recipes_csv(paths["csv"], n_rows)
+    print("📥 fridge.db 적재 (import_recipes.py) …")
+    _load_import_recipes().import_recipes(paths["csv"], paths["db"])
+    populate_users(paths["db"], max(100, n_rows // 1000))
+
+    print("🧊 액션 서버 스냅샷 생성 …")
+    sys.path.insert(0, os.path.join(ROOT, "chatbot_rasa"))
+    from actions.recipe_store import build_snapshot
+    build_snapshot(paths["csv"], paths["snapshot"])
+    print(f"✅ 합성 데이터 준비 완료 ({time.time() - started:.1f}초) → {out_dir}")
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벤치마크용 합성 데이터 생성")
+    parser.add_argument("--scale", choices=SCALES, default="10k")
+    parser.add_argument("--out", help="데이터 디렉터리 (기본값: benchmarks/.data/<scale>)")
+    parser.add_argument("--force", action="store_true", help="이미 있어도 다시 생성")
+    args = parser.parse_args()
+    prepare(args.scale, args.out, args.force)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+# 벤치마크 공통: 반복 실행 시간 측정 + 통계
+import statistics
+import time
+
+
+# 🔧 정렬된 값에서 백분위수 (최근접 순위)
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[k]
+
+
+def summarize(samples_ms):
+    values = sorted(samples_ms)
+    total = sum(values)
+    return {
+        "n": len(values),
+        "mean_ms": round(statistics.fmean(values), 4) if values else 0.0,
+        "p50_ms": round(percentile(values, 50), 4),
+        "p95_ms": round(percentile(values, 95), 4),
+        "p99_ms": round(percentile(values, 99), 4),
+        "max_ms": round(values[-1], 4) if values else 0.0,
+        "ops_per_s": round(len(values) / (total / 1000), 2) if total else 0.0,
+    }
+
+
+# ✅ fn(i) 를 warmup 회 실행한 뒤 iterations 회 측정 (fn 이 False 를 반환하면 실패로 집계)
+def measure(fn, iterations, warmup=5):
+    for i in range(warmup):
+        fn(i)
+    samples, failures = [], 0
+    for i in range(iterations):
+        started = time.perf_counter()
+        ok = fn(i)
+        samples.append((time.perf_counter() - started) * 1000)
+        if ok is False:
+            failures += 1
+    result = summarize(samples)
+    result["failures"] = failures
+    return result
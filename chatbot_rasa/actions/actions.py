@@ -1,17 +1,21 @@
 from rasa_sdk import Action, Tracker
 from rasa_sdk.executor import CollectingDispatcher
 from rasa_sdk.events import SlotSet, FollowupAction
-import pandas as pd
 import os
 import re
-import requests
-from bs4 import BeautifulSoup
-from konlpy.tag import Okt
 import sqlite3
 import logging
+import threading
+from functools import lru_cache
 
-# 형태소 분석기 및 로거 초기화
-oct = Okt()
+from . import metrics
+from .crawler import crawl_recipe
+from .recipe_index import VocabMatcher
+from .recipe_store import open_store, parse_time_to_minutes
+from .recommendation_log import RecommendationLogger
+from .tracing import span, traced
+
+# 로거 초기화
 logger = logging.getLogger(__name__)
 
 # 단위 목록 정의 (NLU에서 분리한 unit 엔티티 추가 필터링 용)
@@ -24,52 +28,91 @@ DIFFICULTY_MAP = {
     '고급용': '고급', '고급': '고급'
 }
 
-# 데이터셋 로드 및 전처리
-dataset_path = os.path.join(
-    os.path.dirname(__file__),
-    '../..',
-    'backend',
-    'db',
-    'TB_RECIPE_SEARCH_241226.csv'
+# 냉장고/레시피 재료 DB 경로
+DB_PATH = os.environ.get(
+    "FRIDGE_DB_PATH",
+    os.path.join(os.path.dirname(__file__), '../..', 'backend', 'db', 'fridge.db')
 )
-dataset = pd.read_csv(dataset_path)
-
-# 시간 문자열을 분 단위 정수로 변환 (예: '1시간 30분 이내' -> 90분)
-def parse_time_to_minutes(time_str):
-    if pd.isna(time_str):
-        return float('inf')
-    hours = re.search(r"(\d+)\s*시간", time_str)
-    mins = re.search(r"(\d+)\s*분", time_str)
-    total = 0
-    if hours:
-        total += int(hours.group(1)) * 60
-    if mins:
-        total += int(mins.group(1))
-    return total
-
-# 분 단위 숫자 칼럼 생성
-dataset['time_min'] = dataset['CKG_TIME_NM'].apply(parse_time_to_minutes)
-
-# 10000recipe.com 크롤러 함수
-def crawl_recipe(recipe_code):
-    url = f"https://www.10000recipe.com/recipe/{recipe_code}"
-    headers = {"User-Agent": "Mozilla/5.0"}
-    try:
-        res = requests.get(url, headers=headers)
-        res.raise_for_status()
-        soup = BeautifulSoup(res.text, 'html.parser')
-        steps = (
-            [step.get_text(strip=True) for step in soup.select("span.view_step_text")]  
-            or [step.get_text(strip=True) for step in soup.select("div.view_step_cont")]
-        )
-        if steps:
-            return " ".join(steps[:3]), url
-        return "조리법 정보를 불러오지 못했어요 😢", url
-    except Exception as e:
-        logger.error(f"크롤링 실패: {e}")
-        return "조리법 정보를 불러오지 못했어요 😢", url
-
-# CSV 원재료 문자열 파싱 함수
+
+# 추천 기록 (recipe_recommendations 에 백그라운드로 일괄 저장, 응답은 기다리지 않음)
+recommendation_log = RecommendationLogger(DB_PATH)
+
+# 단계별 소요 시간 / 크롤링 결과 지표를 별도 포트(ACTION_METRICS_PORT)의 /metrics 로 노출
+# (액션을 실행하는 Sanic 워커 프로세스에서만 시작)
+metrics.start_in_worker()
+
+# 비건 카테고리에서 제외할 재료
+NON_VEGAN_INGREDIENTS = ['닭', '소고기', '돼지고기', '계란']
+
+# 레시피 저장소 (스냅샷을 읽기 전용 메모리 맵으로 열어서 워커 프로세스끼리 페이지 캐시 공유)
+store = open_store()
+
+# 자유 입력 재료 매칭용 어휘 사전 (단어 → 등장 레시피 수, 요청마다 다시 만들지 않음)
+ingredient_vocab = store.vocab
+
+# 레시피 × 재료명 희소 행렬 (재료 포함 여부/냉장고 매칭을 행렬 연산으로 계산)
+ingredient_matrix = store.ingredients
+
+# 카테고리/난이도 값별 행 비트맵 + 조리 시간 정렬 색인
+facet_index = store.facets
+
+# 인기도 점수 + 인기순 행 순서 (조건에 맞는 인기 레시피를 앞에서부터 찾다가 k 개면 멈춤)
+popularity = store.popularity
+
+# 형태소 분석기 (JVM 을 띄우므로 사전 매칭으로 재료를 못 찾았을 때 처음 필요해지는 시점에 생성)
+_okt = None
+_okt_lock = threading.Lock()
+
+def get_okt():
+    global _okt
+    if _okt is None:
+        with _okt_lock:
+            if _okt is None:
+                from konlpy.tag import Okt
+                _okt = Okt()
+    return _okt
+
+# 같은 문장이 반복되는 경우가 많으므로 명사 추출 결과 캐시
+@lru_cache(maxsize=4096)
+def extract_nouns(text):
+    return tuple(get_okt().nouns(text))
+
+# 재료명 사전 매칭기 (Aho-Corasick, 최초 사용 시 한 번 생성)
+@lru_cache(maxsize=1)
+def get_vocab_matcher():
+    return VocabMatcher.build(ingredient_matrix.names)
+
+# 자유 입력 문장 → 알려진 재료 단어 목록 (사전 매칭 우선, 못 찾으면 Okt 명사 추출)
+def extract_ingredients(text):
+    found = [w for w in get_vocab_matcher().find(text) if w not in UNIT_LIST]
+    if found:
+        return found
+    with span("okt"):
+        nouns = extract_nouns(text)
+    filtered = [n for n in nouns if n not in UNIT_LIST]
+    return [n for n in filtered if n in ingredient_vocab]
+
+# 카테고리/난이도/시간 슬롯 조건 → 행 마스크 (비트맵 AND 로 계산)
+def facet_mask(category=None, difficulty=None, time_slot=None):
+    bitmap = facet_index.all
+    if category:
+        bitmap = bitmap & facet_index.category(category)
+    if difficulty:
+        bitmap = bitmap & facet_index.difficulty(DIFFICULTY_MAP.get(difficulty, difficulty))
+    if time_slot:
+        bitmap = bitmap & facet_index.time_at_most(parse_time_to_minutes(time_slot))
+    mask = facet_index.to_mask(bitmap)
+    if category == '비건':
+        mask &= ~ingredient_matrix.contains_any(NON_VEGAN_INGREDIENTS)
+    return mask
+
+# 재료 목록 → 응답용 문자열 (max_items 개까지만 표시)
+def format_ingredients(items, max_items=5):
+    if len(items) > max_items:
+        return "\n".join(items[:max_items]) + "\n... 그 외 재료는 링크에서 확인해보세요!"
+    return "\n".join(items)
+
+# CSV 원재료 문자열 파싱 함수 (recipe_ingredients 테이블이 없을 때 사용)
 def parse_ingredients(raw_str, max_items=5):
     cleaned = re.sub(r'\[[^\]]*\]', '', raw_str)
     parts = cleaned.split('|')
@@ -82,78 +125,88 @@ def parse_ingredients(raw_str, max_items=5):
         txt = f"{name} {qty} {unit}".strip()
         if txt:
             items.append(txt)
-    if len(items) > max_items:
-        return "\n".join(items[:max_items]) + "\n... 그 외 재료는 링크에서 확인해보세요!"
-    return "\n".join(items)
+    return format_ingredients(items, max_items)
+
+# recipe_ingredients 테이블(import_recipes.py 가 생성)에서 추천 레시피들의 재료를 한 번에 조회
+# 반환: {RCP_SNO: ["양파 1 개", …]} (테이블이 없으면 빈 dict → parse_ingredients 로 대체)
+def fetch_ingredient_lines(codes):
+    if not codes:
+        return {}
+    try:
+        conn = sqlite3.connect(DB_PATH)
+        try:
+            rows = conn.execute(
+                f"SELECT RCP_SNO, name, qty, unit FROM recipe_ingredients "
+                f"WHERE RCP_SNO IN ({','.join('?' * len(codes))}) ORDER BY RCP_SNO, seq",
+                codes
+            ).fetchall()
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        logger.warning(f"recipe_ingredients 조회 실패: {e}")
+        return {}
+    lines = {}
+    for code, name, qty, unit in rows:
+        lines.setdefault(code, []).append(" ".join(p for p in (name, qty, unit) if p))
+    return lines
 
 class ActionRecommendMenu(Action):
     def name(self):
         return "action_recommend_menu"
 
+    @traced
     def run(self, dispatcher: CollectingDispatcher, tracker: Tracker, domain: dict):
         category   = tracker.get_slot("category")
         ingredient = tracker.get_slot("ingredient")
         difficulty = tracker.get_slot("difficulty")
         time_slot  = tracker.get_slot("time")
         user_msg   = tracker.latest_message.get('text', "")
+        user_id    = tracker.get_slot("user_id") or tracker.sender_id    # 앱은 로그인 ID 를 sender 로 보냄
 
-        # 기본 필터 생성
-        cond = pd.Series(True, index=dataset.index)
-
-        # 재료 필터
-        if ingredient:
-            cond &= dataset["CKG_MTRL_CN"].fillna("").str.contains(ingredient, case=False)
-        # 카테고리 필터
-        if category:
-            cat_cond = (
-                dataset["CKG_STA_ACTO_NM"].fillna("").str.contains(category, case=False) |
-                dataset["CKG_KND_ACTO_NM"].fillna("").str.contains(category, case=False) |
-                dataset["CKG_MTH_ACTO_NM"].fillna("").str.contains(category, case=False) |
-                dataset["CKG_MTRL_ACTO_NM"].fillna("").str.contains(category, case=False)
-            )
-            cond &= cat_cond
-            if category == '비건':
-                cond &= ~dataset["CKG_MTRL_CN"].fillna("").str.contains('닭|소고기|돼지고기|계란', case=False)
-        # 난이도 필터
-        if difficulty:
-            diff = DIFFICULTY_MAP.get(difficulty, difficulty)
-            cond &= dataset["CKG_DODF_NM"].fillna("").str.contains(diff, case=False)
-        # 시간 필터
-        if time_slot:
-            threshold = parse_time_to_minutes(time_slot)
-            cond &= dataset['time_min'] <= threshold
+        # 카테고리/난이도/시간 필터 + 재료 필터
+        with span("slots"):
+            cond = facet_mask(category, difficulty, time_slot)
+            if ingredient:
+                cond &= ingredient_matrix.contains_any([ingredient])
 
         # 슬롯 기반 검색
         if any([ingredient, category, difficulty, time_slot]):
-            matched = dataset[cond]
-            if matched.empty:
+            matched = cond
+            if not matched.any():
                 dispatcher.utter_message(text=f"죄송해요. '{ingredient or category or difficulty or time_slot}' 관련 레시피를 찾지 못했어요.")
                 return []
         else:
-            candidate = dataset["CKG_MTRL_CN"].dropna().str.extractall(r'([가-힣]+)')[0].unique()
-            nouns = oct.nouns(user_msg)
-            filtered = [n for n in nouns if n not in UNIT_LIST]
-            matched_ing = [n for n in filtered if n in candidate]
+            with span("extract"):
+                matched_ing = extract_ingredients(user_msg)
             if not matched_ing:
                 dispatcher.utter_message(text="입력하신 재료를 이해하지 못했어요 😢 다시 입력해주세요.")
                 return []
-            def all_in(x, req): return all(r in str(x) for r in req)
-            matched = dataset[dataset["CKG_MTRL_CN"].apply(lambda x: all_in(x, matched_ing))]
-            if matched.empty:
+            with span("match"):
+                matched = ingredient_matrix.contains_all(matched_ing)
+            if not matched.any():
                 dispatcher.utter_message(text=f"{', '.join(matched_ing)} 모두 들어간 레시피를 찾지 못했어요.")
                 return []
 
-        # 추천 샘플링 & 응답
-        samples = matched.sample(min(3, len(matched)))
-        for _, row in samples.iterrows():
+        # 인기 상위 후보 중 인기도 가중 무작위로 3개 추천 & 응답
+        with span("sample"):
+            samples = [store.record(pos) for pos in popularity.top_k(matched, 3, randomize=True)]
+        with span("ingredients_db"):
+            ingredient_lines = fetch_ingredient_lines([row["RCP_SNO"] for row in samples])
+        for row in samples:
             code      = row["RCP_SNO"]
             title     = row["CKG_NM"]
             raw_ing   = row["CKG_MTRL_CN"]
             cat       = row["CKG_KND_ACTO_NM"]
             raw_time  = row["CKG_TIME_NM"]
-            cook_time = raw_time if pd.notna(raw_time) else ""
-            steps, link = crawl_recipe(code)
-            ingredients = parse_ingredients(raw_ing, max_items=3)
+            cook_time = raw_time or ""
+            with span("crawl"):
+                steps, link = crawl_recipe(code)
+            with span("format"):
+                ingredients = (
+                    format_ingredients(ingredient_lines[code], max_items=3) if code in ingredient_lines
+                    else parse_ingredients(raw_ing, max_items=3)
+                )
+            recommendation_log.log(user_id, code, user_msg, link)
 
             dispatcher.utter_message(json_message={
                 "type": "recipe",
@@ -171,6 +224,7 @@ class ActionRecommendFromFridge(Action):
     def name(self):
         return "action_recommend_from_fridge"
 
+    @traced
     def run(self, dispatcher: CollectingDispatcher, tracker: Tracker, domain: dict):
         user_id    = tracker.get_slot("user_id")
         category   = tracker.get_slot("category")
@@ -182,72 +236,37 @@ class ActionRecommendFromFridge(Action):
             return []
 
         # DB에서 냉장고 재료 조회
-        db_path = os.path.join(
-            os.path.dirname(__file__),
-            '../..',
-            'backend',
-            'db',
-            'fridge.db'
-        )
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
-        cur = conn.cursor()
-        cur.execute("SELECT id FROM users WHERE user_id = ?", (user_id,))
-        row = cur.fetchone()
-        if not row:
-            dispatcher.utter_message(text="사용자 정보를 찾을 수 없습니다.")
+        with span("fridge_db"):
+            conn = sqlite3.connect(DB_PATH)
+            conn.row_factory = sqlite3.Row
+            cur = conn.cursor()
+            cur.execute("SELECT id FROM users WHERE user_id = ?", (user_id,))
+            row = cur.fetchone()
+            items = None
+            if row:
+                cur.execute("SELECT item_name FROM fridge_items WHERE user_id = ?", (row["id"],))
+                items = [r["item_name"] for r in cur.fetchall()]
             conn.close()
+        if items is None:
+            dispatcher.utter_message(text="사용자 정보를 찾을 수 없습니다.")
             return []
-        uid = row["id"]
-        cur.execute("SELECT item_name FROM fridge_items WHERE user_id = ?", (uid,))
-        items = [r["item_name"] for r in cur.fetchall()]
-        conn.close()
 
         if not items:
             dispatcher.utter_message(text="냉장고에 등록된 재료가 없습니다. 먼저 재료를 등록해 주세요.")
             return []
 
-        # 헬퍼 함수 정의
-        def all_in(x, req):
-            return all(i in str(x) for i in req)
-
-        def any_in(x, req):
-            return any(i in str(x) for i in req)
-
-        def category_cond(df):
-            cond = pd.Series(True, index=df.index)
-            if category:
-                cat_c = (
-                    df["CKG_STA_ACTO_NM"].fillna("").str.contains(category, case=False) |
-                    df["CKG_KND_ACTO_NM"].fillna("").str.contains(category, case=False) |
-                    df["CKG_MTH_ACTO_NM"].fillna("").str.contains(category, case=False) |
-                    df["CKG_MTRL_ACTO_NM"].fillna("").str.contains(category, case=False)
-                )
-                cond &= cat_c
-                if category == '비건':
-                    cond &= ~df["CKG_MTRL_CN"].fillna("").str.contains('닭|소고기|돼지고기|계란', case=False)
-            if difficulty:
-                diff = DIFFICULTY_MAP.get(difficulty, difficulty)
-                cond &= df["CKG_DODF_NM"].fillna("").str.contains(diff, case=False)
-            if time_slot:
-                threshold = parse_time_to_minutes(time_slot)
-                cond &= df['time_min'] <= threshold
-            return cond
+        # 냉장고 재료 매칭 (완전/부분 매칭, 보유 비율, 부족 재료를 행렬 연산 한 번으로 계산)
+        with span("match"):
+            fridge = ingredient_matrix.match_fridge(items)
+        with span("slots"):
+            cond = facet_mask(category, difficulty, time_slot)
 
         # 완전 매칭 우선 검색
-        df_full = dataset[
-            dataset["CKG_MTRL_CN"].apply(lambda x: all_in(x, items)) &
-            category_cond(dataset)
-        ]
         partial = False
-        if df_full.empty:
+        if not (fridge.full & cond).any():
             dispatcher.utter_message(text="냉장고 재료만으로는 부족합니다! 추가적인 재료를 구매해서 요리해보세요!")
-            df_full = dataset[
-                dataset["CKG_MTRL_CN"].apply(lambda x: any_in(x, items)) &
-                category_cond(dataset)
-            ]
             partial = True
-            if df_full.empty:
+            if not (fridge.partial & cond).any():
                 dispatcher.utter_message(text="냉장고 재료로 만들 수 있는 메뉴를 찾지 못했어요.")
                 return []
 
@@ -260,25 +279,30 @@ class ActionRecommendFromFridge(Action):
             )
         )
 
-        # 샘플링 및 응답
-        samples = df_full.sample(min(3, len(df_full)))
-        for _, row in samples.iterrows():
+        # 보유 재료 비율(coverage)이 높은 순으로 상위 3개 추천 (같으면 인기순)
+        with span("sample"):
+            top_rows = fridge.rank((fridge.partial if partial else fridge.full) & cond, 3, popularity)
+        with span("ingredients_db"):
+            ingredient_lines = fetch_ingredient_lines([store.record(pos)["RCP_SNO"] for pos in top_rows])
+        for pos in top_rows:
+            row = store.record(pos)
             code      = row["RCP_SNO"]
             title     = row["CKG_NM"]
             raw_ing   = row["CKG_MTRL_CN"]
             cat       = row["CKG_KND_ACTO_NM"]
             raw_time  = row["CKG_TIME_NM"]
-            cook_time = raw_time if pd.notna(raw_time) else ""
-            steps, link = crawl_recipe(code)
-            ingredients = parse_ingredients(raw_ing, max_items=3)
+            cook_time = raw_time or ""
+            with span("crawl"):
+                steps, link = crawl_recipe(code)
+            with span("format"):
+                ingredients = (
+                    format_ingredients(ingredient_lines[code], max_items=3) if code in ingredient_lines
+                    else parse_ingredients(raw_ing, max_items=3)
+                )
+            recommendation_log.log(user_id, code, tracker.latest_message.get('text', ""), link)
 
             if partial:
-                needed = []
-                for itm in raw_ing.split('|'):
-                    seg = itm.split('\a')
-                    name = seg[0].strip() if seg else ''
-                    if name and name not in UNIT_LIST and name not in items:
-                        needed.append(name)
+                needed = [name for name in fridge.missing(pos) if name not in UNIT_LIST]
                 dispatcher.utter_message(text=f"냉장고에 있는 재료 외에 {', '.join(needed)} 재료가 더 필요한 메뉴예요!")
 
             dispatcher.utter_message(json_message={
@@ -0,0 +1,176 @@
+# 10000recipe.com 조리법 크롤러 + 디스크 캐시
+# - RCP_SNO 별로 파싱된 조리 단계를 SQLite(crawl_cache.db, fridge.db 옆)에 저장
+# - TTL 이내 캐시는 네트워크 요청 없이 바로 응답
+# - TTL 이 지났지만 STALE_TTL 이내면 기존 값을 먼저 응답하고 백그라운드에서 갱신 (stale-while-revalidate)
+# - 응답 출처(캐시/크롤링/실패)와 실제 HTTP 요청 성공/실패 횟수를 metrics 에 기록
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+CACHE_DB_PATH = os.environ.get(
+    "RECIPE_CRAWL_CACHE_PATH",
+    os.path.join(os.path.dirname(__file__), '../..', 'backend', 'db', 'crawl_cache.db')
+)
+# 조리법 페이지 주소 (부하 테스트 때는 benchmarks/recipe_site.py 대역 서버로 변경)
+BASE_URL = os.environ.get("RECIPE_CRAWL_BASE_URL", "https://www.10000recipe.com/recipe").rstrip("/")
+CACHE_TTL = 7 * 24 * 3600           # 이 시간 동안은 캐시만 사용 (초)
+STALE_TTL = 30 * 24 * 3600          # TTL 이후 이 시간까지는 오래된 값을 응답하면서 백그라운드 갱신 (초)
+REQUEST_TIMEOUT = (3.05, 5)         # (연결, 읽기) 타임아웃 (초)
+FAIL_MESSAGE = "조리법 정보를 불러오지 못했어요 😢"
+
+# crawl_recipe 응답 출처: cache(TTL 이내) / stale(오래된 값 + 백그라운드 갱신) / fetched / stale_fallback / failed
+crawl_requests = metrics.counter("crawl_requests_total", "crawl_recipe 호출 수 (응답 출처별)", ("source",))
+# 실제 HTTP 요청 결과: ok / empty(조리 단계를 찾지 못함) / error(네트워크·HTTP 오류)
+crawl_fetches = metrics.counter("crawl_fetch_total", "10000recipe.com 요청 수 (결과별)", ("result",))
+crawl_fetch_duration = metrics.histogram("crawl_fetch_duration_seconds", "10000recipe.com 요청 + 파싱 소요 시간")
+
+# HTTP 연결 재사용용 세션 (keep-alive 연결 풀 + 연결 오류 1회 재시도)
+_session = requests.Session()
+_session.headers.update({"User-Agent": "Mozilla/5.0"})
+_adapter = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=1, connect=1, read=0, backoff_factor=0.2)
+)
+_session.mount("https://", _adapter)
+_session.mount("http://", _adapter)
+
+# 백그라운드 갱신 작업용 스레드 풀 (같은 레시피를 중복 갱신하지 않도록 진행 중 목록 관리)
+_refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix="recipe-crawl")
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+# 스레드별 캐시 DB 연결
+_local = threading.local()
+
+
+def _cache_conn():
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(CACHE_DB_PATH, timeout=5.0)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS recipe_steps_cache ("
+            " RCP_SNO INTEGER PRIMARY KEY,"
+            " steps TEXT NOT NULL,"          # 조리 단계 목록 (JSON 배열)
+            " fetched_at REAL NOT NULL"      # 크롤링 시각 (epoch 초)
+            ")"
+        )
+        _local.conn = conn
+    return conn
+
+
+def _cache_get(recipe_code):
+    try:
+        row = _cache_conn().execute(
+            "SELECT steps, fetched_at FROM recipe_steps_cache WHERE RCP_SNO = ?",
+            (int(recipe_code),)
+        ).fetchone()
+    except sqlite3.Error as e:
+        logger.warning(f"크롤링 캐시 조회 실패: {e}")
+        return None
+    if not row:
+        return None
+    return json.loads(row[0]), row[1]
+
+
+def _cache_put(recipe_code, steps):
+    try:
+        conn = _cache_conn()
+        conn.execute(
+            "INSERT OR REPLACE INTO recipe_steps_cache (RCP_SNO, steps, fetched_at) VALUES (?, ?, ?)",
+            (int(recipe_code), json.dumps(steps, ensure_ascii=False), time.time())
+        )
+        conn.commit()
+    except sqlite3.Error as e:
+        logger.warning(f"크롤링 캐시 저장 실패: {e}")
+
+
+def recipe_url(recipe_code):
+    return f"{BASE_URL}/{recipe_code}"
+
+
+# 실제 HTTP 요청 + 조리 단계 파싱 (실패 시 None)
+def fetch_recipe_steps(recipe_code):
+    started = time.perf_counter()
+    result = "error"
+    try:
+        res = _session.get(recipe_url(recipe_code), timeout=REQUEST_TIMEOUT)
+        res.raise_for_status()
+        soup = BeautifulSoup(res.text, 'html.parser')
+        steps = (
+            [step.get_text(strip=True) for step in soup.select("span.view_step_text")]
+            or [step.get_text(strip=True) for step in soup.select("div.view_step_cont")]
+        )
+        result = "ok" if steps else "empty"
+        return steps or None
+    except Exception as e:
+        logger.error(f"크롤링 실패: {e}")
+        return None
+    finally:
+        crawl_fetch_duration.observe(time.perf_counter() - started)
+        crawl_fetches.inc(result)
+
+
+def _refresh(recipe_code):
+    try:
+        steps = fetch_recipe_steps(recipe_code)
+        if steps:
+            _cache_put(recipe_code, steps)
+    finally:
+        with _refreshing_lock:
+            _refreshing.discard(recipe_code)
+
+
+def _schedule_refresh(recipe_code):
+    with _refreshing_lock:
+        if recipe_code in _refreshing:
+            return
+        _refreshing.add(recipe_code)
+    _refresher.submit(_refresh, recipe_code)
+
+
+def _format(steps):
+    return " ".join(steps[:3])
+
+
+# 10000recipe.com 크롤러 함수 (캐시 우선)
+def crawl_recipe(recipe_code):
+    url = recipe_url(recipe_code)
+    cached = _cache_get(recipe_code)
+    if cached:
+        steps, fetched_at = cached
+        age = time.time() - fetched_at
+        if age < CACHE_TTL:
+            crawl_requests.inc("cache")
+            return _format(steps), url
+        if age < CACHE_TTL + STALE_TTL:
+            _schedule_refresh(recipe_code)
+            crawl_requests.inc("stale")
+            return _format(steps), url
+
+    steps = fetch_recipe_steps(recipe_code)
+    if steps:
+        _cache_put(recipe_code, steps)
+        crawl_requests.inc("fetched")
+        return _format(steps), url
+    # 새로 받아오지 못했으면 아주 오래된 캐시라도 사용
+    if cached:
+        crawl_requests.inc("stale_fallback")
+        return _format(cached[0]), url
+    crawl_requests.inc("failed")
+    return FAIL_MESSAGE, url
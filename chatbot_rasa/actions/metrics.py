@@ -0,0 +1,194 @@
+# 액션 서버 지표 (메모리 카운터/히스토그램 + Prometheus 텍스트 형식 HTTP 엔드포인트)
+# - 액션 서버(rasa run actions, 5055)와 별도 포트(ACTION_METRICS_PORT, 기본 9105)의 /metrics 로 노출
+# - 기록은 dict 조회 + bisect + 짧은 lock 뿐이라 항상 켜 두어도 됨
+# - ACTION_METRICS_PORT=0 이면 HTTP 엔드포인트를 띄우지 않음 (기록은 계속)
+# - 엔드포인트는 액션을 실행하는 프로세스에서 띄움 (start_in_worker / ensure_server 참고)
+# - 지표 클래스는 backend/metrics.py 와 같은 형식. 액션 서버는 backend 와 따로 배포되고
+#   backend/metrics.py 는 flask / backend config 를 import 하므로 여기서 가져다 쓰지 않음
+import logging
+import os
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+METRICS_HOST = os.environ.get("ACTION_METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.environ.get("ACTION_METRICS_PORT", 9105))
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)   # 초
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values, extra=None):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """레이블 조합별 누적 카운터"""
+
+    kind = "counter"
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self.lock:
+            self.values[label_values] = self.values.get(label_values, 0) + amount
+
+    def samples(self):
+        with self.lock:
+            items = list(self.values.items())
+        for label_values, value in items:
+            yield self.name, _format_labels(self.labels, label_values), value
+
+
+class Gauge:
+    """현재 값 (수집 시점에 함수를 호출해서 읽음)"""
+
+    kind = "gauge"
+
+    def __init__(self, name, help_text, func):
+        self.name = name
+        self.help = help_text
+        self.func = func
+
+    def samples(self):
+        yield self.name, "", self.func()
+
+
+class Histogram:
+    """레이블 조합별 버킷 카운트 + 합계 (출력할 때 누적)"""
+
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self.values = {}                # {레이블 값: [버킷별 개수..., +Inf 개수, 합계]}
+        self.lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        index = bisect_left(self.buckets, value)
+        with self.lock:
+            row = self.values.get(label_values)
+            if row is None:
+                row = self.values[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            row[index] += 1
+            row[-1] += value
+
+    def samples(self):
+        with self.lock:
+            items = [(k, list(v)) for k, v in self.values.items()]
+        for label_values, row in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, row):
+                cumulative += count
+                yield f"{self.name}_bucket", _format_labels(self.labels, label_values, f'le="{bound}"'), cumulative
+            cumulative += row[len(self.buckets)]
+            yield f"{self.name}_bucket", _format_labels(self.labels, label_values, 'le="+Inf"'), cumulative
+            yield f"{self.name}_sum", _format_labels(self.labels, label_values), row[-1]
+            yield f"{self.name}_count", _format_labels(self.labels, label_values), cumulative
+
+
+# 등록 순서대로 출력
+_registry = []
+
+
+def counter(name, help_text, labels=()):
+    metric = Counter(name, help_text, labels)
+    _registry.append(metric)
+    return metric
+
+
+def gauge(name, help_text, func):
+    metric = Gauge(name, help_text, func)
+    _registry.append(metric)
+    return metric
+
+
+def histogram(name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+    metric = Histogram(name, help_text, labels, buckets)
+    _registry.append(metric)
+    return metric
+
+
+def render():
+    lines = []
+    for metric in _registry:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for name, labels, value in metric.samples():
+            lines.append(f"{name}{labels} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):       # 수집기 요청마다 접근 로그를 남기지 않음
+        pass
+
+
+_server = None
+_server_lock = threading.Lock()
+_attempted = False              # 이미 시작을 시도했으면 (실패했더라도) 다시 시도하지 않음
+
+
+# ✅ /metrics HTTP 서버 시작 (한 번만, 포트를 쓸 수 없으면 경고만 남기고 계속)
+def start_server(host=METRICS_HOST, port=METRICS_PORT):
+    global _server, _attempted
+    if not port:
+        return None
+    with _server_lock:
+        if _server is None and not _attempted:
+            _attempted = True
+            try:
+                _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            except OSError as e:
+                logger.warning(f"액션 서버 지표 엔드포인트 시작 실패 ({host}:{port}): {e}")
+                return None
+            _server.daemon_threads = True
+            threading.Thread(target=_server.serve_forever, name="action-metrics", daemon=True).start()
+            logger.info(f"액션 서버 지표: http://{host}:{port}/metrics")
+    return _server
+
+
+# ✅ Sanic 워커 프로세스에서만 import 시점에 시작
+# rasa_sdk 는 Sanic 관리 프로세스와 워커 프로세스 양쪽에서 actions 를 import 하는데,
+# 관리 프로세스가 포트를 잡으면 지표가 실제로 쌓이는 워커의 /metrics 가 비게 됨.
+# (Sanic 은 워커를 띄울 때만 SANIC_WORKER_NAME 을 설정함. 워커가 여러 개면 처음 뜬 워커만 노출)
+def start_in_worker():
+    if os.environ.get("SANIC_WORKER_NAME"):
+        start_server()
+
+
+# ✅ 액션 실행 시 호출: Sanic 밖(단일 프로세스)에서 실행된 경우 첫 액션 때 시작
+def ensure_server():
+    if not _attempted:
+        start_server()
@@ -0,0 +1,351 @@
+# 레시피 데이터셋에서 미리 만들어 두는 색인들 (액션 서버 로드 시 한 번만 생성)
+import re
+from collections import Counter, deque
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+try:
+    import ahocorasick      # pyahocorasick (C 구현, 설치되어 있으면 사용)
+except ImportError:
+    ahocorasick = None
+
+# CKG_MTRL_CN 에서 한글 단어 추출용 정규식
+HANGUL_WORD_RE = re.compile(r'[가-힣]+')
+
+
+# 재료 어휘 사전: 한글 단어 → 그 단어가 등장하는 레시피 수
+def build_ingredient_vocab(texts):
+    vocab = Counter()
+    for raw in texts:
+        if isinstance(raw, str):
+            vocab.update(set(HANGUL_WORD_RE.findall(raw)))
+    return vocab
+
+
+# [재료], [양념] 같은 구역 표기 제거용 정규식
+SECTION_RE = re.compile(r'\[[^\]]*\]')
+
+
+# CKG_MTRL_CN 원문에서 재료명 목록 추출 ("이름\a수량\a단위|이름\a수량\a단위" 형식)
+def parse_ingredient_names(raw_str):
+    if not isinstance(raw_str, str):
+        return []
+    names = []
+    for itm in SECTION_RE.sub('', raw_str).split('|'):
+        name = itm.split('\a')[0].strip()
+        if name:
+            names.append(name)
+    return names
+
+
+class FridgeMatch:
+    """냉장고 재료 목록과 전체 레시피의 매칭 결과 (레시피 행 순서의 배열들)"""
+
+    def __init__(self, matrix, owned, items_found, n_items):
+        self._matrix = matrix
+        self.owned = owned                                  # 재료명(열)별 보유 여부
+        self.items_found = items_found                      # 레시피별로 포함된 냉장고 재료 수
+        self.full = items_found == n_items                  # 냉장고 재료를 모두 포함
+        self.partial = items_found > 0                      # 냉장고 재료를 하나 이상 포함
+        have = np.asarray(matrix.matrix @ owned.astype(np.int32)).ravel()
+        total = np.diff(matrix.matrix.indptr)
+        self.coverage = np.divide(have, total, out=np.zeros(len(total)), where=total > 0)  # 레시피 재료 중 보유 비율
+
+    def rank(self, mask, k, popularity=None):
+        """mask 에 해당하는 레시피 중 보유 비율(coverage) → 포함 재료 수 → 인기도 순으로 상위 k 개 행 번호"""
+        rows = np.flatnonzero(mask)
+        keys = (-self.items_found[rows], -self.coverage[rows])
+        if popularity is not None:
+            keys = (-popularity.scores[rows],) + keys
+        order = np.lexsort(keys)
+        return rows[order[:k]]
+
+    def missing(self, row):
+        """해당 레시피에서 냉장고에 없는 재료명 목록"""
+        cols = self._matrix.row_columns(row)
+        return [self._matrix.names[c] for c in cols[~self.owned[cols]]]
+
+
+class IngredientMatrix:
+    """레시피 × 재료명 희소 불리언 행렬 (행: 데이터셋 행 순서, 열: 재료명)"""
+
+    def __init__(self, names, matrix):
+        self.names = names                      # 열 번호 → 재료명
+        self.matrix = matrix                    # scipy.sparse.csr_matrix (n_recipes × n_names)
+        self.columns_for = lru_cache(maxsize=4096)(self._columns_for)
+
+    @classmethod
+    def build(cls, texts):
+        col_of = {}
+        indptr = [0]
+        indices = []
+        for raw in texts:
+            cols = {col_of.setdefault(name, len(col_of)) for name in parse_ingredient_names(raw)}
+            indices.extend(sorted(cols))
+            indptr.append(len(indices))
+        indices = np.asarray(indices, dtype=np.int32)
+        matrix = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.int8), indices, np.asarray(indptr, dtype=np.int32)),
+            shape=(len(indptr) - 1, len(col_of))
+        )
+        return cls(list(col_of), matrix)
+
+    @classmethod
+    def from_arrays(cls, names, data, indices, indptr):
+        """저장된 CSR 배열(메모리 맵 가능)로 복원 - 배열을 복사하지 않음"""
+        matrix = sparse.csr_matrix((data, indices, indptr), shape=(len(indptr) - 1, len(names)), copy=False)
+        return cls(names, matrix)
+
+    def _columns_for(self, term):
+        """term 을 포함하는 재료명의 열 번호들 (기존 str.contains 부분 일치와 같은 의미)"""
+        return np.array([c for c, name in enumerate(self.names) if term in name], dtype=np.int32)
+
+    def row_columns(self, row):
+        m = self.matrix
+        return m.indices[m.indptr[row]:m.indptr[row + 1]]
+
+    def _term_indicator(self, terms):
+        """(재료명 수 × 검색어 수) 지시 행렬: 재료명이 검색어를 포함하면 1"""
+        rows, cols = [], []
+        for j, term in enumerate(terms):
+            c = self.columns_for(term)
+            rows.append(c)
+            cols.append(np.full(len(c), j, dtype=np.int32))
+        rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int32)
+        cols = np.concatenate(cols) if cols else np.empty(0, dtype=np.int32)
+        return sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int32), (rows, cols)),
+            shape=(len(self.names), len(terms))
+        )
+
+    def terms_found(self, terms):
+        """레시피별로 포함된 검색어 개수 (행렬 곱 한 번으로 계산)"""
+        hits = self.matrix @ self._term_indicator(terms)
+        return np.asarray((hits > 0).sum(axis=1)).ravel()
+
+    def contains_any(self, terms):
+        return self.terms_found(terms) > 0
+
+    def contains_all(self, terms):
+        return self.terms_found(terms) == len(terms)
+
+    def match_fridge(self, items):
+        """냉장고 재료로 완전/부분 매칭, 보유 비율, 부족 재료 계산에 필요한 값을 한 번에 구함"""
+        indicator = self._term_indicator(items)
+        owned = np.asarray(indicator.sum(axis=1)).ravel() > 0
+        items_found = np.asarray(((self.matrix @ indicator) > 0).sum(axis=1)).ravel()
+        return FridgeMatch(self, owned, items_found, len(items))
+
+
+# 카테고리 슬롯이 비교되는 칼럼들 (상황/종류/방법/재료 분류)
+CATEGORY_COLUMNS = ["CKG_STA_ACTO_NM", "CKG_KND_ACTO_NM", "CKG_MTH_ACTO_NM", "CKG_MTRL_ACTO_NM"]
+DIFFICULTY_COLUMN = "CKG_DODF_NM"
+
+
+class FacetIndex:
+    """값 종류가 적은 칼럼들의 범주형 코드 + 값별 행 비트맵, 조리 시간 정렬 색인
+
+    비트맵은 np.packbits 로 압축된 uint8 배열(행 8개당 1바이트)이라서
+    조건 결합이 문자열 비교 없이 바이트 단위 AND/OR 로 끝난다.
+    """
+
+    def __init__(self, n_rows, categories, bitmaps, time_order, time_sorted):
+        self.n_rows = n_rows
+        self.categories = categories            # {칼럼: [값, …]} (코드 = 리스트 위치)
+        self.bitmaps = bitmaps                  # {칼럼: (값 개수 × 바이트 수) uint8 배열}
+        self.time_order = time_order            # time_min 오름차순 행 번호
+        self.time_sorted = time_sorted          # 정렬된 time_min 값
+        self.all = np.packbits(np.ones(n_rows, dtype=bool))
+        self.value_bitmap = lru_cache(maxsize=256)(self._value_bitmap)
+
+    @classmethod
+    def build(cls, df, time_col='time_min'):
+        categories, bitmaps = {}, {}
+        for col in CATEGORY_COLUMNS + [DIFFICULTY_COLUMN]:
+            codes, uniques = pd.factorize(df[col])          # 결측값은 -1
+            categories[col] = [str(v) for v in uniques]
+            bitmaps[col] = np.stack(
+                [np.packbits(codes == k) for k in range(len(uniques))]
+            ) if len(uniques) else np.zeros((0, (len(df) + 7) // 8), dtype=np.uint8)
+        times = df[time_col].to_numpy(dtype=np.float64)
+        time_order = np.argsort(times, kind='stable').astype(np.int32)
+        return cls(len(df), categories, bitmaps, time_order, times[time_order])
+
+    def _value_bitmap(self, col, text):
+        """col 값 중 text 를 포함하는(대소문자 무시) 값들의 비트맵 OR"""
+        needle = text.lower()
+        codes = [k for k, v in enumerate(self.categories[col]) if needle in v.lower()]
+        if not codes:
+            return np.zeros_like(self.all)
+        return np.bitwise_or.reduce(self.bitmaps[col][codes], axis=0)
+
+    def category(self, text):
+        result = self.value_bitmap(CATEGORY_COLUMNS[0], text)
+        for col in CATEGORY_COLUMNS[1:]:
+            result = result | self.value_bitmap(col, text)
+        return result
+
+    def difficulty(self, text):
+        return self.value_bitmap(DIFFICULTY_COLUMN, text)
+
+    def time_at_most(self, minutes):
+        """조리 시간이 minutes 이하인 행 비트맵 (정렬 색인에서 이분 탐색)"""
+        end = np.searchsorted(self.time_sorted, minutes, side='right')
+        mask = np.zeros(self.n_rows, dtype=bool)
+        mask[self.time_order[:end]] = True
+        return np.packbits(mask)
+
+    def to_mask(self, bitmap):
+        return np.unpackbits(bitmap, count=self.n_rows).astype(bool)
+
+
+# 인기도 점수 가중치 (조회수보다 스크랩, 스크랩보다 추천을 더 크게 반영)
+POPULARITY_WEIGHTS = {"INQ_CNT": 1.0, "SRAP_CNT": 2.0, "RCMM_CNT": 3.0}
+
+
+class PopularityIndex:
+    """조회/스크랩/추천 수로 미리 계산한 인기도 점수 + 점수 내림차순 행 순서
+
+    top_k 는 인기순으로 행을 훑다가 조건에 맞는 행을 k 개(무작위 모드는 후보 pool 개) 찾으면 멈추므로,
+    조건에 맞는 전체 행을 모으거나 정렬하지 않는다.
+    """
+
+    def __init__(self, scores, order):
+        self.scores = scores                    # 행별 인기도 점수 (float32)
+        self.order = order                      # 점수 내림차순 행 번호 (int32)
+
+    @classmethod
+    def build(cls, df):
+        scores = np.zeros(len(df), dtype=np.float64)
+        for col, weight in POPULARITY_WEIGHTS.items():
+            counts = df[col].to_numpy(dtype=np.float64).clip(min=0)
+            scores += weight * np.log1p(counts)         # 조회수 편차가 커서 로그 스케일로 완화
+        order = np.argsort(-scores, kind='stable').astype(np.int32)
+        return cls(scores.astype(np.float32), order)
+
+    def _scan(self, mask, want):
+        """인기순으로 mask 에 맞는 행을 want 개까지 수집 (블록 크기를 늘려가며 조기 종료)"""
+        found, n_found = [], 0
+        start, block = 0, 256
+        while start < len(self.order) and n_found < want:
+            rows = self.order[start:start + block]
+            hit = rows[mask[rows]]
+            found.append(hit)
+            n_found += len(hit)
+            start += block
+            block *= 2
+        if not found:
+            return self.order[:0]
+        return np.concatenate(found)[:want]
+
+    def top_k(self, mask, k, randomize=False, pool=30):
+        """mask 에 해당하는 인기 상위 k 개 행 번호
+
+        randomize=True 면 인기 상위 pool 개 후보 중 점수에 비례한 확률로 k 개를 뽑아 매번 조금씩 다르게 추천
+        """
+        if not randomize:
+            return self._scan(mask, k)
+        candidates = self._scan(mask, max(k, pool))
+        if len(candidates) <= k:
+            return candidates
+        weights = self.scores[candidates].astype(np.float64) + 1.0
+        picked = np.random.choice(len(candidates), k, replace=False, p=weights / weights.sum())
+        return candidates[np.sort(picked)]            # 인기순 유지
+
+
+# 한 글자 재료(무, 파, 쌀 …) 뒤에 붙을 수 있는 조사
+PARTICLES = ("", "은", "는", "이", "가", "을", "를", "랑", "이랑", "하고", "과", "와", "로", "으로", "도", "만", "에")
+
+
+class _Automaton:
+    """순수 파이썬 Aho-Corasick 오토마톤 (pyahocorasick 이 없을 때 사용)"""
+
+    def __init__(self, words):
+        self.goto = [{}]                        # 노드별 다음 글자 → 노드
+        self.fail = [0]
+        self.out = [None]                       # 노드에서 끝나는 단어
+        for word in words:
+            node = 0
+            for ch in word:
+                nxt = self.goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[node][ch] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append(None)
+                node = nxt
+            self.out[node] = word
+        # 실패 링크 (BFS), out_link 는 실패 링크를 따라가며 처음 만나는 단어 노드
+        self.out_link = [0] * len(self.goto)
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self.goto[node].items():
+                f = self.fail[node]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                fl = self.fail[nxt]
+                self.out_link[nxt] = fl if self.out[fl] is not None else self.out_link[fl]
+                queue.append(nxt)
+
+    def iter(self, text):
+        """(끝 위치, 단어) 를 텍스트 한 번 훑으면서 모두 반환"""
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(ch, 0)
+            hit = node if self.out[node] is not None else self.out_link[node]
+            while hit:
+                yield i, self.out[hit]
+                hit = self.out_link[hit]
+
+
+class VocabMatcher:
+    """사용자 메시지에서 알려진 재료 단어를 한 번에 찾는 사전 매칭기 (Aho-Corasick)
+
+    두 글자 이상 단어는 메시지 어디에 있든 찾고(조사가 붙어도 됨), 겹치면 왼쪽부터 가장 긴 단어를 고른다.
+    한 글자 단어는 오탐이 많아서 단독 어절(조사 포함)일 때만 인정한다.
+    """
+
+    def __init__(self, words):
+        words = set(words)
+        self.short_words = {w for w in words if len(w) == 1}
+        long_words = sorted(w for w in words if len(w) > 1)
+        if ahocorasick is not None:
+            automaton = ahocorasick.Automaton()
+            for w in long_words:
+                automaton.add_word(w, w)
+            if long_words:
+                automaton.make_automaton()
+            self.automaton = automaton if long_words else None
+        else:
+            self.automaton = _Automaton(long_words) if long_words else None
+
+    @classmethod
+    def build(cls, ingredient_names):
+        """재료명(IngredientMatrix.names)에 들어 있는 한글 단어들로 생성"""
+        return cls({w for name in ingredient_names for w in HANGUL_WORD_RE.findall(name)})
+
+    def find(self, text):
+        """메시지에 나온 재료 단어 목록 (등장 순서, 중복 제거)"""
+        spans = []
+        if self.automaton is not None and text:
+            spans = [(end - len(word) + 1, end + 1, word) for end, word in self.automaton.iter(text)]
+        for m in HANGUL_WORD_RE.finditer(text):
+            token = m.group(0)
+            if token[0] in self.short_words and token[1:] in PARTICLES:
+                spans.append((m.start(), m.start() + 1, token[0]))
+        # 왼쪽부터, 같은 위치면 긴 단어 우선으로 겹치지 않게 선택
+        spans.sort(key=lambda s: (s[0], s[0] - s[1]))
+        found, last_end = [], 0
+        for start, end, word in spans:
+            if start >= last_end:
+                found.append(word)
+                last_end = end
+        return list(dict.fromkeys(found))
@@ -0,0 +1,365 @@
+# 레시피 데이터셋 스냅샷 (액션 서버용 읽기 전용 메모리 맵 저장소)
+#
+# CSV 를 매번 파싱하지 않도록, 필요한 칼럼과 파생 색인을 미리 변환해 둔 디렉터리.
+# 스냅샷 디렉터리 안에 버전별 하위 디렉터리(v<생성 시각>-<pid>)를 만들고, CURRENT 파일이 현재 버전을 가리킨다.
+# 새 버전을 다 쓴 뒤 CURRENT 만 원자적으로 교체하므로, 읽는 쪽은 항상 완성된 스냅샷 하나를 본다.
+# 각 버전 디렉터리의 내용:
+#   meta.json                   칼럼 목록, 범주형 칼럼의 값 목록
+#   <정수 칼럼>.npy              int32
+#   time_min.npy                float32 (조리 시간, 분 단위 / 정보 없으면 inf)
+#   <범주형 칼럼>.codes.npy      int16 코드 (결측값 -1)
+#   <문자열 칼럼>.offsets.npy    int64 시작 위치 (행 수 + 1) / <문자열 칼럼>.data.bin  UTF-8 바이트
+#   ingredients.*.npy           레시피 × 재료명 CSR 행렬 (data/indices/indptr) + ingredient_names.json
+#   <범주형 칼럼>.bitmaps.npy    값별 행 비트맵 / time_order.npy, time_sorted.npy  조리 시간 정렬 색인
+#   popularity.npy, popularity_order.npy  인기도 점수 (조회/스크랩/추천 수) + 점수 내림차순 행 순서
+#   vocab.json                  자유 입력 재료 매칭용 어휘 사전
+#
+# 모든 배열은 np.load(mmap_mode='r') 로 읽기 때문에 액션 서버 워커를 여러 개 띄워도
+# 같은 파일의 페이지 캐시를 공유한다 (워커 수만큼 메모리가 늘어나지 않음).
+#
+# 스냅샷 생성 (chatbot_rasa 디렉터리에서):
+#   python -m actions.recipe_store build [--csv CSV경로] [--out 스냅샷경로]
+import argparse
+import json
+import logging
+import os
+import re
+import shutil
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:         # Windows
+    fcntl = None
+    import msvcrt
+
+import numpy as np
+import pandas as pd
+
+from .recipe_index import (
+    CATEGORY_COLUMNS, DIFFICULTY_COLUMN, FacetIndex, IngredientMatrix, PopularityIndex,
+    build_ingredient_vocab
+)
+
+logger = logging.getLogger(__name__)
+
+DB_DIR = os.path.join(os.path.dirname(__file__), '../..', 'backend', 'db')
+CSV_PATH = os.environ.get("RECIPE_CSV_PATH", os.path.join(DB_DIR, 'TB_RECIPE_SEARCH_241226.csv'))
+SNAPSHOT_DIR = os.environ.get("RECIPE_SNAPSHOT_DIR", os.path.join(DB_DIR, 'recipe_snapshot'))
+SNAPSHOT_VERSION = 3
+POINTER_FILE = "CURRENT"        # 현재 버전 디렉터리 이름을 담은 파일
+LOCK_FILE = ".build.lock"       # 스냅샷 생성은 한 번에 한 프로세스만 (워커 여러 개가 동시에 시작해도)
+
+# 액션 서버에서 쓰는 칼럼만 저장
+INT_COLUMNS = ["RCP_SNO", "INQ_CNT", "RCMM_CNT", "SRAP_CNT"]
+CATEGORICAL_COLUMNS = CATEGORY_COLUMNS + [DIFFICULTY_COLUMN, "CKG_TIME_NM"]
+FACET_COLUMNS = CATEGORY_COLUMNS + [DIFFICULTY_COLUMN]
+TEXT_COLUMNS = ["CKG_NM", "CKG_MTRL_CN"]
+
+
+# 시간 문자열을 분 단위 정수로 변환 (예: '1시간 30분 이내' -> 90분)
+def parse_time_to_minutes(time_str):
+    if pd.isna(time_str):
+        return float('inf')
+    hours = re.search(r"(\d+)\s*시간", time_str)
+    mins = re.search(r"(\d+)\s*분", time_str)
+    total = 0
+    if hours:
+        total += int(hours.group(1)) * 60
+    if mins:
+        total += int(mins.group(1))
+    return total
+
+
+# 원본 CSV 읽기 (필요한 칼럼만, 작은 dtype 으로 변환)
+# 🔧 CSV 인코딩 판별 (공식 데이터셋은 CP949 로 배포되기도 함)
+# backend/db/import_recipes.py 의 detect_encoding 과 같은 규칙 (액션 서버는 backend 를 import 하지 않음)
+def detect_encoding(path):
+    with open(path, 'rb') as f:
+        head = f.read(1 << 16)
+    try:
+        head.decode('utf-8')
+        return 'utf-8-sig'
+    except UnicodeDecodeError as e:
+        # 읽은 구간 끝에서 멀티바이트 문자가 잘린 경우는 UTF-8 로 판단
+        if e.start >= len(head) - 3:
+            return 'utf-8-sig'
+        return 'cp949'
+
+
+def read_csv_dataset(csv_path=CSV_PATH):
+    usecols = INT_COLUMNS + CATEGORICAL_COLUMNS + TEXT_COLUMNS
+    df = pd.read_csv(csv_path, usecols=usecols, encoding=detect_encoding(csv_path))
+    for col in INT_COLUMNS:
+        df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype(np.int32)
+    for col in CATEGORICAL_COLUMNS:
+        df[col] = df[col].astype('category')
+    # 시간 문자열 종류가 적으므로 값별로 한 번만 변환
+    time_map = {v: parse_time_to_minutes(v) for v in df["CKG_TIME_NM"].cat.categories}
+    df['time_min'] = (
+        df["CKG_TIME_NM"].map(time_map).astype(np.float32).fillna(np.float32('inf'))
+    )
+    return df
+
+
+def _write_text_column(out_dir, col, values):
+    encoded = [(v if isinstance(v, str) else '').encode('utf-8') for v in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    np.save(os.path.join(out_dir, f"{col}.offsets.npy"), offsets)
+    with open(os.path.join(out_dir, f"{col}.data.bin"), 'wb') as f:
+        f.write(b''.join(encoded))
+
+
+def _write_json(path, obj):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(obj, f, ensure_ascii=False)
+
+
+def _read_json(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+# 현재 버전 디렉터리 (CURRENT 가 없으면 예전 형식: 스냅샷 디렉터리에 파일이 바로 있음)
+def current_snapshot_path(snapshot_dir=SNAPSHOT_DIR):
+    try:
+        with open(os.path.join(snapshot_dir, POINTER_FILE), encoding='utf-8') as f:
+            return os.path.join(snapshot_dir, f.read().strip())
+    except FileNotFoundError:
+        return snapshot_dir
+
+
+# CURRENT 교체 (임시 파일에 쓴 뒤 os.replace → 읽는 쪽은 이전 값 또는 새 값만 봄)
+def _switch_current(out_dir, version):
+    tmp_pointer = os.path.join(out_dir, f"{POINTER_FILE}.tmp{os.getpid()}")
+    with open(tmp_pointer, 'w', encoding='utf-8') as f:
+        f.write(version)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_pointer, os.path.join(out_dir, POINTER_FILE))
+
+
+# 현재/직전 버전만 남기고 정리 (직전 버전은 막 교체 전에 경로를 읽은 프로세스가 열 수 있도록 남겨 둠)
+def _remove_old_versions(out_dir, keep):
+    for name in os.listdir(out_dir):
+        path = os.path.join(out_dir, name)
+        if name in keep or name == POINTER_FILE or name.startswith("."):
+            continue
+        if os.path.isdir(path):
+            if name.startswith("v"):
+                shutil.rmtree(path, ignore_errors=True)
+        elif not name.startswith(f"{POINTER_FILE}.tmp"):
+            os.remove(path)         # 예전 형식(디렉터리에 바로 저장)의 파일
+
+
+# 스냅샷 디렉터리 단위 배타 잠금 (프로세스가 죽으면 OS 가 자동으로 해제)
+@contextmanager
+def _build_lock(out_dir):
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, LOCK_FILE), 'a+b') as f:
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            while True:
+                try:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:     # LK_LOCK 은 약 10초 뒤 포기하므로 다시 시도
+                    continue
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _snapshot_version(snapshot_dir):
+    meta_path = os.path.join(current_snapshot_path(snapshot_dir), "meta.json")
+    try:
+        return _read_json(meta_path).get("version") if os.path.exists(meta_path) else None
+    except ValueError:
+        return None
+
+
+# 스냅샷 생성 (새 버전 디렉터리에 다 쓴 뒤 CURRENT 를 교체해서, 실행 중인 서버가 반쯤 쓰인 파일을 읽지 않게 함)
+def build_snapshot(csv_path=CSV_PATH, out_dir=SNAPSHOT_DIR):
+    with _build_lock(out_dir):
+        return _build_snapshot(csv_path, out_dir)
+
+
+def _build_snapshot(csv_path, out_dir):
+    started = time.time()
+    df = read_csv_dataset(csv_path)
+    previous = os.path.basename(current_snapshot_path(out_dir))
+    version = f"v{time.strftime('%Y%m%d%H%M%S')}{int(time.time() * 1000) % 1000:03d}-{os.getpid()}"
+    tmp_dir = os.path.join(out_dir, version)
+    os.makedirs(tmp_dir)
+
+    def save(name, array):
+        np.save(os.path.join(tmp_dir, f"{name}.npy"), array)
+
+    # 칼럼
+    meta = {"version": SNAPSHOT_VERSION, "n_rows": len(df), "categories": {}}
+    for col in INT_COLUMNS:
+        save(col, df[col].to_numpy(np.int32))
+    save("time_min", df['time_min'].to_numpy(np.float32))
+    for col in CATEGORICAL_COLUMNS:
+        save(f"{col}.codes", df[col].cat.codes.to_numpy(np.int16))
+        meta["categories"][col] = [str(v) for v in df[col].cat.categories]
+    for col in TEXT_COLUMNS:
+        _write_text_column(tmp_dir, col, df[col])
+
+    # 파생 색인
+    matrix = IngredientMatrix.build(df["CKG_MTRL_CN"])
+    save("ingredients.data", matrix.matrix.data)
+    save("ingredients.indices", matrix.matrix.indices)
+    save("ingredients.indptr", matrix.matrix.indptr)
+    _write_json(os.path.join(tmp_dir, "ingredient_names.json"), matrix.names)
+
+    facets = FacetIndex.build(df)
+    for col in FACET_COLUMNS:
+        save(f"{col}.bitmaps", facets.bitmaps[col])
+    meta["facet_categories"] = facets.categories
+    save("time_order", facets.time_order)
+    save("time_sorted", facets.time_sorted)
+
+    popularity = PopularityIndex.build(df)
+    save("popularity", popularity.scores)
+    save("popularity_order", popularity.order)
+
+    _write_json(os.path.join(tmp_dir, "vocab.json"), build_ingredient_vocab(df["CKG_MTRL_CN"]))
+    _write_json(os.path.join(tmp_dir, "meta.json"), meta)
+
+    _switch_current(out_dir, version)
+    _remove_old_versions(out_dir, keep={version, previous})
+    logger.info(f"레시피 스냅샷 생성 완료: {len(df)} 행, {time.time() - started:.1f}초 → {tmp_dir}")
+    return tmp_dir
+
+
+class TextColumn:
+    """UTF-8 바이트 + 오프셋으로 저장된 문자열 칼럼 (필요한 행만 디코딩)"""
+
+    def __init__(self, data, offsets):
+        self.data = data
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, row):
+        return bytes(self.data[self.offsets[row]:self.offsets[row + 1]]).decode('utf-8')
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield self[row]
+
+
+class RecipeStore:
+    """스냅샷을 읽기 전용 메모리 맵으로 연 레시피 저장소
+
+    칼럼과 색인 배열은 모두 파일에 매핑된 상태로 쓰이고, 응답에 필요한 행만 record() 로 꺼낸다.
+    """
+
+    def __init__(self, snapshot_dir, meta, columns, texts, ingredients, facets, popularity, vocab):
+        self.snapshot_dir = snapshot_dir
+        self.n_rows = meta["n_rows"]
+        self.categories = meta["categories"]
+        self.columns = columns                  # {칼럼: np.memmap}
+        self.texts = texts                      # {칼럼: TextColumn}
+        self.ingredients = ingredients          # IngredientMatrix
+        self.facets = facets                    # FacetIndex
+        self.popularity = popularity            # PopularityIndex
+        self.vocab = vocab                      # {단어: 등장 레시피 수}
+
+    @classmethod
+    def open(cls, snapshot_dir=SNAPSHOT_DIR):
+        snapshot_dir = current_snapshot_path(snapshot_dir)
+        meta = _read_json(os.path.join(snapshot_dir, "meta.json"))
+        if meta.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"스냅샷 버전 불일치: {meta.get('version')} (필요: {SNAPSHOT_VERSION})")
+
+        def load(name):
+            return np.load(os.path.join(snapshot_dir, f"{name}.npy"), mmap_mode='r')
+
+        columns = {col: load(col) for col in INT_COLUMNS + ["time_min"]}
+        for col in CATEGORICAL_COLUMNS:
+            columns[col] = load(f"{col}.codes")
+        texts = {
+            col: TextColumn(
+                np.memmap(os.path.join(snapshot_dir, f"{col}.data.bin"), dtype=np.uint8, mode='r')
+                if os.path.getsize(os.path.join(snapshot_dir, f"{col}.data.bin")) else b'',
+                load(f"{col}.offsets")
+            )
+            for col in TEXT_COLUMNS
+        }
+        ingredients = IngredientMatrix.from_arrays(
+            _read_json(os.path.join(snapshot_dir, "ingredient_names.json")),
+            load("ingredients.data"), load("ingredients.indices"), load("ingredients.indptr")
+        )
+        facets = FacetIndex(
+            meta["n_rows"],
+            meta["facet_categories"],
+            {col: load(f"{col}.bitmaps") for col in FACET_COLUMNS},
+            load("time_order"),
+            load("time_sorted")
+        )
+        popularity = PopularityIndex(load("popularity"), load("popularity_order"))
+        vocab = _read_json(os.path.join(snapshot_dir, "vocab.json"))
+        return cls(snapshot_dir, meta, columns, texts, ingredients, facets, popularity, vocab)
+
+    def category_value(self, col, row):
+        code = self.columns[col][row]
+        return self.categories[col][code] if code >= 0 else None
+
+    def record(self, row):
+        """응답에 필요한 한 행의 값들"""
+        return {
+            "RCP_SNO":         int(self.columns["RCP_SNO"][row]),
+            "CKG_NM":          self.texts["CKG_NM"][row],
+            "CKG_MTRL_CN":     self.texts["CKG_MTRL_CN"][row],
+            "CKG_KND_ACTO_NM": self.category_value("CKG_KND_ACTO_NM", row),
+            "CKG_TIME_NM":     self.category_value("CKG_TIME_NM", row),
+        }
+
+
+# 액션 서버용 저장소 열기 (스냅샷이 없으면 CSV 에서 먼저 생성)
+# 워커 여러 개가 동시에 시작하면 잠금을 먼저 잡은 워커만 만들고, 나머지는 기다렸다가 그 결과를 연다.
+def open_store(snapshot_dir=SNAPSHOT_DIR):
+    if _snapshot_version(snapshot_dir) != SNAPSHOT_VERSION:
+        try:
+            with _build_lock(snapshot_dir):
+                if _snapshot_version(snapshot_dir) != SNAPSHOT_VERSION:
+                    logger.warning(
+                        "레시피 스냅샷이 없거나 오래되어 CSV 에서 새로 만듭니다. "
+                        "배포 전에 'python -m actions.recipe_store build' 로 미리 만들어 두세요."
+                    )
+                    _build_snapshot(CSV_PATH, snapshot_dir)
+        except Exception as e:
+            raise RuntimeError(
+                f"레시피 스냅샷({snapshot_dir})을 만들 수 없습니다: {e}\n"
+                f"chatbot_rasa 디렉터리에서 'python -m actions.recipe_store build --csv <CSV경로>' 로 먼저 생성하세요."
+            ) from e
+    return RecipeStore.open(snapshot_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="레시피 데이터셋 스냅샷 생성")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="CSV 에서 스냅샷 생성")
+    build.add_argument("--csv", default=CSV_PATH, help="원본 CSV 경로")
+    build.add_argument("--out", default=SNAPSHOT_DIR, help="스냅샷 디렉터리")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.command == "build":
+        build_snapshot(args.csv, args.out)
+
+
+if __name__ == "__main__":
+    main()
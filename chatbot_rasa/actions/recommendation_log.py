@@ -0,0 +1,103 @@
+# 추천 기록 로거 (write-behind)
+# - 액션은 log() 로 큐에 넣기만 하고 바로 응답 (DB 쓰기를 기다리지 않음)
+# - 백그라운드 스레드가 큐를 모아서 recipe_recommendations 에 트랜잭션 하나로 일괄 INSERT
+# - 큐가 가득 차면 기록을 버림 (챗봇 응답 지연보다 통계 누락이 낫다)
+# - users 에 없는 사용자(비로그인 대화 등)의 기록은 INSERT … SELECT 에서 자연스럽게 빠짐
+import atexit
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+LOG_QUEUE_SIZE = int(os.environ.get("RECOMMENDATION_LOG_QUEUE_SIZE", 10000))   # 대기 중인 기록 최대 개수
+LOG_BATCH_SIZE = 500            # 한 트랜잭션에 넣는 최대 기록 수
+LOG_FLUSH_INTERVAL = 1.0        # 기록이 적을 때 모아서 쓰는 주기 (초)
+
+INSERT_SQL = (
+    "INSERT INTO recipe_recommendations (user_id, RCP_SNO, recommended_query, recommended_url) "
+    "SELECT id, ?, ?, ? FROM users WHERE user_id = ?"
+)
+
+
+class RecommendationLogger:
+    """추천 결과를 큐에 모아 두었다가 백그라운드 스레드에서 일괄 저장"""
+
+    def __init__(self, db_path, maxsize=LOG_QUEUE_SIZE):
+        self.db_path = db_path
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.dropped = 0                # 큐가 가득 차서 버린 기록 수
+        self.written = 0                # INSERT 를 실행한 기록 수 (users 에 없는 사용자는 실제로 저장되지 않음)
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+
+    # ✅ 추천 기록 추가 (큐가 가득 차면 버리고 False)
+    def log(self, user_id, rcp_sno, query, url):
+        if not user_id:
+            return False
+        self._ensure_started()
+        try:
+            self.queue.put_nowait((int(rcp_sno), query, url, user_id))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped % 1000 == 1:
+                logger.warning(f"추천 기록 큐가 가득 차서 기록을 버렸습니다 (누적 {self.dropped}건)")
+            return False
+
+    def _ensure_started(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="recommendation-log", daemon=True
+                    )
+                    self._thread.start()
+                    atexit.register(self.close)
+
+    # 🔧 큐에서 최대 LOG_BATCH_SIZE 개를 꺼냄 (첫 기록은 LOG_FLUSH_INTERVAL 까지 대기)
+    def _next_batch(self):
+        try:
+            batch = [self.queue.get(timeout=LOG_FLUSH_INTERVAL)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + LOG_FLUSH_INTERVAL
+        while len(batch) < LOG_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, conn, batch):
+        try:
+            with conn:                      # 트랜잭션 하나로 일괄 INSERT
+                conn.executemany(INSERT_SQL, batch)
+            self.written += len(batch)
+        except sqlite3.Error as e:
+            logger.warning(f"추천 기록 저장 실패 ({len(batch)}건): {e}")
+
+    def _run(self):
+        conn = sqlite3.connect(self.db_path, timeout=5.0)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        try:
+            while not (self._stopping.is_set() and self.queue.empty()):
+                batch = self._next_batch()
+                if batch:
+                    self._write(conn, batch)
+        finally:
+            conn.close()
+
+    # ✅ 종료 시 남은 기록 저장 (최대 timeout 초 대기)
+    def close(self, timeout=5.0):
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
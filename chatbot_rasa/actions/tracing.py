@@ -0,0 +1,86 @@
+# 액션 실행 단계별 시간 측정
+# - @traced 를 붙인 Action.run 한 번이 한 턴(trace), 그 안의 with span("단계") 구간이 단계별 시간
+# - 단계 시간은 action_stage_duration_seconds{action, stage} 히스토그램, 전체 시간은 action_duration_seconds
+# - span() 은 현재 턴이 없으면 아무것도 하지 않으므로 공용 함수(extract_ingredients 등) 안에서도 써도 됨
+# - ACTION_TRACE_LOG=1 이면 턴마다 단계별 소요 시간을 한 줄로 로그에 남김
+import contextvars
+import functools
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+TRACE_LOG = os.environ.get("ACTION_TRACE_LOG", "0") == "1"
+
+action_duration = metrics.histogram("action_duration_seconds", "액션 run() 전체 소요 시간", ("action",))
+stage_duration = metrics.histogram("action_stage_duration_seconds", "액션 단계별 소요 시간 (호출 1회 단위)",
+                                   ("action", "stage"))
+action_runs = metrics.counter("action_runs_total", "액션 실행 횟수 (status: ok / error)", ("action", "status"))
+
+_current = contextvars.ContextVar("action_trace", default=None)
+
+
+class ActionTrace:
+    """한 턴 동안의 단계별 누적 시간 (같은 단계가 여러 번이면 합계와 횟수)"""
+
+    def __init__(self, action, sender_id=None):
+        self.action = action
+        self.sender_id = sender_id
+        self.stages = {}                # {단계: [누적 초, 횟수]} (처음 기록된 순서 유지)
+
+    def record(self, stage, elapsed):
+        stage_duration.observe(elapsed, self.action, stage)
+        entry = self.stages.get(stage)
+        if entry is None:
+            self.stages[stage] = [elapsed, 1]
+        else:
+            entry[0] += elapsed
+            entry[1] += 1
+
+    def summary(self, total):
+        parts = []
+        for stage, (elapsed, count) in self.stages.items():
+            times = f" x{count}" if count > 1 else ""
+            parts.append(f"{stage}{times} {elapsed * 1000:.1f}ms")
+        return f"{self.action} sender={self.sender_id} 전체 {total * 1000:.1f}ms | " + ", ".join(parts)
+
+
+# ✅ 현재 턴의 단계 시간 측정 (턴 밖에서 호출되면 측정하지 않음)
+@contextmanager
+def span(stage):
+    trace = _current.get()
+    if trace is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.record(stage, time.perf_counter() - started)
+
+
+# ✅ Action.run 데코레이터: 한 번의 실행을 한 턴으로 측정
+def traced(run):
+    @functools.wraps(run)
+    def wrapper(self, dispatcher, tracker, domain):
+        metrics.ensure_server()
+        trace = ActionTrace(self.name(), getattr(tracker, "sender_id", None))
+        token = _current.set(trace)
+        started = time.perf_counter()
+        status = "error"
+        try:
+            result = run(self, dispatcher, tracker, domain)
+            status = "ok"
+            return result
+        finally:
+            _current.reset(token)
+            total = time.perf_counter() - started
+            action_duration.observe(total, trace.action)
+            action_runs.inc(trace.action, status)
+            if TRACE_LOG:
+                logger.info(trace.summary(total))
+    return wrapper